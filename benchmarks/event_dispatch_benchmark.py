@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Events per second through RealtimeEventHandler for a mix of raw frames
+resembling a spoken response: 100ms base64 audio deltas, transcript deltas
+and lifecycle events. Each installed JSON codec is measured, against the
+previous handler, which decoded with json.loads, rebuilt its dispatch dict
+and pretty-printed every event.
+
+Run from the repository root:
+    python -m benchmarks.event_dispatch_benchmark
+    python -m benchmarks.event_dispatch_benchmark --events 50000 --audio-ms 20
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import json
+import logging
+import os
+import time
+
+from src.core.realtime import events as events_module
+from src.core.realtime.bus import EventBus
+from src.core.realtime.codec import get_codec
+from src.core.realtime.events import RealtimeEventHandler
+from src.core.realtime.output import ResponseAudioStream
+
+
+class BenchmarkSession:
+    """Just enough of RealtimeSession for the routed events"""
+
+    def __init__(self):
+        self.audio_output = ResponseAudioStream()
+        self.bus = EventBus()
+
+    async def send_event(self, event):
+        pass
+
+
+class LegacyEventHandler(RealtimeEventHandler):
+    """The previous dispatch: dict rebuilt and event pretty-printed per call"""
+
+    async def handle_message(self, message):
+        await self.handle_event(json.loads(message))
+
+    async def handle_event(self, event):
+        print(f"[debug] Received event: {json.dumps(event, indent=2)}")
+        event_type = event.get("type", "")
+        handlers = {
+            "session.created": self._handle_session_created,
+            "error": self._handle_error,
+            "text.delta": self._handle_text_delta,
+            "text.done": self._handle_text_done,
+            "response.created": self._handle_response_created,
+            "response.done": self._handle_response_done,
+            "response.audio.delta": self._handle_audio_delta,
+            "response.audio.done": self._handle_audio_done,
+            "audio_transcript.delta": self._handle_audio_transcript_delta,
+            "audio_transcript.done": self._handle_audio_transcript_done,
+            "function_call.delta": self._handle_function_call_delta,
+            "function_call.done": self._handle_function_call_done,
+            "input_audio_buffer.speech_started": self._handle_speech_started,
+            "input_audio_buffer.speech_stopped": self._handle_speech_stopped,
+        }
+        handler = handlers.get(event_type)
+        if handler:
+            await handler(event)
+        else:
+            print(f"[warning] Unhandled event type: {event_type}")
+            print(f"[debug] Event data: {json.dumps(event, indent=2)}")
+
+
+def make_events(count: int, audio_ms: float):
+    """A response-shaped event stream: mostly audio and transcript deltas"""
+    delta = base64.b64encode(os.urandom(int(24000 * audio_ms / 1000) * 2)).decode()
+    response = [
+        {"type": "response.created", "response": {"id": "resp_1"}},
+        {"type": "response.output_item.added", "item": {"id": "item_1"}},
+    ]
+    for _ in range(20):
+        response.append({
+            "type": "response.audio.delta", "response_id": "resp_1",
+            "item_id": "item_1", "content_index": 0, "delta": delta,
+        })
+        response.append({
+            "type": "response.audio_transcript.delta", "response_id": "resp_1",
+            "item_id": "item_1", "delta": "word ",
+        })
+    response += [
+        {"type": "response.audio.done", "item_id": "item_1"},
+        {"type": "rate_limits.updated", "rate_limits": []},
+        {"type": "response.done", "response": {"id": "resp_1"}},
+    ]
+    frames = [json.dumps(event) for event in response]
+    return [frames[i % len(frames)] for i in range(count)]
+
+
+async def rate(handler: RealtimeEventHandler, frames) -> float:
+    start = time.perf_counter()
+    for frame in frames:
+        await handler.handle_message(frame)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def installed_codecs():
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            yield get_codec(name)
+        except ValueError:
+            continue
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event dispatch benchmark")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--audio-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    frames = make_events(args.events, args.audio_ms)
+    logger = logging.getLogger("src.core.realtime.events")
+    logger.propagate = False
+
+    runs = [("previous handler", LegacyEventHandler, None, logging.INFO)]
+    for codec in installed_codecs():
+        runs.append((f"compiled routes, {codec.name}", RealtimeEventHandler, codec, logging.INFO))
+    runs.append((
+        f"compiled routes, {runs[-1][2].name}, debug",
+        RealtimeEventHandler, runs[-1][2], logging.DEBUG,
+    ))
+
+    default_codec = events_module.codec
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        logger.addHandler(logging.StreamHandler(devnull))
+        results = []
+        for name, handler_class, codec, level in runs:
+            logger.setLevel(level)
+            events_module.codec = codec or default_codec
+            handler = handler_class(BenchmarkSession())
+            results.append((name, asyncio.run(rate(handler, frames))))
+    events_module.codec = default_codec
+
+    print(f"{args.events} events, {args.audio_ms:.0f} ms audio deltas")
+    print(f"{'handler':<34} {'events/s':>10} {'us/event':>9}")
+    for name, events_per_second in results:
+        print(f"{name:<34} {events_per_second:10.0f} {1e6 / events_per_second:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
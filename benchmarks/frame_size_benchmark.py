@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Per-frame overhead of the input path for each frame profile, against the
+latency the frame size adds.
+
+Each profile streams the same audio through RealtimeAudioProcessor (resampling
+and the VAD gate), wraps every frame in an input_audio_buffer.append event
+and sends it over a local socket, one send() per frame as the WebSocket
+writer does. CPU time is measured on the sending thread only.
+
+Run from the repository root:
+    python -m benchmarks.frame_size_benchmark
+    python -m benchmarks.frame_size_benchmark --input-rate 24000 --seconds 60
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import socket
+import threading
+import time
+
+import numpy as np
+
+from src.core.config.models import FRAME_PROFILES
+from src.core.realtime.audio import RealtimeAudioProcessor
+from src.core.realtime.formats import AudioFormat
+from src.core.realtime.vad import VoiceActivityDetector
+
+WS_HEADER_BYTES = 8  # Masked client frame with a 16-bit length
+
+
+def make_audio(sample_rate: int, seconds: float) -> bytes:
+    """Alternating 1s of tone and 1s of quiet noise, PCM16 mono"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    speech = (np.floor(t) % 2 == 0) * 0.3 * np.sin(2 * np.pi * 220 * t)
+    noise = rng.standard_normal(len(t)) * 0.001
+    return ((speech + noise) * 32767).astype(np.int16).tobytes()
+
+
+def drain(sock: socket.socket):
+    while sock.recv(1 << 20):
+        pass
+
+
+def run_profile(frame_ms: int, audio: bytes, input_rate: int) -> dict:
+    processor = RealtimeAudioProcessor(
+        vad=VoiceActivityDetector(),
+        input_format=AudioFormat(sample_rate=input_rate),
+        frame_ms=frame_ms,
+    )
+    frame_bytes = input_rate * frame_ms // 1000 * 2
+    frames = [audio[i : i + frame_bytes] for i in range(0, len(audio), frame_bytes)]
+
+    sender, receiver = socket.socketpair()
+    reader = threading.Thread(target=drain, args=(receiver,), daemon=True)
+    reader.start()
+
+    loop = asyncio.new_event_loop()
+    sends = 0
+    payload_bytes = 0
+    wire_bytes = 0
+    worst_us = 0.0
+    start = time.thread_time()
+    for frame in frames:
+        frame_start = time.thread_time()
+        processed = loop.run_until_complete(processor.process_chunk(frame))
+        if processed:
+            message = json.dumps({
+                "type": "input_audio_buffer.append",
+                "audio": base64.b64encode(processed).decode("ascii"),
+            }).encode()
+            sender.sendall(message)
+            sends += 1
+            payload_bytes += len(processed)
+            wire_bytes += len(message) + WS_HEADER_BYTES
+        worst_us = max(worst_us, (time.thread_time() - frame_start) * 1e6)
+    cpu = time.thread_time() - start
+
+    sender.close()
+    reader.join()
+    receiver.close()
+    loop.close()
+
+    audio_seconds = len(audio) / 2 / input_rate
+    return {
+        "frames": len(frames),
+        "cpu_us_per_frame": cpu / len(frames) * 1e6,
+        "worst_us": worst_us,
+        "cpu_percent": cpu / audio_seconds * 100,
+        "sends_per_second": sends / audio_seconds,
+        "overhead_percent": (wire_bytes / payload_bytes - 1) * 100 if payload_bytes else 0.0,
+        # The first sample of a frame waits a full frame before it can be sent
+        "added_latency_ms": frame_ms + cpu / len(frames) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame size profile benchmark")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--input-rate", type=int, default=48000)
+    args = parser.parse_args()
+
+    audio = make_audio(args.input_rate, args.seconds)
+    print(f"{args.seconds:.0f}s of {args.input_rate} Hz PCM16, resample + VAD + append event + send")
+    print(
+        f"{'profile':<12} {'frame':>6} {'us/frame':>9} {'worst us':>9} {'cpu %':>6} "
+        f"{'sends/s':>8} {'wire +%':>8} {'latency ms':>11}"
+    )
+    for name, profile in FRAME_PROFILES.items():
+        result = run_profile(profile.frame_ms, audio, args.input_rate)
+        print(
+            f"{name:<12} {profile.frame_ms:>4}ms {result['cpu_us_per_frame']:9.1f} "
+            f"{result['worst_us']:9.1f} {result['cpu_percent']:6.2f} "
+            f"{result['sends_per_second']:8.1f} {result['overhead_percent']:8.1f} "
+            f"{result['added_latency_ms']:11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Throughput of the table-driven G.711 codecs, in samples per second on one
+core, with Python's audioop (C implementation, removed in 3.13) as a
+reference where available.
+
+Run from the repository root:
+    python -m benchmarks.g711_benchmark
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from src.core.realtime import g711
+
+
+def throughput(fn, data, samples: int, repeat: int) -> float:
+    fn(data)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(data)
+    return samples * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="G.711 codec benchmark")
+    parser.add_argument("--chunk-ms", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            import audioop
+        except ImportError:
+            audioop = None
+
+    samples = int(8000 * args.chunk_ms / 1000)
+    rng = np.random.default_rng(0)
+    pcm = (rng.standard_normal(samples) * 4000).astype(np.int16)
+    codes = np.empty(samples, dtype=np.uint8)
+    decoded = np.empty(samples, dtype=np.int16)
+
+    print(f"{samples}-sample chunks (8 kHz, {args.chunk_ms:.0f} ms), single core")
+    print(f"{'operation':<14} {'LUT Msamples/s':>15} {'audioop Msamples/s':>19}")
+    for encoding, short in (("g711_ulaw", "ulaw"), ("g711_alaw", "alaw")):
+        encoded = g711.encode(pcm, encoding)
+        rows = [
+            (
+                f"{short} encode",
+                lambda x, e=encoding: g711.encode(x, e, out=codes),
+                pcm,
+                getattr(audioop, f"lin2{short}", None),
+                pcm.tobytes(),
+            ),
+            (
+                f"{short} decode",
+                lambda x, e=encoding: g711.decode(x, e, out=decoded),
+                encoded,
+                getattr(audioop, f"{short}2lin", None),
+                encoded.tobytes(),
+            ),
+        ]
+        for name, fn, data, reference, reference_data in rows:
+            ours = throughput(fn, data, samples, args.repeat) / 1e6
+            if reference is not None:
+                theirs = throughput(
+                    lambda x, r=reference: r(x, 2), reference_data, samples, args.repeat
+                ) / 1e6
+                theirs_text = f"{theirs:19.1f}"
+            else:
+                theirs_text = f"{'-':>19}"
+            print(f"{name:<14} {ours:15.1f} {theirs_text}")
+
+
+if __name__ == "__main__":
+    main()
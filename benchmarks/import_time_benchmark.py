@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Cold import time of the package entry points, each measured in a fresh
+interpreter, plus which heavy audio/DSP modules each one drags in.
+
+Run from the repository root:
+    python -m benchmarks.import_time_benchmark
+    python -m benchmarks.import_time_benchmark --detail src.api.main
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TARGETS = [
+    "src.api.main",
+    "src.core.realtime",
+    "src.core.realtime.session",
+    "src.core.realtime.audio",
+    "src.core.realtime.audio_playback",
+]
+
+HEAVY_MODULES = ["numpy", "librosa", "sounddevice", "pyaudio", "scipy"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(target: str, runs: int) -> dict:
+    """Median import time of `target` over `runs` fresh interpreters"""
+    times = []
+    heavy = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(target=target, heavy=HEAVY_MODULES)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            return {"target": target, "error": error[0]}
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(data["ms"])
+        heavy = data["heavy"]
+    return {"target": target, "median_ms": statistics.median(times), "heavy": heavy}
+
+
+def detail(target: str, top: int):
+    """Print the modules with the largest cumulative import time"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    print(f"\nSlowest imports under {target} (cumulative ms / self ms):")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--detail", metavar="MODULE", help="show -X importtime breakdown")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"Median of {args.runs} fresh interpreters")
+    print(f"{'module':<36} {'import ms':>10}  heavy modules loaded")
+    for target in TARGETS:
+        result = measure(target, args.runs)
+        if "error" in result:
+            print(f"{target:<36} {'failed':>10}  {result['error']}")
+            continue
+        heavy = ", ".join(result["heavy"]) or "-"
+        print(f"{target:<36} {result['median_ms']:10.1f}  {heavy}")
+
+    if args.detail:
+        detail(args.detail, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+How many concurrent conversations one API worker sustains.
+
+For each load level, starts the fake Realtime API and one uvicorn worker
+running src.api.main:app as separate processes, creates the sessions
+through POST /conversations and streams synthetic speech into
+/realtime/{session_id} at real-time pacing: a turn of audio, then a pause
+for the reply, repeated for the whole run. The fake ends a turn once it
+has received --turn-ms of audio, so end-to-end latency is measured from
+the last chunk of a turn to the first reply audio frame; "overhead" is
+that minus the fake's configured first-audio delay, i.e. the time spent in
+the worker and on localhost.
+
+The worker's event loop lag, CPU and memory come from
+GET /conversations/metrics, sampled over the steady-state window after
+all sessions have connected. The generator also watches its own loop lag:
+if that is high, the client is the bottleneck and the run says little
+about the worker. On a single core all three processes compete; for
+meaningful numbers give the worker a core of its own (taskset) or point
+--url at a worker on another machine.
+
+The report is JSON (stdout, or --report) with one entry per level, so it
+can be diffed across releases.
+
+Run from the repository root:
+    python -m benchmarks.load_test --sessions 10,50,100 --duration 30
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --sessions 20
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import aiohttp
+import websockets
+
+from examples.basic_conversation import basic_config
+from src.core.utils.metrics import LatencyStats, LoopLagMonitor
+
+REPORT_VERSION = 1
+
+# Generator loop lag above which its own pacing and timing can't be trusted
+CLIENT_LAG_WARNING_MS = 20.0
+
+# 24kHz PCM16 mono, the endpoint's default input format
+SAMPLE_RATE = 24000
+
+
+def speech_chunk(chunk_ms: int) -> bytes:
+    """A loud two-tone chunk, so any VAD gate in the pipeline lets it through"""
+    samples = SAMPLE_RATE * chunk_ms // 1000
+    pcm = bytearray()
+    for n in range(samples):
+        t = n / SAMPLE_RATE
+        value = 6000 * math.sin(2 * math.pi * 220 * t) + 3000 * math.sin(2 * math.pi * 1170 * t)
+        pcm += int(value).to_bytes(2, "little", signed=True)
+    return bytes(pcm)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class LoadStats:
+    """Client-side measurements shared by every simulated caller"""
+
+    def __init__(self):
+        self.create = LatencyStats(window=100000)
+        self.connect = LatencyStats(window=100000)
+        self.first_audio = LatencyStats(window=100000)
+        self.turns = 0
+        self.replies = 0
+        self.late_chunks = 0  # Sent more than one chunk behind schedule
+        self.chunks_sent = 0
+        self.audio_frames_received = 0
+        self.sessions_created = 0
+        self.sessions_connected = 0
+        self.errors: Counter = Counter()
+
+
+class Caller:
+    """One simulated conversation: create, connect, talk, listen"""
+
+    def __init__(self, args, stats: LoadStats, http: aiohttp.ClientSession, chunk: bytes):
+        self.args = args
+        self.stats = stats
+        self.http = http
+        self.chunk = chunk
+        self._turn_ended_at: Optional[float] = None
+        self._replied = asyncio.Event()
+
+    async def run(self, deadline: float, connected: asyncio.Event):
+        args, stats = self.args, self.stats
+        start = time.perf_counter()
+        async with self.http.post(
+            f"{args.url}/conversations/",
+            json=basic_config.model_dump(mode="json"),
+            headers={"Authorization": f"Bearer {args.api_key}"},
+        ) as response:
+            if response.status != 200:
+                raise RuntimeError(f"POST /conversations: HTTP {response.status}")
+            session_id = (await response.json())["session_id"]
+        stats.create.record((time.perf_counter() - start) * 1000)
+        stats.sessions_created += 1
+
+        start = time.perf_counter()
+        ws_url = "ws" + args.url[len("http"):] + f"/realtime/{session_id}"
+        async with websockets.connect(ws_url, max_size=None) as ws:
+            stats.connect.record((time.perf_counter() - start) * 1000)
+            stats.sessions_connected += 1
+            connected.set()
+            receiver = asyncio.create_task(self._receive(ws))
+            try:
+                await self._talk(ws, deadline)
+                await ws.send(json.dumps({"type": "end"}))
+            finally:
+                receiver.cancel()
+                await asyncio.gather(receiver, return_exceptions=True)
+
+    async def _talk(self, ws, deadline: float):
+        args, stats = self.args, self.stats
+        chunk_seconds = args.chunk_ms / 1000
+        chunks_per_turn = max(1, round(args.turn_ms / args.chunk_ms))
+        loop = asyncio.get_running_loop()
+        while loop.time() < deadline:
+            # Pace against an absolute schedule so send jitter doesn't drift
+            next_send = loop.time()
+            for _ in range(chunks_per_turn):
+                delay = next_send - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif -delay > chunk_seconds:
+                    stats.late_chunks += 1
+                await ws.send(self.chunk)
+                stats.chunks_sent += 1
+                next_send += chunk_seconds
+            self._replied.clear()
+            self._turn_ended_at = time.perf_counter()
+            stats.turns += 1
+            # Listen to the reply, then pause before the next turn
+            try:
+                await asyncio.wait_for(self._replied.wait(), args.reply_timeout)
+            except asyncio.TimeoutError:
+                stats.errors["reply timeout"] += 1
+            await asyncio.sleep(max(0.0, next_send + args.pause_ms / 1000 - loop.time()))
+
+    async def _receive(self, ws):
+        async for message in ws:
+            if isinstance(message, bytes):
+                self.stats.audio_frames_received += 1
+                if self._turn_ended_at is not None:
+                    latency = (time.perf_counter() - self._turn_ended_at) * 1000
+                    self._turn_ended_at = None
+                    self.stats.first_audio.record(latency)
+                    self.stats.replies += 1
+                    self._replied.set()
+
+
+async def get_metrics(http: aiohttp.ClientSession, args) -> Optional[Dict]:
+    try:
+        async with http.get(
+            f"{args.url}/conversations/metrics",
+            headers={"Authorization": f"Bearer {args.api_key}"},
+        ) as response:
+            if response.status == 200:
+                return await response.json()
+    except aiohttp.ClientError:
+        pass
+    return None
+
+
+async def wait_until_up(http: aiohttp.ClientSession, url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with http.get(f"{url}/") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url} did not come up within {timeout:.0f} s")
+        await asyncio.sleep(0.1)
+
+
+def start_servers(args) -> List[subprocess.Popen]:
+    """The fake Realtime API and one uvicorn worker pointed at it"""
+    fake_port, api_port = free_port(), free_port()
+    fake = subprocess.Popen(
+        [
+            sys.executable, "-m", "src.core.realtime.fake_server",
+            "--port", str(fake_port),
+            "--first-audio-ms", str(args.first_audio_ms),
+            "--response-audio-ms", str(args.response_audio_ms),
+            "--turn-ms", str(args.turn_ms),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    env = dict(
+        os.environ,
+        REALTIME_API_BASE=f"http://127.0.0.1:{fake_port}/v1",
+        API_KEY=args.api_key,
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "load-test"),
+    )
+    api = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "src.api.main:app",
+            "--host", "127.0.0.1", "--port", str(api_port),
+            "--workers", "1", "--log-level", "warning",
+        ],
+        env=env,
+        # The API logs per-event lines; keep them out of the report
+        stdout=subprocess.DEVNULL,
+    )
+    args.url = f"http://127.0.0.1:{api_port}"
+    return [api, fake]
+
+
+def stop_servers(processes: List[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def percent_of_core(before: Dict, after: Dict, seconds: float) -> float:
+    used = after["process"]["cpu_seconds"] - before["process"]["cpu_seconds"]
+    return 100 * used / seconds if seconds > 0 else 0.0
+
+
+async def run_level(args, sessions: int) -> Dict:
+    stats = LoadStats()
+    client_lag = LoopLagMonitor()
+    client_lag.start()
+    loop = asyncio.get_running_loop()
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as http:
+        await wait_until_up(http, args.url)
+        idle = await get_metrics(http, args)
+
+        deadline = loop.time() + args.ramp_seconds + args.duration
+        chunk = speech_chunk(args.chunk_ms)
+        connected = [asyncio.Event() for _ in range(sessions)]
+
+        async def call(index: int):
+            await asyncio.sleep(args.ramp_seconds * index / sessions)
+            try:
+                await Caller(args, stats, http, chunk).run(deadline, connected[index])
+            except Exception as e:
+                stats.errors[f"{type(e).__name__}: {e}"[:120]] += 1
+            finally:
+                connected[index].set()
+
+        callers = [asyncio.create_task(call(i)) for i in range(sessions)]
+        # Steady state starts once every caller has connected (or failed)
+        await asyncio.gather(*(event.wait() for event in connected))
+        steady_start = loop.time()
+        start_metrics = await get_metrics(http, args)
+        peak_rss = start_metrics["process"]["rss_mb"] if start_metrics else 0.0
+        while loop.time() < deadline - 1.0:
+            await asyncio.sleep(min(1.0, deadline - 1.0 - loop.time()))
+            sample = await get_metrics(http, args)
+            if sample:
+                peak_rss = max(peak_rss, sample["process"]["rss_mb"])
+        end_metrics = await get_metrics(http, args)
+        steady_seconds = loop.time() - steady_start
+        await asyncio.gather(*callers)
+    await client_lag.stop()
+    if client_lag.lag.percentile(99) > CLIENT_LAG_WARNING_MS:
+        print(
+            f"[warn] Load generator loop lag p99 {client_lag.lag.percentile(99):.0f} ms: "
+            f"the client is saturated, results understate the worker",
+            file=sys.stderr,
+        )
+
+    report = {
+        "sessions": {
+            "requested": sessions,
+            "created": stats.sessions_created,
+            "connected": stats.sessions_connected,
+        },
+        "session_create": stats.create.snapshot(),
+        "websocket_connect": stats.connect.snapshot(),
+        "end_to_end_first_audio": stats.first_audio.snapshot(),
+        "turns": {
+            "sent": stats.turns,
+            "replied": stats.replies,
+            "reply_rate": stats.replies / stats.turns if stats.turns else 0.0,
+        },
+        "audio": {
+            "chunks_sent": stats.chunks_sent,
+            "late_chunks": stats.late_chunks,
+            "frames_received": stats.audio_frames_received,
+        },
+        "client_event_loop_lag": client_lag.snapshot(),
+        "errors": dict(stats.errors),
+    }
+    if args.first_audio_ms is not None and stats.first_audio.count:
+        e2e = report["end_to_end_first_audio"]
+        report["overhead"] = {
+            key: (value - args.first_audio_ms if key.endswith("_ms") else value)
+            for key, value in e2e.items()
+        }
+    if idle and start_metrics and end_metrics:
+        cpu = percent_of_core(start_metrics, end_metrics, steady_seconds)
+        active = max(1, stats.sessions_connected)
+        idle_rss = idle["process"]["rss_mb"]
+        report["server"] = {
+            "steady_state_seconds": steady_seconds,
+            "event_loop_lag": end_metrics["event_loop_lag"],
+            "cpu_percent": cpu,
+            "cpu_percent_per_session": cpu / active,
+            "rss_mb_idle": idle_rss,
+            "rss_mb_peak": peak_rss,
+            "rss_mb_per_session": (peak_rss - idle_rss) / active,
+            "pool": end_metrics.get("pool"),
+            "registry": end_metrics.get("registry"),
+        }
+    return report
+
+
+async def run(args) -> Dict:
+    levels = [int(level) for level in args.sessions.split(",")]
+    external = args.url is not None
+    if external:
+        # The configured first-audio delay is only known for the local fake
+        args.first_audio_ms = None
+    runs = []
+    for sessions in levels:
+        processes = [] if external else start_servers(args)
+        try:
+            print(f"[info] {sessions} sessions against {args.url}", file=sys.stderr)
+            runs.append(await run_level(args, sessions))
+        finally:
+            stop_servers(processes)
+            if not external:
+                args.url = None
+    return {
+        "report_version": REPORT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {
+            "url": args.url if external else "local worker + fake Realtime API",
+            "duration_seconds": args.duration,
+            "ramp_seconds": args.ramp_seconds,
+            "chunk_ms": args.chunk_ms,
+            "turn_ms": args.turn_ms,
+            "pause_ms": args.pause_ms,
+            "fake_first_audio_ms": args.first_audio_ms,
+            "fake_response_audio_ms": None if external else args.response_audio_ms,
+        },
+        "runs": runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent session load test")
+    parser.add_argument("--sessions", default="10",
+                        help="Comma separated concurrency levels, each run on a fresh worker")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="Seconds of load after the ramp")
+    parser.add_argument("--ramp-seconds", type=float, default=5.0)
+    parser.add_argument("--chunk-ms", type=int, default=20)
+    parser.add_argument("--turn-ms", type=float, default=1500.0)
+    parser.add_argument("--pause-ms", type=float, default=2000.0,
+                        help="Silence after each turn, counted from its last chunk")
+    parser.add_argument("--reply-timeout", type=float, default=10.0)
+    parser.add_argument("--first-audio-ms", type=float, default=300.0)
+    parser.add_argument("--response-audio-ms", type=float, default=2000.0)
+    parser.add_argument("--url", help="Test a running API instead of starting one")
+    parser.add_argument("--api-key", default=os.getenv("API_KEY", "development-key"))
+    parser.add_argument("--report", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(output + "\n")
+        print(f"[info] Report written to {args.report}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Audio latency through OutboundWriter when the upstream link is slower
+than the audio it carries. Capture is simulated in real time (fixed-size
+chunks plus an occasional response.create) into a socket whose sends take
+a fixed overhead plus size / bandwidth. Without watermarks the backlog, and
+with it latency, grows for as long as the link is slow; with them latency
+stays bounded at the cost of dropped audio, and control events still go out.
+
+Run from the repository root:
+    python -m benchmarks.outbound_flow_benchmark
+    python -m benchmarks.outbound_flow_benchmark --bandwidth-kbps 320 --seconds 30
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+
+from src.core.realtime.outbound import OutboundWriter
+from src.core.realtime.queues import DropPolicy
+
+
+class SlowSocket:
+    def __init__(self, bytes_per_second: float, overhead_ms: float):
+        self.bytes_per_second = bytes_per_second
+        self.overhead = overhead_ms / 1000
+        self.events_sent = 0
+
+    async def send(self, message: str):
+        await asyncio.sleep(self.overhead + len(message) / self.bytes_per_second)
+        if '"input_audio_buffer.append"' not in message:
+            self.events_sent += 1
+
+
+class BenchmarkSession:
+    def __init__(self, ws):
+        self.ws = ws
+
+
+async def measure(args, high_ms, low_ms, policy):
+    ws = SlowSocket(args.bandwidth_kbps * 1000 / 8, args.overhead_ms)
+    writer = OutboundWriter(BenchmarkSession(ws), high_ms, low_ms, policy)
+    writer.ready.set()
+    task = asyncio.create_task(writer.run())
+    chunk = b"\0" * (48 * args.chunk_ms)
+    chunks = int(args.seconds * 1000 / args.chunk_ms)
+    events = 0
+    for i in range(chunks):
+        writer.put_audio(chunk)
+        if i % int(2000 / args.chunk_ms) == 0:
+            writer.put_event({"type": "response.create"})
+            events += 1
+        await asyncio.sleep(args.chunk_ms / 1000)
+    await asyncio.sleep(1.0)
+    task.cancel()
+    stats = writer.stats()
+    return stats, f"{ws.events_sent}/{events}"
+
+
+async def run(args):
+    runs = [
+        ("unbounded", 10 ** 9, 10 ** 9, DropPolicy.DROP_OLDEST),
+        ("1000/200 ms, drop oldest", 1000, 200, DropPolicy.DROP_OLDEST),
+        ("1000/200 ms, drop newest", 1000, 200, DropPolicy.DROP_NEWEST),
+        ("400/100 ms, drop oldest", 400, 100, DropPolicy.DROP_OLDEST),
+    ]
+    results = []
+    for name, high, low, policy in runs:
+        # Silence the writer's drop warnings
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append((name, *await measure(args, high, low, policy)))
+
+    print(
+        f"{args.seconds:.0f} s of {args.chunk_ms} ms chunks over a "
+        f"{args.bandwidth_kbps:.0f} kbit/s link (audio needs ~512 kbit/s as base64)"
+    )
+    print(f"{'watermarks':<26} {'p50 ms':>8} {'p99 ms':>8} {'dropped ms':>11} {'events':>7}")
+    for name, stats, events in results:
+        wait = stats["queue_wait"]
+        print(
+            f"{name:<26} {wait['p50_ms']:8.0f} {wait['p99_ms']:8.0f} "
+            f"{stats['dropped_audio_ms']:11.0f} {events:>7}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Outbound flow control benchmark")
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--chunk-ms", type=int, default=20)
+    parser.add_argument("--bandwidth-kbps", type=float, default=320.0)
+    parser.add_argument("--overhead-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming resampler against the previous per-chunk
+librosa.resample path used by RealtimeAudioProcessor.
+
+Run from the repository root:
+    python -m benchmarks.resampler_benchmark
+
+librosa is only needed for the comparison column. The old path passed int16
+arrays straight to librosa, which rejects non-float input, so the baseline
+here converts each chunk to float32 first as a working version of that code
+would have to.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.core.realtime.resampler import StreamingResampler
+
+TARGET_RATE = 24000
+SOURCE_RATES = [8000, 16000, 44100, 48000]
+
+
+def make_chunks(rate: int, seconds: float, chunk_duration: float):
+    """Speech-like test signal (two tones plus noise) split into chunks"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * seconds)) / rate
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 1800 * t)
+    signal += 0.05 * rng.standard_normal(len(t))
+    pcm = (signal * 32767).astype(np.int16)
+    size = int(rate * chunk_duration)
+    return [pcm[i : i + size] for i in range(0, len(pcm) - size + 1, size)]
+
+
+def bench_streaming(rate: int, chunks) -> float:
+    resampler = StreamingResampler(rate, TARGET_RATE, max_chunk_samples=len(chunks[0]))
+    start = time.perf_counter()
+    for chunk in chunks:
+        resampler.process(chunk).tobytes()
+    return time.perf_counter() - start
+
+
+def bench_librosa(rate: int, chunks) -> float:
+    import librosa
+
+    def resample(chunk):
+        return librosa.resample(
+            chunk.astype(np.float32) / 32768.0, orig_sr=rate, target_sr=TARGET_RATE
+        ).astype(np.int16).tobytes()
+
+    resample(chunks[0])  # exclude one-off import and backend setup
+    start = time.perf_counter()
+    for chunk in chunks:
+        resample(chunk)
+    return time.perf_counter() - start
+
+
+def boundary_error(rate: int, chunks) -> float:
+    """
+    Largest difference between chunk-by-chunk and one-shot output, in LSB.
+    Zero means chunk boundaries are seamless.
+    """
+    whole = np.concatenate(chunks)
+    streamed = StreamingResampler(rate, TARGET_RATE, max_chunk_samples=len(chunks[0]))
+    pieces = np.concatenate([streamed.process(c).copy() for c in chunks])
+    reference = StreamingResampler(rate, TARGET_RATE, max_chunk_samples=len(whole))
+    expected = reference.process(whole)
+    n = min(len(pieces), len(expected))
+    return float(np.abs(pieces[:n].astype(np.int32) - expected[:n]).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resampler benchmark")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--chunk-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    try:
+        import librosa  # noqa: F401
+        have_librosa = True
+    except ImportError:
+        have_librosa = False
+        print("librosa not installed; skipping baseline column")
+
+    chunk_duration = args.chunk_ms / 1000.0
+    print(f"{args.seconds:.0f}s of audio in {args.chunk_ms:.0f}ms chunks -> {TARGET_RATE} Hz")
+    print(f"{'source':>8} {'streaming us/chunk':>20} {'librosa us/chunk':>18} {'speedup':>8} {'boundary LSB':>13}")
+    for rate in SOURCE_RATES:
+        chunks = make_chunks(rate, args.seconds, chunk_duration)
+        streaming = bench_streaming(rate, chunks) / len(chunks) * 1e6
+        if have_librosa:
+            baseline = bench_librosa(rate, chunks) / len(chunks) * 1e6
+            baseline_text = f"{baseline:18.1f}"
+            speedup_text = f"{baseline / streaming:7.1f}x"
+        else:
+            baseline_text = f"{'-':>18}"
+            speedup_text = f"{'-':>8}"
+        print(
+            f"{rate:>8} {streaming:20.1f} {baseline_text} {speedup_text} "
+            f"{boundary_error(rate, chunks):13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Realtime session creation latency under concurrency: a new aiohttp client
+per session (the previous behaviour) against the shared pooled client.
+
+Sessions are created against a local HTTPS stand-in for
+/v1/realtime/sessions, using a throwaway self-signed certificate made with
+the openssl CLI (plain HTTP with --no-tls, or if openssl is missing). A
+local server has no network round trips, so the difference shown is the
+per-session TCP/TLS handshake and DNS cost alone; against the real API each
+handshake also pays several RTTs.
+
+Run from the repository root:
+    python -m benchmarks.session_create_benchmark
+    python -m benchmarks.session_create_benchmark --sessions 1000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import shutil
+import ssl
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import aiohttp
+from aiohttp import web
+
+from examples.basic_conversation import basic_config
+from src.core.realtime.session import RealtimeSession
+from src.core.utils.http import SharedHttpClient
+
+
+def make_certificate(directory: Path) -> Optional[Path]:
+    """Self-signed localhost certificate, or None without openssl"""
+    if shutil.which("openssl") is None:
+        return None
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", str(key), "-out", str(cert), "-days", "1",
+            "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert
+
+
+async def start_server(cert: Optional[Path], server_ms: float):
+    async def create_session(request: web.Request) -> web.Response:
+        await request.read()
+        if server_ms:
+            await asyncio.sleep(server_ms / 1000)
+        return web.json_response({
+            "id": f"sess_{uuid.uuid4().hex[:12]}",
+            "object": "realtime.session",
+            "client_secret": {"value": "ek_benchmark"},
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1/realtime/sessions", create_session)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    server_ssl = None
+    if cert is not None:
+        server_ssl = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        server_ssl.load_cert_chain(cert, cert.parent / "key.pem")
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=server_ssl)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    scheme = "https" if cert is not None else "http"
+    return runner, f"{scheme}://localhost:{port}/v1"
+
+
+async def create_unpooled(url: str, client_ssl) -> dict:
+    """The previous behaviour: a fresh ClientSession per created session"""
+    connector = aiohttp.TCPConnector(ssl=client_ssl if client_ssl is not None else True)
+    async with aiohttp.ClientSession(connector=connector) as http:
+        async with http.post(url, json={"model": "benchmark"}) as resp:
+            return await resp.json()
+
+
+async def measure(create, sessions: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await create()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "rate": sessions / elapsed,
+    }
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as directory:
+        cert = None if args.no_tls else make_certificate(Path(directory))
+        client_ssl = ssl.create_default_context(cafile=str(cert)) if cert else None
+        runner, api_base = await start_server(cert, args.server_ms)
+        url = f"{api_base}/realtime/sessions"
+
+        pooled = SharedHttpClient(
+            limit=args.concurrency, limit_per_host=args.concurrency, ssl_context=client_ssl
+        )
+        session = RealtimeSession(basic_config, http=pooled, api_base=api_base)
+
+        try:
+            # Warm both paths once so imports and the pool don't skew results
+            await create_unpooled(url, client_ssl)
+            await session._create_realtime_session()
+            results = [
+                ("new client per session",
+                 await measure(lambda: create_unpooled(url, client_ssl), args.sessions, args.concurrency)),
+                ("shared pooled client",
+                 await measure(session._create_realtime_session, args.sessions, args.concurrency)),
+            ]
+        finally:
+            await pooled.close()
+            await runner.cleanup()
+
+    transport = "HTTPS" if cert else "HTTP"
+    print(
+        f"{args.sessions} sessions, concurrency {args.concurrency}, {transport} on localhost, "
+        f"{args.server_ms:.0f} ms server time"
+    )
+    print(f"{'client':<24} {'p50 ms':>8} {'p99 ms':>8} {'sessions/s':>11}")
+    for name, result in results:
+        print(f"{name:<24} {result['p50']:8.1f} {result['p99']:8.1f} {result['rate']:11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session creation benchmark")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--server-ms", type=float, default=5.0)
+    parser.add_argument("--no-tls", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
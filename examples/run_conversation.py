@@ -4,26 +4,13 @@ from dotenv import load_dotenv
 from src.core.realtime.session import RealtimeSession
 from src.core.config.models import ConversationConfig, ConversationPhase
 from examples.basic_conversation import basic_config
-import pyaudio
-import json
+from src.core.realtime.capture import MicrophoneCapture
 
 async def handle_responses(session):
-    """Asynchronously handle responses from the WebSocket"""
-    while True:
-        try:
-            if session.ws:
-                message = await session.ws.recv()
-                if isinstance(message, str):
-                    # Handle JSON messages (events)
-                    event = json.loads(message)
-                    await session.event_handler.handle_event(event)
-                else:
-                    # Handle binary audio data
-                    # The API sends audio as binary PCM16 data
-                    await session.audio_processor.process_output_chunk(message)
-        except Exception as e:
-            print(f"Error handling response: {e}")
-            break
+    """Print what the assistant says; the session receives events itself"""
+    await session.start()
+    async for event in session.events(["response.audio_transcript.done"]):
+        print(f"Assistant: {event.data.get('transcript', '')}")
 
 async def main():
     # Load environment variables
@@ -41,21 +28,14 @@ async def main():
         print("Failed to establish WebSocket connection")
         return
     
-    # PyAudio setup
-    p = pyaudio.PyAudio()
-    CHUNK = int(24000 * 0.1)  # 100ms chunks at 24kHz
-    RATE = 24000              # Required sample rate
-    CHANNELS = 1              # Mono audio required
-    FORMAT = pyaudio.paInt16  # 16-bit PCM required
-
-    # Open the input stream from the microphone
-    stream = p.open(
-        format=FORMAT,
-        channels=CHANNELS,
-        rate=RATE,
-        input=True,
-        frames_per_buffer=CHUNK
+    # Microphone capture runs on PortAudio's thread and feeds a bounded queue
+    RATE = 24000  # Required sample rate
+    capture = MicrophoneCapture(
+        sample_rate=RATE,
+        frames_per_buffer=session.frames.samples(RATE),
+        max_queue_frames=session.frames.capture_queue_frames,
     )
+    await capture.start()
 
     print("Recording from microphone... Press Ctrl+C to stop.")
 
@@ -63,18 +43,14 @@ async def main():
     response_task = asyncio.create_task(handle_responses(session))
 
     try:
-        while True:
-            # 1. Capture audio from the microphone
-            audio_data = stream.read(CHUNK, exception_on_overflow=False)
-            
-            # 2. Process the audio chunk
-            processed_chunk = await session.audio_processor.process_chunk(audio_data)
-            
-            # 3. Send the processed audio chunk directly as bytes
-            if processed_chunk and session.ws:
-                await session.ws.send_bytes(processed_chunk)
+        async for frame in capture:
+            # 1. Process the captured audio chunk
+            processed_chunk = await session.audio_processor.process_chunk(frame.data)
 
-            await asyncio.sleep(0.01)
+            # 2. Queue the processed audio chunk for the session's writer
+            if processed_chunk:
+                await session.send_audio(processed_chunk)
+                capture.mark_sent(frame)
 
     except KeyboardInterrupt:
         print("\nEnding session...")
@@ -91,13 +67,10 @@ async def main():
             pass
 
         # Cleanup audio resources
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+        await capture.close()
 
-        # Close WebSocket connection
-        if session.ws:
-            await session.ws.close()
+        # Stop the session's tasks and close the WebSocket connection
+        await session.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
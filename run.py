@@ -2,74 +2,71 @@
 
 import asyncio
 import argparse
-import pyaudio
-import json
+import importlib
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
-import sounddevice as sd
 import os
-import websockets
 
+from src.core.config.models import FRAME_PROFILES
 from src.core.realtime.session import RealtimeSession
 from src.core.utils.errors import handle_realtime_error
-from examples.language_assessment import language_assessment_config
-from examples.restaurant_ordering import restaurant_ordering_config
-from examples.financial_advisor import financial_advisor_config
 from src.core.realtime.audio_playback import AudioPlayer
-from examples.basic_conversation import basic_config
+from src.core.realtime.capture import MicrophoneCapture
 
 
-# Map of available conversation configs
+# Map of available conversation configs to (module, attribute); only the
+# selected one is imported
 CONVERSATION_CONFIGS = {
-    "language": language_assessment_config,
-    "restaurant": restaurant_ordering_config,
-    "financial": financial_advisor_config,
-    "basic": basic_config
+    "language": ("examples.language_assessment", "language_assessment_config"),
+    "restaurant": ("examples.restaurant_ordering", "restaurant_ordering_config"),
+    "financial": ("examples.financial_advisor", "financial_advisor_config"),
+    "basic": ("examples.basic_conversation", "basic_config")
 }
 
 
+def load_config(config_name: str):
+    """Import and return the named conversation config, or None if unknown"""
+    target = CONVERSATION_CONFIGS.get(config_name)
+    if not target:
+        return None
+    module_name, attribute = target
+    return getattr(importlib.import_module(module_name), attribute)
+
+
 async def handle_responses(session: RealtimeSession):
     """
-    Handle incoming responses from the AI in a background task.
+    Play the assistant's audio while the session runs.
     
-    This function:
-    - Receives WebSocket messages continuously
-    - Processes text events through the event handler
-    - Handles binary audio data for playback
-    - Manages errors and connection issues
+    The session receives and dispatches events on its own task (and
+    reconnects if the connection drops); this plays assistant audio as its
+    deltas arrive until the session is lost or the task is cancelled.
     
     Args:
         session: Active RealtimeSession instance
     """
     audio_player = AudioPlayer()
+    player_sink = session.audio_output.add_player(audio_player)
+    events = session.events(["session.lost"])
     
-    retry_count = 0
-    max_retries = 3
-    
-    while retry_count < max_retries:
-        try:
-            while True:
-                if session.ws:
-                    response = await session.ws.recv()
-                    if isinstance(response, str):
-                        try:
-                            data = json.loads(response)
-                            await session.event_handler.handle_event(data)
-                        except json.JSONDecodeError:
-                            print(f"[error] Failed to parse response: {response}")
-                    else:
-                        # Handle binary audio data
-                        audio_player.play_chunk(response)
-                await asyncio.sleep(0.01)
-        except websockets.exceptions.ConnectionClosed:
-            retry_count += 1
-            print(f"[warn] Connection closed, attempt {retry_count}/{max_retries}")
-            await asyncio.sleep(1)
-            continue
-
-
-async def run_conversation(config_name: str):
+    try:
+        await session.start()
+        async for event in events:
+            print("[error] Connection lost and could not be resumed")
+            break
+    finally:
+        events.close()
+        session.audio_output.remove_sink(player_sink.write)
+        flush = audio_player.flush_latency.snapshot()
+        if flush["count"]:
+            print(
+                f"Interruption-to-silence: p50 {flush['p50_ms']:.1f} ms, "
+                f"p99 {flush['p99_ms']:.1f} ms over {flush['count']} interruptions"
+            )
+        audio_player.close()
+
+
+async def run_conversation(config_name: str, frame_profile: str = None):
     """
     Run a conversation using the specified configuration
     """
@@ -84,10 +81,12 @@ async def run_conversation(config_name: str):
         print("Warning: No API key found in environment variables")
     
     # Get the requested configuration
-    config = CONVERSATION_CONFIGS.get(config_name)
+    config = load_config(config_name)
     if not config:
         print(f"Error: Unknown configuration '{config_name}'")
         return
+    if frame_profile:
+        config = config.model_copy(update={"frame_profile": frame_profile})
     
     # Initialize session
     print(f"Initializing {config.name}...")
@@ -102,41 +101,31 @@ async def run_conversation(config_name: str):
         print("Failed to establish WebSocket connection")
         return
     
-    # PyAudio setup
-    p = pyaudio.PyAudio()
-    CHUNK = int(24000 * 0.1)  # 100ms chunks at 24kHz
-    RATE = 24000              # Required sample rate
-    CHANNELS = 1              # Mono audio required
-    FORMAT = pyaudio.paInt16  # 16-bit PCM required
-
-    # Open the input stream from the microphone
-    stream = p.open(
-        format=FORMAT,
-        channels=CHANNELS,
-        rate=RATE,
-        input=True,
-        frames_per_buffer=CHUNK
+    # Microphone capture runs on PortAudio's thread and feeds a bounded queue
+    RATE = 24000  # Required sample rate
+    frames = session.frames
+    capture = MicrophoneCapture(
+        sample_rate=RATE,
+        frames_per_buffer=frames.samples(RATE),
+        max_queue_frames=frames.capture_queue_frames,
     )
+    await capture.start()
 
-    print(f"\nStarting {config.name}")
+    print(f"\nStarting {config.name} ({frames.name}, {frames.frame_ms} ms frames)")
     print("Recording from microphone... Press Ctrl+C to stop.")
 
     # Start response handler in the background
     response_task = asyncio.create_task(handle_responses(session))
 
     try:
-        while True:
-            # 1. Capture audio from the microphone
-            audio_data = stream.read(CHUNK, exception_on_overflow=False)
-            
-            # 2. Process the audio chunk
-            processed_chunk = await session.audio_processor.process_chunk(audio_data)
-            
-            # 3. Send the processed audio chunk
-            if processed_chunk and session.ws:
-                await session.ws.send(processed_chunk)
-
-            await asyncio.sleep(0.01)
+        async for frame in capture:
+            # 1. Process the captured audio chunk
+            processed_chunk = await session.audio_processor.process_chunk(frame.data)
+
+            # 2. Queue it for the session's writer (base64 input_audio_buffer.append)
+            if processed_chunk:
+                await session.send_audio(processed_chunk)
+                capture.mark_sent(frame)
 
     except KeyboardInterrupt:
         print("\nEnding session...")
@@ -153,13 +142,10 @@ async def run_conversation(config_name: str):
             pass
 
         # Cleanup audio resources
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+        await capture.close()
 
         # Close WebSocket connection
-        if session.ws:
-            await session.ws.close()
+        await session.close()
         
         # Print final status
         status = session.observation_tracker.get_completion_status()
@@ -167,6 +153,25 @@ async def run_conversation(config_name: str):
         print(f"Duration: {status['duration_seconds']:.1f} seconds")
         print(f"Phases completed: {status['phases_completed']}")
         print(f"Total observations: {status['total_observations']}")
+        capture_stats = capture.stats()
+        latency = capture_stats["capture_to_send"]
+        print(
+            f"Capture-to-send latency: p50 {latency['p50_ms']:.1f} ms, "
+            f"p99 {latency['p99_ms']:.1f} ms "
+            f"({capture_stats['frames_dropped']} frames dropped)"
+        )
+        first_audio = session.audio_output.first_audio_latency.snapshot()
+        print(
+            f"Time to first response audio: p50 {first_audio['p50_ms']:.1f} ms, "
+            f"p99 {first_audio['p99_ms']:.1f} ms over {first_audio['count']} responses"
+        )
+        if session.reconnects or session.reconnect_failures:
+            recovery = session.recovery.snapshot()
+            print(
+                f"Reconnects: {session.reconnects} resumed "
+                f"(p50 {recovery['p50_ms']:.0f} ms, max {recovery['max_ms']:.0f} ms), "
+                f"{session.reconnect_failures} failed"
+            )
 
 
 def main():
@@ -176,9 +181,14 @@ def main():
         choices=list(CONVERSATION_CONFIGS.keys()),
         help="The conversation configuration to use"
     )
+    parser.add_argument(
+        "--frame-profile",
+        choices=list(FRAME_PROFILES.keys()),
+        help="Audio frame size profile (defaults to the config's)"
+    )
     args = parser.parse_args()
     
-    asyncio.run(run_conversation(args.config))
+    asyncio.run(run_conversation(args.config, args.frame_profile))
 
 
 if __name__ == "__main__":
@@ -1,12 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from .routes import sessions, websocket
+from .routes import session_manager
+from .routes.websocket import realtime_endpoint
 from .middleware.auth import verify_api_key
+from src.core.realtime.pool import session_pool
+from src.core.realtime.registry import session_registry
+from src.core.utils.http import http_client
+from src.core.utils.metrics import loop_lag
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop_lag.start()
+    session_registry.start()
+    yield
+    await loop_lag.stop()
+    # Close conversations and warm sessions, then release pooled upstream connections
+    await session_registry.close()
+    await session_pool.close()
+    await http_client.close()
 
 app = FastAPI(
     title="Guided Conversation Framework",
     description="Framework for building multi-phase, AI-guided conversations",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -20,7 +38,7 @@ app.add_middleware(
 
 # Include the routes
 app.include_router(
-    sessions.router,
+    session_manager.router,
     prefix="/conversations",
     tags=["conversations"],
     dependencies=[Depends(verify_api_key)]
@@ -28,7 +46,7 @@ app.include_router(
 
 @app.websocket("/realtime/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
-    await websocket.realtime_endpoint(websocket, session_id)
+    await realtime_endpoint(websocket, session_id)
 
 @app.get("/")
 async def root():
@@ -1,22 +1,121 @@
 # src/api/routes/session_manager.py
-from fastapi import APIRouter, HTTPException
-from typing import Dict
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import os
+import re
 import uuid
 import asyncio
 
+from src.core.realtime.admission import admission
+from src.core.realtime.pool import session_pool
+from src.core.realtime.registry import session_registry
 from src.core.realtime.session import RealtimeSession
 from src.core.config.models import ConversationConfig
+from src.core.utils.metrics import loop_lag, process_stats
 
 router = APIRouter()
-SESSIONS: Dict[str, RealtimeSession] = {}
+RECORDINGS_DIR = os.getenv("RECORDINGS_DIR", "recordings")
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
 
 @router.post("/")
-async def create_session(config: ConversationConfig):
+async def create_session(config: ConversationConfig, record: bool = False):
     session_id = str(uuid.uuid4())
-    session = RealtimeSession(config)
-    await session.initialize()
-    SESSIONS[session_id] = session
+    # Warm sessions skip session creation and the upstream handshake
+    session = await session_pool.acquire(config)
+    if record:
+        session.enable_recording(RECORDINGS_DIR, name=session_id)
+    session_registry.register(session_id, session)
     return {"session_id": session_id}
 
+@router.get("/pool")
+async def get_pool_stats():
+    """Warm session pool hit rate, acquisition latency and sizes"""
+    return session_pool.stats()
+
+@router.get("/metrics")
+async def get_metrics():
+    """Worker health under load: event loop lag, process CPU and memory"""
+    return {
+        "sessions": len(session_registry),
+        "registry": session_registry.stats(),
+        "event_loop_lag": loop_lag.snapshot(),
+        "process": process_stats(),
+        "pool": session_pool.stats(),
+        "admission": admission.stats(),
+    }
+
+@router.delete("/{session_id}")
+async def delete_session(session_id: str):
+    """End a conversation and release its upstream connection"""
+    if not await session_registry.remove(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": session_id, "deleted": True}
+
+@router.get("/{session_id}/stats")
+async def get_session_stats(session_id: str):
+    """Audio pipeline, event bus subscriber lag and recording stats"""
+    session = get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session.stats()
+
+@router.get("/{session_id}/recordings/{direction}")
+async def get_recording(session_id: str, direction: str, request: Request):
+    """
+    Download the input or output recording of a session as WAV. Works while
+    the conversation is still running and supports a single byte Range, so
+    a player can seek or poll for new audio. The body is streamed in
+    fixed-size pieces read from the recording's memory map.
+    """
+    session = get_session(session_id)
+    if session is None or session.recorder is None:
+        raise HTTPException(status_code=404, detail="No recording for this session")
+    try:
+        track = session.recorder.track(direction)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    size = track.size
+    headers = {"Accept-Ranges": "bytes"}
+    range_header = request.headers.get("range")
+    if not range_header:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            _stream(track.iter_range(0, size)), media_type="audio/wav", headers=headers
+        )
+
+    match = _RANGE.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(status_code=416, detail="Unsupported Range header")
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    else:
+        # Suffix range: the last N bytes
+        start = max(0, size - int(last))
+        end = size
+    if start >= end:
+        raise HTTPException(
+            status_code=416,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    headers["Content-Length"] = str(end - start)
+    return StreamingResponse(
+        _stream(track.iter_range(start, end)),
+        status_code=206,
+        media_type="audio/wav",
+        headers=headers,
+    )
+
+async def _stream(pieces):
+    # Read on the event loop rather than a worker thread, so a read never
+    # races the appends to, or the close of, the memory map
+    for piece in pieces:
+        yield piece
+
 def get_session(session_id: str) -> RealtimeSession:
-    return SESSIONS.get(session_id)
\ No newline at end of file
+    return session_registry.get(session_id)
@@ -1,7 +1,24 @@
 from fastapi import WebSocket, WebSocketDisconnect, HTTPException
-import json
 from typing import Optional
 from src.api.routes.session_manager import get_session
+from src.core.realtime.registry import session_registry
+from src.core.realtime.codec import codec
+from src.core.realtime.formats import AudioFormat
+from src.core.realtime.output import ClientSink
+from src.core.utils.errors import AudioError
+
+# Client events passed through to the Realtime API. Anything else is
+# rejected: server events such as rate_limits.updated must only come from
+# upstream, and audio goes through the binary path to be converted
+FORWARDED_CLIENT_EVENTS = frozenset({
+    "input_audio_buffer.commit",
+    "input_audio_buffer.clear",
+    "conversation.item.create",
+    "conversation.item.truncate",
+    "conversation.item.delete",
+    "response.create",
+    "response.cancel",
+})
 
 async def realtime_endpoint(websocket: WebSocket, session_id: str):
     """
@@ -9,9 +26,38 @@ async def realtime_endpoint(websocket: WebSocket, session_id: str):
     
     This endpoint:
     - Validates the session
+    - Negotiates the client's audio format
     - Processes incoming audio chunks
     - Handles text-based control messages
     - Manages WebSocket lifecycle
+
+    Clients that don't send PCM16 mono at 24kHz declare their format with a
+    text message before streaming audio, e.g.:
+        {"type": "audio.format", "encoding": "float32",
+         "channels": 2, "sample_rate": 48000}
+    Telephony gateways can send G.711 directly:
+        {"type": "audio.format", "encoding": "g711_ulaw", "sample_rate": 8000}
+    Audio sent back uses the mono version of the input format unless an
+    "output" object with the same fields is included. The server replies
+    with "audio.format.accepted" or an "error" message.
+
+    The conversation outlives the connection: a client that drops can
+    reconnect to the same session until it has been idle for the
+    registry's TTL. Sending {"type": "end"} ends the conversation and
+    closes the session. Connections to a closed session are rejected.
+
+    When the user barges in, the server sends
+        {"type": "audio.interrupt", "item_id": "...", "played_ms": 1200}
+    and the client should drop any assistant audio it hasn't played yet.
+    The interrupted reply is truncated to what the user heard, which the
+    client reports as it plays, e.g. every 100-200 ms:
+        {"type": "audio.played", "played_ms": 53400}
+    where played_ms counts all assistant audio played since connecting.
+    Without reports, everything sent is assumed heard.
+
+    Other text messages are forwarded to the Realtime API if their type is
+    in FORWARDED_CLIENT_EVENTS, e.g. {"type": "response.cancel"}; any other
+    type gets an "error" reply.
     
     Args:
         websocket: FastAPI WebSocket connection
@@ -21,34 +67,93 @@ async def realtime_endpoint(websocket: WebSocket, session_id: str):
         WebSocketDisconnect: When client disconnects
     """
     session = get_session(session_id)
-    if not session:
+    if session is None or session.closed:
         await websocket.close(code=4000)
         return
         
     await websocket.accept()
-    
+    # Not evicted while a client is connected
+    session_registry.attach(session_id)
+
+    # Each connection starts from the default format until it declares its own
+    session.audio_processor.configure_input(AudioFormat())
+
+    # Assistant audio goes back to the client in its negotiated format
+    async def send_output_audio(pcm: bytes):
+        await websocket.send_bytes(await session.audio_processor.process_output_chunk(pcm))
+
+    async def send_control(message: dict):
+        await websocket.send_text(codec.dumps(message))
+
+    # Barge-in stops the client's playback and asks it how much it played
+    sink = ClientSink(session.audio_output, send_output_audio, send_control)
+    session.audio_output.add_sink(sink.write, interrupt=sink.interrupt)
+    # The session receives upstream events and writes upstream on its own tasks
+    await session.start()
+
+    ended = False
     try:
         while True:
             message = await websocket.receive()
             message_type = message.get("type")
+            if message_type == "websocket.disconnect":
+                break
             
-            if message_type == "websocket.receive.bytes":
-                audio_data = message.get("bytes")
+            # Starlette delivers both frame kinds as "websocket.receive"
+            if message.get("bytes") is not None:
+                audio_data = message["bytes"]
                 processed = await session.audio_processor.process_chunk(audio_data)
-                if processed and session.ws:
-                    await session.ws.send_bytes(processed)
+                if processed:
+                    await session.send_audio(processed)
             
-            elif message_type == "websocket.receive.text":
-                data = json.loads(message.get("text"))
+            elif message.get("text") is not None:
+                data = codec.loads(message["text"])
+                if not isinstance(data, dict):
+                    data = {}
                 if data.get("type") == "end":
+                    ended = True
                     break
-                await session.event_handler.handle_event(data)
+                if data.get("type") == "audio.played":
+                    sink.report_played(data.get("played_ms", 0))
+                    continue
+                if data.get("type") == "audio.format":
+                    try:
+                        audio_format = AudioFormat.from_message(data)
+                        output_format = None
+                        if data.get("output"):
+                            output_format = AudioFormat.from_message(data["output"])
+                    except AudioError as e:
+                        await websocket.send_text(codec.dumps({
+                            "type": "error",
+                            "error": {"message": e.message, **e.details}
+                        }))
+                        continue
+                    processor = session.audio_processor
+                    processor.configure_input(audio_format, output_format)
+                    await websocket.send_text(codec.dumps({
+                        "type": "audio.format.accepted",
+                        **audio_format.to_dict(),
+                        "output": processor.output_format.to_dict()
+                    }))
+                    continue
+                if data.get("type") in FORWARDED_CLIENT_EVENTS:
+                    await session.send_event(data)
+                    continue
+                await websocket.send_text(codec.dumps({
+                    "type": "error",
+                    "error": {"message": f"Unsupported client event type: {data.get('type')!r}"}
+                }))
                 
     except WebSocketDisconnect:
         print(f"WebSocket disconnected for session {session_id}")
     except Exception as e:
         print(f"Error in WebSocket handler: {e}")
     finally:
-        # Cleanup
-        if session.ws:
-            await session.ws.close()
\ No newline at end of file
+        session.audio_output.remove_sink(sink.write)
+        session_registry.detach(session_id)
+        if ended:
+            # Runs the close hooks, which close the session
+            await session_registry.remove(session_id)
+        # Otherwise the session stays open for a reconnect; the registry's
+        # idle sweep closes it if none comes
+
@@ -1,5 +1,30 @@
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+
+
+class FrameProfile(BaseModel):
+    """
+    Audio frame size used by every stage of the input path: microphone
+    buffers, processor chunks, the VAD gate and upstream sends. Smaller
+    frames cut buffering latency at the cost of more sends and per-frame
+    overhead.
+    """
+    name: str
+    frame_ms: int
+    capture_queue_frames: int  # Frames queued before capture starts dropping
+
+    def samples(self, sample_rate: int = 24000) -> int:
+        """Samples per frame at `sample_rate`"""
+        return sample_rate * self.frame_ms // 1000
+
+
+FRAME_PROFILES: Dict[str, FrameProfile] = {
+    # Phone agents: 20ms frames, at most 200ms queued
+    "low_latency": FrameProfile(name="low_latency", frame_ms=20, capture_queue_frames=10),
+    "balanced": FrameProfile(name="balanced", frame_ms=100, capture_queue_frames=10),
+    # Fewer, larger sends when latency matters less than overhead
+    "batch": FrameProfile(name="batch", frame_ms=200, capture_queue_frames=5),
+}
 
 class ConversationPhase(BaseModel):
     name: str
@@ -23,6 +48,32 @@ class ConversationConfig(BaseModel):
     max_duration_seconds: Optional[int]
     completion_criteria: Dict[str, Any]
     voice: str = "alloy"
+    frame_profile: str = "balanced"
+    frame_ms: Optional[int] = None  # Overrides the profile's frame size
 
     class Config:
-        extra = "forbid" 
\ No newline at end of file
+        extra = "forbid"
+
+    @field_validator("frame_profile")
+    @classmethod
+    def _known_frame_profile(cls, value: str) -> str:
+        if value not in FRAME_PROFILES:
+            raise ValueError(
+                f"Unknown frame_profile '{value}', expected one of {sorted(FRAME_PROFILES)}"
+            )
+        return value
+
+    @field_validator("frame_ms")
+    @classmethod
+    def _valid_frame_ms(cls, value: Optional[int]) -> Optional[int]:
+        # Whole 10ms steps keep VAD analysis frames and 8kHz G.711 frames integral
+        if value is not None and (value < 10 or value > 1000 or value % 10):
+            raise ValueError("frame_ms must be a multiple of 10 between 10 and 1000")
+        return value
+
+    def frame_settings(self) -> FrameProfile:
+        """The frame profile in effect, with any frame_ms override applied"""
+        profile = FRAME_PROFILES[self.frame_profile]
+        if self.frame_ms is not None:
+            profile = profile.model_copy(update={"frame_ms": self.frame_ms})
+        return profile
@@ -95,7 +95,7 @@ class PhaseManager:
         instructions = f"{self.session.config.system_instructions}\n\nCurrent phase: {phase_config.name}\n{phase_config.instructions}"
         
         # Update session instructions via API
-        await self.session.ws.send_json({
-            "type": "update_instructions",
-            "instructions": instructions
+        await self.session.send_event({
+            "type": "session.update",
+            "session": {"instructions": instructions}
         }) 
\ No newline at end of file
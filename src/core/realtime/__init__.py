@@ -1,13 +1,29 @@
-from .session import RealtimeSession
-from .events import RealtimeEventHandler
-from .audio import RealtimeAudioProcessor
-from .phase_manager import PhaseManager
-from .observation_tracker import ObservationTracker
-
-__all__ = [
-    'RealtimeSession',
-    'RealtimeEventHandler',
-    'RealtimeAudioProcessor',
-    'PhaseManager',
-    'ObservationTracker'
-] 
\ No newline at end of file
+from importlib import import_module
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# this package doesn't pull in NumPy or audio device libraries.
+_EXPORTS = {
+    'RealtimeSession': '.session',
+    'RealtimeEventHandler': '.events',
+    'RealtimeAudioProcessor': '.audio',
+    'PhaseManager': '.phase_manager',
+    'ObservationTracker': '.observation_tracker',
+    'AudioFormat': '.formats',
+    'AudioPlayer': '.audio_playback',
+    'MicrophoneCapture': '.capture',
+    'ResponseAudioStream': '.output',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,260 @@
+import asyncio
+import os
+import re
+import time
+from typing import Dict, Iterable, Mapping, Optional
+
+from ..utils.metrics import LatencyStats
+
+# Realtime API request and token limits are per minute
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+# Pause after a 429 that doesn't say how long to wait
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds in a rate limit header value such as "1s", "6m0s" or "20ms" """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNITS[unit] for amount, unit in parts)
+
+
+def _env_rate(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) / RATE_LIMIT_WINDOW_SECONDS if value else None
+
+
+class TokenBucket:
+    """
+    Token bucket shaping one upstream budget.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    `acquire` waits, in FIFO order, until enough tokens are available or a
+    pause imposed by the API has passed. A bucket without a rate admits
+    everything until a limit is learned from the API.
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens per second, or None for no shaping
+            capacity: Largest burst; defaults to one window's worth of rate
+        """
+        self.rate = rate
+        self.capacity = capacity or (rate * RATE_LIMIT_WINDOW_SECONDS if rate else None)
+        self.tokens = self.capacity or 0.0
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.wait = LatencyStats()
+        self.admitted = 0
+        self.throttled = 0  # 429s and exhausted limits reported by the API
+        self.waiting = 0
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _delay(self, cost: float) -> float:
+        """Seconds until `cost` tokens can be taken; 0 takes them now"""
+        now = time.monotonic()
+        self._refill(now)
+        if self._blocked_until > now:
+            return self._blocked_until - now
+        if self.rate is None:
+            return 0.0
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def try_acquire(self, cost: float = 1.0) -> bool:
+        """Take `cost` tokens if available now, without waiting"""
+        return self._delay(cost) == 0.0
+
+    async def acquire(self, cost: float = 1.0) -> float:
+        """
+        Wait for `cost` tokens and take them.
+
+        Returns:
+            float: Milliseconds spent queued
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    delay = self._delay(cost)
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+        finally:
+            self.waiting -= 1
+        waited_ms = (time.perf_counter() - start) * 1000
+        self.wait.record(waited_ms)
+        self.admitted += 1
+        return waited_ms
+
+    def observe(self, limit: float, remaining: float):
+        """
+        Sync with a per-minute limit reported by the API. The API's count
+        of what is left wins over ours if it is lower, e.g. because of
+        traffic the bucket never saw.
+        """
+        if limit <= 0:
+            return
+        self._refill(time.monotonic())
+        learned = self.rate is None
+        self.rate = limit / RATE_LIMIT_WINDOW_SECONDS
+        self.capacity = float(limit)
+        remaining = max(0.0, min(float(remaining), self.capacity))
+        self.tokens = remaining if learned else min(self.tokens, remaining)
+
+    def pause(self, seconds: float):
+        """Admit nothing for `seconds`, e.g. after a 429"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def stats(self) -> Dict:
+        self._refill(time.monotonic())
+        return {
+            "rate_per_minute": self.rate * RATE_LIMIT_WINDOW_SECONDS if self.rate else None,
+            "tokens": self.tokens if self.rate is not None else None,
+            "paused_seconds": max(0.0, self._blocked_until - time.monotonic()),
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "queue_wait": self.wait.snapshot(),
+        }
+
+
+class AdmissionScheduler:
+    """
+    Process-wide shaping of Realtime API traffic that counts against rate
+    limits, shared by every session so a burst queues instead of failing.
+
+    Two budgets are kept:
+        sessions   POST /realtime/sessions; synced from x-ratelimit-*
+                   response headers and paused on 429 (Retry-After)
+        responses  client response.create events; synced from
+                   rate_limits.updated ("requests", and "tokens", which
+                   pauses responses while exhausted)
+
+    Until the API reports a limit, a budget admits everything. Starting
+    limits can be set per minute with REALTIME_SESSIONS_PER_MINUTE and
+    REALTIME_RESPONSES_PER_MINUTE.
+    """
+
+    def __init__(
+        self,
+        sessions_per_minute: Optional[float] = None,
+        responses_per_minute: Optional[float] = None,
+    ):
+        session_rate = (
+            sessions_per_minute / RATE_LIMIT_WINDOW_SECONDS
+            if sessions_per_minute else _env_rate("REALTIME_SESSIONS_PER_MINUTE")
+        )
+        response_rate = (
+            responses_per_minute / RATE_LIMIT_WINDOW_SECONDS
+            if responses_per_minute else _env_rate("REALTIME_RESPONSES_PER_MINUTE")
+        )
+        self.sessions = TokenBucket(session_rate)
+        self.responses = TokenBucket(response_rate)
+
+    async def admit_session(self) -> float:
+        """Wait for a session creation slot; returns milliseconds queued"""
+        return await self.sessions.acquire()
+
+    async def admit_response(self) -> float:
+        """Wait for a response.create slot; returns milliseconds queued"""
+        return await self.responses.acquire()
+
+    def on_rate_limits(self, rate_limits: Iterable[Mapping]):
+        """
+        Feed a rate_limits.updated event's `rate_limits` list. Malformed
+        entries are skipped.
+        """
+        if not isinstance(rate_limits, (list, tuple)):
+            return
+        for entry in rate_limits:
+            if not isinstance(entry, Mapping):
+                continue
+            limit = entry.get("limit")
+            remaining = entry.get("remaining")
+            if not _is_number(limit) or not _is_number(remaining):
+                continue
+            name = entry.get("name")
+            if name == "requests":
+                self.responses.observe(limit, remaining)
+            elif name == "tokens" and remaining <= 0:
+                # Token cost isn't known up front; just hold responses until reset
+                reset = entry.get("reset_seconds")
+                self.responses.throttled += 1
+                self.responses.pause(
+                    reset if _is_number(reset) and reset > 0 else DEFAULT_RETRY_AFTER_SECONDS
+                )
+
+    def on_session_response(self, status: int, headers: Mapping[str, str]):
+        """Feed the status and headers of a POST /realtime/sessions response"""
+        limit = headers.get("x-ratelimit-limit-requests")
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        if limit is not None and remaining is not None:
+            try:
+                self.sessions.observe(float(limit), float(remaining))
+            except ValueError:
+                pass
+        if status == 429:
+            self.sessions.throttled += 1
+            self.sessions.pause(retry_after(headers))
+
+    def on_error(self, error: Mapping):
+        """Feed an error event; a rate limit error pauses responses"""
+        if isinstance(error, Mapping) and error.get("code") == "rate_limit_exceeded":
+            self.responses.throttled += 1
+            self.responses.pause(DEFAULT_RETRY_AFTER_SECONDS)
+
+    def stats(self) -> Dict:
+        return {
+            "sessions": self.sessions.stats(),
+            "responses": self.responses.stats(),
+        }
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def retry_after(headers: Mapping[str, str]) -> float:
+    """Seconds to wait from Retry-After / retry-after-ms, with a default"""
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return float(milliseconds) / 1000
+        except ValueError:
+            pass
+    seconds = parse_duration(headers.get("retry-after"))
+    return seconds if seconds is not None else DEFAULT_RETRY_AFTER_SECONDS
+
+
+# Shared by every RealtimeSession in the process
+admission = AdmissionScheduler()
@@ -1,47 +1,169 @@
 import base64
 import numpy as np
-import librosa
-from typing import Optional
-import sounddevice as sd  # For audio playback
+from dataclasses import replace
+from typing import Dict, Optional
+
+from . import g711
+from .formats import AudioFormat
+from .resampler import StreamingResampler
+from .vad import VoiceActivityDetector
 
 class RealtimeAudioProcessor:
     """Handles audio processing for Realtime API"""
-    
+
     SAMPLE_RATE = 24000  # Must be 24kHz
     FORMAT = "pcm16"     # Must be PCM16
-    
-    def __init__(self):
+
+    def __init__(
+        self,
+        input_sample_rate: int = SAMPLE_RATE,
+        vad: Optional[VoiceActivityDetector] = None,
+        input_format: Optional[AudioFormat] = None,
+        frame_ms: float = 100
+    ):
+        """
+        Args:
+            input_sample_rate: Sample rate of the PCM16 audio passed to
+                `process_chunk`. Audio is resampled to 24kHz when it differs.
+            vad: Optional voice activity gate. When set, `process_chunk`
+                returns None for chunks that contain no speech.
+            input_format: Full input format; overrides `input_sample_rate`
+            frame_ms: Expected chunk duration (see FrameProfile); buffers
+                are sized for it
+        """
         self.sample_rate = 24000
         self.channels = 1
-        self.chunk_duration = 0.1  # 100ms chunks
+        self.chunk_duration = frame_ms / 1000
         self.chunk_samples = int(self.sample_rate * self.chunk_duration)
+        self.vad = vad
+        self.recorder = None  # Optional SessionRecorder
+        self._decoded = np.empty(0, dtype=np.int16)
+        self._partial = b""  # Trailing bytes of a frame split across chunks
+        self.configure_input(input_format or AudioFormat(sample_rate=input_sample_rate))
+
+    @property
+    def input_sample_rate(self) -> int:
+        return self.input_format.sample_rate
+
+    def set_input_sample_rate(self, input_sample_rate: int):
+        """Change only the sample rate of the input format"""
+        self.configure_input(replace(self.input_format, sample_rate=input_sample_rate))
+
+    def configure_input(
+        self,
+        input_format: AudioFormat,
+        output_format: Optional[AudioFormat] = None
+    ):
+        """
+        Declare the format of incoming audio. This resets the resampler and
+        any partial frame held back, so call it before the stream starts
+        (e.g. during a connection handshake).
+
+        Args:
+            input_format: Format of audio passed to `process_chunk`
+            output_format: Format `process_output_chunk` produces. Defaults
+                to the mono version of the input format, so a G.711 caller
+                gets G.711 back.
+        """
+        self.input_format = input_format
+        self._partial = b""
+        self.resampler = StreamingResampler(
+            input_format.sample_rate,
+            self.sample_rate,
+            max_chunk_samples=int(input_format.sample_rate * self.chunk_duration)
+        )
+        self.configure_output(output_format or replace(input_format, channels=1))
+
+    def configure_output(self, output_format: AudioFormat):
+        """Declare the format audio from the API is converted to for the client"""
+        self.output_format = output_format
+        self.output_resampler = StreamingResampler(
+            self.sample_rate,
+            output_format.sample_rate,
+            max_chunk_samples=self.chunk_samples
+        )
 
     async def process_chunk(self, chunk: bytes) -> Optional[bytes]:
-        """Process input audio chunk"""
+        """
+        Process input audio chunk. Chunks needn't hold whole frames: bytes
+        of a frame split across chunks are held back and completed by the
+        next chunk, like the resampler's filter state, so samples stay
+        aligned upstream and in the recording.
+        """
         try:
-            # Convert to numpy array
-            audio = np.frombuffer(chunk, dtype=np.int16)
-            
-            # Ensure mono
-            if len(audio.shape) > 1:
-                audio = audio.mean(axis=1).astype(np.int16)
-            
-            # Ensure correct sample rate
-            if len(audio) != self.chunk_samples:
-                audio = librosa.resample(
-                    audio,
-                    orig_sr=len(audio) / self.chunk_duration,
-                    target_sr=self.sample_rate
-                ).astype(np.int16)
-            
-            return audio.tobytes()
-            
+            fmt = self.input_format
+
+            if self._partial:
+                chunk = self._partial + chunk
+                self._partial = b""
+            frames = len(chunk) // fmt.frame_bytes
+            whole = frames * fmt.frame_bytes
+            if whole < len(chunk):
+                self._partial = chunk[whole:]
+                chunk = chunk[:whole]
+            if not frames:
+                return None
+
+            # View the raw bytes as (frames, channels); no copy
+            audio = np.frombuffer(
+                chunk, dtype=fmt.dtype, count=frames * fmt.channels
+            ).reshape(frames, fmt.channels)
+
+            if fmt.channels == 1:
+                audio = audio[:, 0]
+
+            # Expand G.711 codes through the lookup table into a reused buffer
+            if fmt.is_g711:
+                if len(self._decoded) < frames:
+                    self._decoded = np.empty(frames, dtype=np.int16)
+                audio = g711.decode(audio, fmt.encoding, out=self._decoded[:frames])
+
+            # Downmix, convert to int16 and resample to 24kHz in one pass,
+            # carrying filter state across chunks. Mono PCM16 at 24kHz comes
+            # back as the same array and is sent as is.
+            processed = self.resampler.process(audio, scale=fmt.scale)
+            if processed is not audio or fmt.is_g711:
+                chunk = processed.tobytes()
+            audio = processed
+
+            if self.recorder is not None:
+                self.recorder.record_input(chunk)
+
+            # Drop silence before it goes upstream
+            if self.vad is not None:
+                return self.vad.gate(audio, chunk)
+
+            return chunk
+
         except Exception as e:
             print(f"Error processing audio chunk: {e}")
             return None
-            
-    async def process_output_chunk(self, chunk: bytes):
-        """Process output audio chunk from the API"""
-        # The API sends PCM16 audio that can be played directly
-        # Implement audio playback here if needed
-        pass 
\ No newline at end of file
+
+    def stats(self) -> Dict:
+        """Per-session audio processing stats"""
+        stats = {"input_format": self.input_format.to_dict()}
+        if self.vad is not None:
+            stats["vad"] = self.vad.stats()
+        return stats
+
+    async def process_output_chunk(self, chunk: bytes) -> bytes:
+        """
+        Convert a chunk of API audio (PCM16, 24kHz, mono) to the client's
+        output format
+        """
+        fmt = self.output_format
+        if (
+            fmt.encoding == "pcm16"
+            and fmt.channels == 1
+            and self.output_resampler.passthrough
+        ):
+            return chunk
+
+        pcm = self.output_resampler.process(np.frombuffer(chunk, dtype=np.int16))
+        if fmt.is_g711:
+            return g711.encode(pcm, fmt.encoding).tobytes()
+        if fmt.channels > 1:
+            pcm = np.repeat(pcm, fmt.channels)
+        if fmt.encoding == "float32":
+            return np.multiply(pcm, 1.0 / 32768.0, dtype=fmt.dtype).tobytes()
+        return pcm.tobytes()
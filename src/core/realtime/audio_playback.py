@@ -1,21 +1,203 @@
-import sounddevice as sd
+import time
 import numpy as np
-from typing import Optional
+from typing import Dict, Optional
+
+from ..utils.metrics import LatencyStats
+from .ring_buffer import AudioRingBuffer
 
 class AudioPlayer:
-    """Simple audio playback handler"""
-    def __init__(self, sample_rate: int = 24000):
+    """
+    Non-blocking audio playback handler.
+
+    Audio is written into a lock-free ring buffer and pulled out by the
+    sounddevice output stream callback on PortAudio's thread, so queueing
+    audio never waits for it to play.
+
+    Playback starts once the jitter buffer holds `target` milliseconds of
+    audio. Running dry mid-stream counts as an underrun, grows the target and
+    returns to prebuffering; long stretches of clean playback shrink it
+    again. Audio that does not fit in the ring counts as an overrun and is
+    dropped.
+
+    `flush()` empties the buffer from the next callback on, for barge-in.
+    Positions are counted in samples since creation, so a caller can tell
+    how much of what it wrote has actually been heard.
+    """
+    def __init__(
+        self,
+        sample_rate: int = 24000,
+        buffer_seconds: float = 60.0,
+        block_ms: float = 20.0,
+        jitter_min_ms: float = 40.0,
+        jitter_max_ms: float = 400.0,
+        jitter_initial_ms: float = 80.0,
+        adapt_after_seconds: float = 5.0,
+    ):
         self.sample_rate = sample_rate
+        self.blocksize = int(sample_rate * block_ms / 1000)
         self._stream = None
+        self._ring = AudioRingBuffer(int(sample_rate * buffer_seconds))
+
+        self._jitter_min = int(sample_rate * jitter_min_ms / 1000)
+        self._jitter_max = int(sample_rate * jitter_max_ms / 1000)
+        self._jitter_target = int(sample_rate * jitter_initial_ms / 1000)
+        self._adapt_after = int(sample_rate * adapt_after_seconds)
+
+        self._playing = False
+        self._end_of_stream = False
+        self._clean_frames = 0
+
+        self.underruns = 0
+        self.overruns = 0
+        self.dropped_samples = 0
+        self.frames_played = 0
+        self.flushes = 0
+        self.flushed_samples = 0
+        self.flush_latency = LatencyStats()  # flush() request to silence
+
+        self._flush_requested_at: Optional[float] = None
+
+    def start(self):
+        """Open and start the output stream if it isn't running"""
+        if self._stream is not None:
+            return
+        # Imported here so PortAudio is only needed once playback starts
+        import sounddevice as sd
+
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="int16",
+            blocksize=self.blocksize,
+            callback=self._callback,
+        )
+        self._stream.start()
+
+    def close(self):
+        """Stop and close the output stream"""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    async def enqueue(self, audio_data: bytes):
+        """
+        Queue PCM16 audio for playback. This only copies the samples into
+        the ring buffer and returns immediately; it never waits on the
+        device.
+        """
+        self.play_chunk(audio_data)
 
     def play_chunk(self, audio_data: bytes):
-        """Play a chunk of audio data"""
-        try:
-            # Convert bytes to numpy array
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            
-            # Play audio
-            sd.play(audio_array, self.sample_rate)
-            sd.wait()  # Wait until audio is finished playing
-        except Exception as e:
-            print(f"Error playing audio: {e}") 
\ No newline at end of file
+        """Queue a chunk of PCM16 audio without blocking"""
+        samples = np.frombuffer(audio_data, dtype=np.int16)
+        self._end_of_stream = False
+        written = self._ring.write(samples)
+        if written < len(samples):
+            self.overruns += 1
+            self.dropped_samples += len(samples) - written
+        if self._stream is None:
+            self.start()
+
+    @property
+    def write_position(self) -> int:
+        """Position, in samples, of the next sample written"""
+        return self._ring.total_written
+
+    def playback_position(self) -> int:
+        """
+        Position, in samples, of the audio currently coming out of the
+        device: what the callback has consumed, less the device's output
+        latency while playing.
+        """
+        position = self._ring.total_read
+        if self._stream is not None and self._playing:
+            position -= int(self._stream.latency * self.sample_rate)
+        return max(0, position)
+
+    def flush(self):
+        """
+        Drop all queued audio. Takes effect at the start of the next
+        callback, which outputs silence; returns immediately.
+        """
+        self._end_of_stream = False
+        if self._stream is None:
+            # No callback is consuming the ring, so it is safe to empty here
+            self.flushed_samples += self._ring.discard()
+            return
+        self._flush_requested_at = time.perf_counter()
+
+    def mark_end_of_stream(self):
+        """
+        Signal that no more audio follows for now (e.g. a response finished),
+        so a short tail plays without waiting for the jitter target and the
+        buffer draining to empty isn't counted as an underrun.
+        """
+        self._end_of_stream = True
+
+    def _callback(self, outdata, frames, time_info, status):
+        """sounddevice callback: fill `outdata` from the ring buffer"""
+        out = outdata[:, 0]
+        if self._flush_requested_at is not None:
+            self._apply_flush(out, time_info)
+            return
+
+        if not self._playing:
+            buffered = self._ring.available
+            if buffered == 0 or (
+                buffered < self._jitter_target and not self._end_of_stream
+            ):
+                out.fill(0)
+                return
+            self._playing = True
+
+        count = self._ring.read_into(out)
+        self.frames_played += count
+        if count < frames:
+            out[count:] = 0
+            self._playing = False
+            if not self._end_of_stream:
+                self.underruns += 1
+                self._clean_frames = 0
+                self._jitter_target = min(
+                    self._jitter_max, int(self._jitter_target * 1.5)
+                )
+            return
+
+        self._clean_frames += count
+        if self._clean_frames >= self._adapt_after:
+            self._clean_frames = 0
+            self._jitter_target = max(
+                self._jitter_min, int(self._jitter_target * 0.9)
+            )
+
+    def _apply_flush(self, out: np.ndarray, time_info):
+        """Discard the buffer and output silence (callback side)"""
+        requested_at = self._flush_requested_at
+        self._flush_requested_at = None
+        self.flushed_samples += self._ring.discard()
+        self.flushes += 1
+        self._playing = False
+        out.fill(0)
+
+        latency = time.perf_counter() - requested_at
+        # Audio already handed to the device still plays until this block
+        # reaches the DAC
+        dac_delay = getattr(time_info, "outputBufferDacTime", 0) - getattr(
+            time_info, "currentTime", 0
+        )
+        self.flush_latency.record((latency + max(0.0, dac_delay)) * 1000)
+
+    def stats(self) -> Dict[str, float]:
+        """Playback counters and current jitter buffer state"""
+        return {
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+            "dropped_samples": self.dropped_samples,
+            "frames_played": self.frames_played,
+            "buffered_ms": self._ring.available * 1000 / self.sample_rate,
+            "jitter_target_ms": self._jitter_target * 1000 / self.sample_rate,
+            "flushes": self.flushes,
+            "flushed_samples": self.flushed_samples,
+            "flush_to_silence": self.flush_latency.snapshot(),
+        }
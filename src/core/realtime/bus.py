@@ -0,0 +1,219 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..utils.metrics import LatencyStats
+from .queues import DropPolicy, offer
+
+# Queued after a subscription's last event
+_END_OF_STREAM = object()
+
+# Event types whose subscribers are cached; the cache starts over when full
+MAX_CACHED_ROUTES = 512
+
+
+@dataclass
+class BusEvent:
+    """An event as delivered to subscribers"""
+    type: str
+    data: Dict[str, Any]
+    published_at: float  # time.perf_counter()
+
+
+class Subscription:
+    """
+    One subscriber's bounded view of an EventBus.
+
+    Usage:
+        subscription = session.bus.subscribe(["phase.changed", "response."])
+        async for event in subscription:
+            ...
+        subscription.close()
+
+    Iteration ends when the subscription or its bus is closed, after the
+    events already queued.
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        types: Iterable[str],
+        maxsize: int,
+        drop_policy: DropPolicy,
+        name: str,
+    ):
+        self.bus = bus
+        self.name = name
+        self.types = tuple(types)
+        self.drop_policy = DropPolicy(drop_policy)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.lag = LatencyStats()  # Publish to get()
+        self.delivered = 0  # Events queued
+        self.dropped = 0
+        self.closed = False
+
+    def matches(self, event_type: str) -> bool:
+        """Exact types, "prefix." families and "*" for everything"""
+        for wanted in self.types:
+            if wanted == "*" or wanted == event_type or (
+                wanted.endswith(".") and event_type.startswith(wanted)
+            ):
+                return True
+        return False
+
+    def _offer(self, event: BusEvent):
+        if offer(self.queue, event, self.drop_policy):
+            self.dropped += 1
+            if self.drop_policy == DropPolicy.DROP_NEWEST:
+                return
+        self.delivered += 1
+
+    def _end(self):
+        """Queue the end of the stream, making room for it if necessary"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(_END_OF_STREAM)
+
+    async def get(self) -> BusEvent:
+        """
+        Wait for the next event.
+
+        Raises:
+            StopAsyncIteration: Once the subscription is closed and drained
+        """
+        event = await self.queue.get()
+        if event is _END_OF_STREAM:
+            # Leave it for any other reader
+            self.queue.put_nowait(event)
+            raise StopAsyncIteration
+        self.lag.record((time.perf_counter() - event.published_at) * 1000)
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> BusEvent:
+        return await self.get()
+
+    def close(self):
+        """Stop receiving events; iteration ends after those already queued"""
+        self.bus.unsubscribe(self)
+        self._end()
+
+    def stats(self) -> Dict:
+        return {
+            "types": list(self.types),
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "lag": self.lag.snapshot(),
+        }
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for one session's events.
+
+    `publish` never waits: each subscriber has its own bounded queue, and a
+    subscriber that falls behind loses events according to its drop policy
+    instead of holding up the WebSocket receive loop or other subscribers.
+    Matching subscribers are resolved once per event type and cached until
+    the subscriber set changes. Types nobody subscribes to are not cached,
+    and at most MAX_CACHED_ROUTES types are.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+        self._routes: Dict[str, List[Subscription]] = {}
+        self.published = 0
+        self.closed = False
+
+    def subscribe(
+        self,
+        types: Iterable[str] = ("*",),
+        maxsize: int = 256,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        name: Optional[str] = None,
+    ) -> Subscription:
+        """
+        Args:
+            types: Event types to receive; "prefix." matches a family and
+                "*" matches everything
+            maxsize: Events queued before the drop policy applies
+            drop_policy: Which event to lose when the queue is full
+            name: Label for stats
+
+        A subscription to a closed bus ends immediately.
+        """
+        subscription = Subscription(
+            self,
+            types,
+            maxsize,
+            drop_policy,
+            name or f"subscriber-{len(self._subscriptions) + 1}",
+        )
+        if self.closed:
+            subscription._end()
+            return subscription
+        self._subscriptions.append(subscription)
+        self._routes.clear()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            self._routes.clear()
+
+    def _route(self, event_type: str) -> List[Subscription]:
+        subscribers = self._routes.get(event_type)
+        if subscribers is None:
+            subscribers = [s for s in self._subscriptions if s.matches(event_type)]
+            if not subscribers:
+                return subscribers
+            if len(self._routes) >= MAX_CACHED_ROUTES:
+                self._routes.clear()
+            self._routes[event_type] = subscribers
+        return subscribers
+
+    def has_subscribers(self, event_type: str) -> bool:
+        return bool(self._subscriptions) and bool(self._route(event_type))
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> int:
+        """
+        Offer an event to every matching subscriber without waiting.
+        Subscribers share `data`, so they must not mutate it.
+
+        Returns:
+            int: Number of subscribers the event was offered to
+        """
+        if not self._subscriptions:
+            return 0
+        subscribers = self._route(event_type)
+        if not subscribers:
+            return 0
+        event = BusEvent(event_type, data, time.perf_counter())
+        for subscription in subscribers:
+            subscription._offer(event)
+        self.published += 1
+        return len(subscribers)
+
+    def close(self):
+        """End every subscription, e.g. when the session closes"""
+        self.closed = True
+        subscriptions, self._subscriptions = self._subscriptions, []
+        self._routes.clear()
+        for subscription in subscriptions:
+            subscription._end()
+
+    def stats(self) -> Dict:
+        """Per-subscriber queue depth, drops and lag"""
+        return {
+            "published": self.published,
+            "subscribers": {s.name: s.stats() for s in self._subscriptions},
+        }
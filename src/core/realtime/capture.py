@@ -0,0 +1,120 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ..utils.metrics import LatencyStats
+from .queues import DropPolicy, offer
+
+
+@dataclass
+class CapturedFrame:
+    """One buffer of microphone audio and when it was captured"""
+    data: bytes
+    captured_at: float  # time.perf_counter() on the capture thread
+
+
+class MicrophoneCapture:
+    """
+    Microphone capture that never blocks the event loop.
+
+    PyAudio runs the input stream in callback mode, so device reads happen
+    on PortAudio's thread. Each buffer is handed to the loop with
+    call_soon_threadsafe and placed on a bounded asyncio.Queue; when the
+    consumer falls behind, frames are dropped according to `drop_policy`
+    instead of letting latency grow.
+
+    Usage:
+        capture = MicrophoneCapture()
+        await capture.start()
+        async for frame in capture:
+            ...send frame.data...
+            capture.mark_sent(frame)
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 24000,
+        channels: int = 1,
+        frames_per_buffer: int = 2400,
+        max_queue_frames: int = 10,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        device_index: Optional[int] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+        self.drop_policy = DropPolicy(drop_policy)
+        self.device_index = device_index
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_frames)
+        self.latency = LatencyStats()
+        self.frames_captured = 0
+        self.frames_dropped = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pyaudio = None
+        self._stream = None
+
+    async def start(self):
+        """Open the input device and begin capturing"""
+        # Imported here so PortAudio is only needed once capture starts
+        import pyaudio
+
+        self._loop = asyncio.get_running_loop()
+        self._continue = pyaudio.paContinue
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._on_audio,
+        )
+        self._stream.start_stream()
+
+    async def close(self):
+        """Stop capturing and release the device"""
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PyAudio callback, runs on PortAudio's thread"""
+        frame = CapturedFrame(in_data, time.perf_counter())
+        self._loop.call_soon_threadsafe(self._enqueue, frame)
+        return (None, self._continue)
+
+    def _enqueue(self, frame: CapturedFrame):
+        self.frames_captured += 1
+        if offer(self.queue, frame, self.drop_policy):
+            self.frames_dropped += 1
+
+    async def read(self) -> CapturedFrame:
+        """Wait for the next captured frame"""
+        return await self.queue.get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> CapturedFrame:
+        return await self.queue.get()
+
+    def mark_sent(self, frame: CapturedFrame):
+        """Record capture-to-send latency once `frame` has been sent upstream"""
+        self.latency.record((time.perf_counter() - frame.captured_at) * 1000)
+
+    def stats(self) -> Dict:
+        """Capture counters and capture-to-send latency"""
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_dropped": self.frames_dropped,
+            "queue_depth": self.queue.qsize(),
+            "capture_to_send": self.latency.snapshot(),
+        }
@@ -0,0 +1,133 @@
+import json
+import os
+import re
+from typing import Any, Dict, Optional, Union
+
+Frame = Union[str, bytes]
+
+# Realtime API events put "type" first. Only a first key is trusted: a
+# "type" further in may belong to a nested object (item, part, error), so
+# anything else falls back to a full decode.
+_TYPE_PREFIX = '{"type":"'
+_TYPE_FIELD = re.compile(r'\s*\{\s*"type"\s*:\s*"([^"\\]+)"')
+_PEEK_WINDOW = 256
+
+
+class JsonCodec:
+    """
+    Encodes and decodes Realtime protocol frames. This base class uses the
+    standard library; faster backends override `loads`/`dumps`.
+
+    `dumps` always returns str, since WebSocket libraries send bytes as
+    binary frames and the Realtime API expects text frames. Invalid input
+    raises ValueError (json.JSONDecodeError for the stdlib and orjson).
+    """
+
+    name = "json"
+
+    def loads(self, data: Frame) -> Dict[str, Any]:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    def peek_type(self, data: Frame) -> Optional[str]:
+        """
+        The event's "type" without decoding the rest of the frame, or None
+        if it isn't the frame's first key.
+        """
+        if isinstance(data, bytes):
+            data = data[:_PEEK_WINDOW].decode("utf-8", "ignore")
+        if data.startswith(_TYPE_PREFIX):
+            end = data.find('"', len(_TYPE_PREFIX))
+            if end != -1:
+                event_type = data[len(_TYPE_PREFIX):end]
+                if "\\" not in event_type:
+                    return event_type
+        match = _TYPE_FIELD.match(data, 0, _PEEK_WINDOW)
+        return match.group(1) if match else None
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+
+    def loads(self, data: Frame) -> Dict[str, Any]:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj).decode()
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        class _TypeOnly(msgspec.Struct):
+            type: str = ""
+
+        self._decoder = msgspec.json.Decoder()
+        self._type_decoder = msgspec.json.Decoder(_TypeOnly)
+        self._encoder = msgspec.json.Encoder()
+        self._error = msgspec.DecodeError
+
+    def loads(self, data: Frame) -> Dict[str, Any]:
+        try:
+            return self._decoder.decode(data)
+        except self._error as e:
+            raise ValueError(f"Invalid JSON frame: {e}") from e
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+    def peek_type(self, data: Frame) -> Optional[str]:
+        event_type = super().peek_type(data)
+        if event_type is None:
+            # Validates the frame but only materializes "type"
+            try:
+                event_type = self._type_decoder.decode(data).type or None
+            except self._error:
+                return None
+        return event_type
+
+
+_BACKENDS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec,
+}
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Create a codec by name ("orjson", "msgspec" or "json"). Without a name,
+    REALTIME_JSON_CODEC is used, and otherwise the fastest installed backend.
+
+    Raises:
+        ValueError: If the named backend is unknown or not installed
+    """
+    name = name or os.getenv("REALTIME_JSON_CODEC", "auto")
+    if name != "auto":
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown JSON codec '{name}', expected one of {sorted(_BACKENDS)}")
+        try:
+            return _BACKENDS[name]()
+        except ImportError as e:
+            raise ValueError(f"JSON codec '{name}' is not installed: {e}")
+    for backend in (OrjsonCodec, MsgspecCodec):
+        try:
+            return backend()
+        except ImportError:
+            continue
+    return JsonCodec()
+
+
+# Process-wide codec used for all protocol frames
+codec = get_codec()
@@ -1,10 +1,68 @@
-from typing import Dict, Optional
-import json
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import logging
 from datetime import datetime
 from ..utils.errors import handle_realtime_error
+from .codec import codec
+from .function_calls import FunctionCall, FunctionCallAccumulator
+
+logger = logging.getLogger(__name__)
+
+# Event fields that carry base64 audio; summarized instead of logged in full
+_BULK_FIELDS = ("delta", "audio")
+
+# Event types resolved through a prefix route that are cached per class;
+# exact routes are always cached, fallbacks never
+MAX_CACHED_PREFIX_TYPES = 256
+
+
+def handles(*event_types: str):
+    """
+    Route Realtime API event types to a RealtimeEventHandler method.
+
+    A type ending in "." matches every event type with that prefix (an
+    event family such as "input_audio_buffer."); "*" matches any event no
+    other route claims. Exact routes win over prefixes, longer prefixes
+    over shorter ones.
+    """
+    def register(method):
+        method._event_types = event_types
+        return method
+    return register
+
+
+def _summarize(event: Dict) -> Dict:
+    """The event with bulk audio fields replaced by their length"""
+    return {
+        key: f"<{len(value)} chars>" if key in _BULK_FIELDS and isinstance(value, str) else value
+        for key, value in event.items()
+    }
 
 class RealtimeEventHandler:
-    """Handles all Realtime API events"""
+    """
+    Handles all Realtime API events.
+
+    Routes are compiled once per class from the @handles decorators.
+    Subclasses can add or override routes the same way. Exact routes and
+    (up to MAX_CACHED_PREFIX_TYPES) types matched by a prefix are cached,
+    so dispatch is one dict lookup. Types only the fallback handles are
+    resolved each time, so unknown types can't grow the cache.
+
+    Types and families listed in IGNORED_EVENTS route to nothing; raw frames
+    of those types passed to `handle_message` are not even decoded.
+    """
+
+    IGNORED_EVENTS: Tuple[str, ...] = (
+        "input_audio_buffer.",
+        "conversation.item.",
+        "response.content_part.",
+        "response.output_item.done",
+        "response.audio_transcript.delta",
+    )
+
+    _routes: Dict[str, Callable] = {}
+    _prefix_routes: List[Tuple[str, Callable]] = []
+    _fallback: Optional[Callable] = None
+    _resolved: Dict[str, Optional[Callable]] = {}
     
     def __init__(self, session):
         """Initialize the event handler with a session reference.
@@ -13,35 +71,82 @@ class RealtimeEventHandler:
             session: The RealtimeSession instance this handler is associated with
         """
         self.session = session
+        self.function_calls = FunctionCallAccumulator()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compile_routes()
+
+    @classmethod
+    def _compile_routes(cls):
+        """Build the dispatch tables from the @handles decorators"""
+        routes, prefixes, fallback = {}, {}, None
+        for event_type in cls.IGNORED_EVENTS:
+            if event_type.endswith("."):
+                prefixes[event_type] = None
+            else:
+                routes[event_type] = None
+        # Walk the MRO base-first so subclass methods override base routes
+        for klass in reversed(cls.__mro__):
+            for attribute in vars(klass).values():
+                for event_type in getattr(attribute, "_event_types", ()):
+                    if event_type == "*":
+                        fallback = attribute
+                    elif event_type.endswith("."):
+                        prefixes[event_type] = attribute
+                    else:
+                        routes[event_type] = attribute
+        cls._routes = routes
+        cls._prefix_routes = sorted(prefixes.items(), key=lambda route: -len(route[0]))
+        cls._fallback = fallback
+        cls._resolved = dict(routes)
+
+    @classmethod
+    def resolve(cls, event_type: str) -> Optional[Callable]:
+        """The handler function for an event type, or None for non-strings"""
+        if not isinstance(event_type, str):
+            return None
+        try:
+            return cls._resolved[event_type]
+        except KeyError:
+            pass
+        for prefix, handler in cls._prefix_routes:
+            if event_type.startswith(prefix):
+                if len(cls._resolved) < len(cls._routes) + MAX_CACHED_PREFIX_TYPES:
+                    cls._resolved[event_type] = handler
+                return handler
+        logger.debug("No route for event type %s", event_type)
+        return cls._fallback
     
+    async def handle_message(self, message: Union[str, bytes]):
+        """
+        Handle a raw text frame from the Realtime API. The event type is
+        peeked first, so events nothing acts on are dropped undecoded.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            event_type = codec.peek_type(message)
+            if event_type is not None:
+                if self.resolve(event_type) is None and not (
+                    self.session.bus.has_subscribers(event_type)
+                ):
+                    return
+        await self.handle_event(codec.loads(message))
+
     async def handle_event(self, event: Dict):
         """Handle incoming events from the Realtime API"""
-        print(f"[debug] Received event: {json.dumps(event, indent=2)}")  # Debug line
-        
         event_type = event.get("type", "")
-        
-        handlers = {
-            "session.created": self._handle_session_created,
-            "error": self._handle_error,
-            "text.delta": self._handle_text_delta,
-            "text.done": self._handle_text_done,
-            "audio.delta": self._handle_audio_delta,
-            "audio.done": self._handle_audio_done,
-            "audio_transcript.delta": self._handle_audio_transcript_delta,
-            "audio_transcript.done": self._handle_audio_transcript_done,
-            "function_call.delta": self._handle_function_call_delta,
-            "function_call.done": self._handle_function_call_done,
-            "speech.started": self._handle_speech_started,
-            "speech.stopped": self._handle_speech_stopped
-        }
-        
-        handler = handlers.get(event_type)
-        if handler:
-            await handler(event)
-        else:
-            print(f"[warning] Unhandled event type: {event_type}")
-            print(f"[debug] Event data: {json.dumps(event, indent=2)}")
+        if not isinstance(event_type, str):
+            logger.warning("Ignoring event with a non-string type: %r", event_type)
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event %s: %s", event_type, _summarize(event))
+
+        self.session.bus.publish(event_type, event)
+        handler = self._resolved.get(event_type) or self.resolve(event_type)
+        if handler is not None:
+            await handler(self, event)
 
+    @handles("session.created")
     async def _handle_session_created(self, event: Dict):
         """
         Handle session.created event. This might update session state 
@@ -50,92 +155,198 @@ class RealtimeEventHandler:
         # Example:
         self.session.state.active = True
 
+    @handles("session.updated")
     async def _handle_session_updated(self, event: Dict):
         """Handle session.updated event properly"""
-        print("[debug] Session updated successfully")
+        logger.debug("Session updated")
         # Update any local state if needed
         pass
 
+    @handles("conversation.created")
     async def _handle_conversation_created(self, event: Dict):
         """Handle conversation.created event."""
         pass
 
+    @handles("conversation.item.created")
     async def _handle_item_created(self, event: Dict):
         """Handle conversation.item.created event."""
         pass
 
+    @handles("response.created")
     async def _handle_response_created(self, event: Dict):
         """Handle response.created event."""
-        pass
+        self.session.audio_output.on_response_created(event)
 
+    @handles("response.done")
     async def _handle_response_done(self, event: Dict):
-        """Handle response.done event."""
-        pass
+        """
+        Handle response.done event. A response that called functions gets
+        one follow-up response.create, now that it is no longer active,
+        so the model can act on all of their outputs. A cancelled response
+        gets none: the user is talking, and their turn starts the next one.
+        """
+        self.session.audio_output.on_response_done(event)
+        response = event.get("response", {})
+        finished = self.function_calls.end_response(response)
+        if finished and response.get("status") != "cancelled":
+            await self.session.send_event({"type": "response.create"})
+            self.session.audio_output.mark_response_requested()
 
+    @handles("text.delta")
     async def _handle_text_delta(self, event: Dict):
         """Handle text.delta event"""
         if "content" in event:
             print(event["content"], end="", flush=True)
 
+    @handles("text.done")
     async def _handle_text_done(self, event: Dict):
         """Handle text.done event"""
         print("")  # New line after text completion
 
+    @handles("response.audio.delta")
     async def _handle_audio_delta(self, event: Dict):
-        """Handle audio.delta event"""
-        pass
+        """Handle response.audio.delta: stream the audio to the output sinks"""
+        await self.session.audio_output.on_audio_delta(event)
 
+    @handles("response.audio.done")
     async def _handle_audio_done(self, event: Dict):
-        """Handle audio.done event"""
-        pass
+        """Handle response.audio.done event"""
+        self.session.audio_output.on_audio_done(event)
 
+    @handles("audio_transcript.delta")
     async def _handle_audio_transcript_delta(self, event: Dict):
         """Handle audio_transcript.delta event"""
         if "content" in event:
             print(f"Transcript: {event['content']}")
 
+    @handles("audio_transcript.done")
     async def _handle_audio_transcript_done(self, event: Dict):
         """Handle audio_transcript.done event"""
         pass
 
+    @handles("response.audio_transcript.done", "response.text.done")
+    async def _handle_assistant_turn(self, event: Dict):
+        """Keep what the assistant said for resuming after a reconnect"""
+        self.session.transcript.add("assistant", event.get("transcript") or event.get("text"))
+
+    @handles("conversation.item.input_audio_transcription.completed")
+    async def _handle_user_turn(self, event: Dict):
+        """Keep what the user said for resuming after a reconnect"""
+        self.session.transcript.add("user", event.get("transcript"))
+
+    @handles("response.output_item.added")
+    async def _handle_output_item_added(self, event: Dict):
+        """Handle response.output_item.added: learn function call names"""
+        self.function_calls.on_item_added(event.get("item", {}), event.get("response_id"))
+
+    @handles("response.function_call_arguments.delta")
     async def _handle_function_call_delta(self, event: Dict):
-        """Handle function call arguments delta event"""
-        if "content" in event:
-            # Parse function call data
-            try:
-                data = json.loads(event["content"])
-                if data.get("action") == "observe":
-                    for observation in data.get("observations", []):
-                        self.session.observation_tracker.add_observation(
-                            self.session.phase_manager.current_phase,
-                            observation
-                        )
-                elif data.get("action") == "transition":
-                    new_phase = data.get("transition_to")
-                    if new_phase:
-                        await self.session.phase_manager.transition_phase(new_phase)
-            except json.JSONDecodeError:
-                pass
+        """
+        Handle a function call arguments fragment. Arguments are parsed
+        incrementally, so tool effects start as soon as the fields they need
+        are complete rather than when the whole call has streamed.
+        """
+        call, completed = self.function_calls.feed(event)
+        if completed:
+            await self._apply_tool_fields(call)
 
+    @handles("response.function_call_arguments.done")
     async def _handle_function_call_done(self, event: Dict):
-        """Handle function call completion"""
-        # Check if phase completion criteria are met
-        current_phase = self.session.phase_manager.current_phase
-        phase_config = self.session.config.phases[current_phase]
-        
-        # Update success criteria
-        if "success_criteria_met" in event:
-            for criterion in event["success_criteria_met"]:
-                self.session.observation_tracker.criteria_met(current_phase, criterion)
+        """
+        Finish a function call and return its output to the model. The
+        response is still active here, so the follow-up response waits
+        for response.done.
+        """
+        call, _ = self.function_calls.finish(event)
+        if call.name not in (None, "conversation_tool"):
+            result = {"status": "error", "error": f"Unknown function {call.name}"}
+        elif call.error:
+            result = {"status": "error", "error": call.error}
+        else:
+            await self._apply_tool_fields(call)
+            if call.arguments.get("action") == "complete":
+                await self.session.conversation_tool(call.arguments)
+            result = {"status": "success", **call.result}
 
+        await self.session.send_event({
+            "type": "conversation.item.create",
+            "item": {
+                "type": "function_call_output",
+                "call_id": call.call_id,
+                "output": codec.dumps(result)
+            }
+        })
+        self.session.bus.publish("tool.called", {
+            "name": call.name,
+            "call_id": call.call_id,
+            "arguments": call.arguments,
+            "result": result
+        })
+
+    async def _apply_tool_fields(self, call: FunctionCall):
+        """
+        Run each conversation_tool effect once its fields are known:
+        observations are recorded and phase transitions start while the
+        rest of the arguments may still be streaming.
+        """
+        if call.name not in (None, "conversation_tool"):
+            return
+        arguments = call.arguments
+        action = arguments.get("action")
+        effects = {"observe": "observations", "transition": "transition_to"}
+        key = effects.get(action)
+        if key is None or key not in arguments or key in call.applied:
+            return
+        call.applied.add(key)
+        result = await self.session.conversation_tool({"action": action, key: arguments[key]})
+        result.pop("status", None)
+        call.result.update(result)
+
+    @handles("input_audio_buffer.speech_started")
     async def _handle_speech_started(self, event: Dict):
-        """Handle input_audio_buffer.speech_started event."""
-        pass
+        """
+        Handle input_audio_buffer.speech_started event: barge-in. Local
+        playback is cut off and the interrupted item is truncated upstream
+        to what the user actually heard, so the model's context matches.
+        """
+        item = self.session.audio_output.interrupt()
+        if item is None:
+            return
+        await self.session.send_event({
+            "type": "conversation.item.truncate",
+            "item_id": item.item_id,
+            "content_index": item.content_index,
+            "audio_end_ms": item.played_ms()
+        })
+        self.session.bus.publish("playback.interrupted", {
+            "item_id": item.item_id,
+            "audio_end_ms": item.played_ms()
+        })
+        print(f"[info] Interrupted {item.item_id} after {item.played_ms()} ms")
 
+    @handles("input_audio_buffer.speech_stopped")
     async def _handle_speech_stopped(self, event: Dict):
         """Handle input_audio_buffer.speech_stopped event."""
-        pass
+        # Server VAD ends the user's turn here; the reply is timed from now
+        self.session.audio_output.mark_response_requested()
+
+    @handles("rate_limits.updated")
+    async def _handle_rate_limits(self, event: Dict):
+        """Keep the process's admission scheduler in step with the API's limits"""
+        self.session.admission.on_rate_limits(event.get("rate_limits", []))
 
+    @handles("error")
     async def _handle_error(self, event: Dict):
         """Handle error events from the API"""
-        print(f"[error] API Error: {json.dumps(event, indent=2)}") 
\ No newline at end of file
+        error = event.get("error", event)
+        logger.error("API Error: %s", error)
+        if isinstance(error, dict):
+            self.session.admission.on_error(error)
+
+    @handles("*")
+    async def _handle_unrouted(self, event: Dict):
+        """Any event type without a route"""
+        logger.debug("Unhandled event type: %s", event.get("type"))
+
+
+RealtimeEventHandler._compile_routes()
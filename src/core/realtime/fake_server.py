@@ -0,0 +1,572 @@
+"""
+Local stand-in for the OpenAI Realtime API, for load tests, benchmarks and
+offline development. It serves POST /v1/realtime/sessions and the
+/v1/realtime WebSocket and speaks enough of the protocol for
+RealtimeSession: session.created, energy-based server VAD turn events, input
+transcription, streamed audio and transcript deltas, and function calls to
+conversation_tool, with configurable latency and throughput.
+
+Point sessions at it with REALTIME_API_BASE=http://127.0.0.1:8765/v1 (or
+RealtimeSession(..., api_base=...)) and run it with:
+    python -m src.core.realtime.fake_server --port 8765 --first-audio-ms 300
+"""
+
+import argparse
+import asyncio
+import binascii
+import json
+import math
+import struct
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from aiohttp import WSMsgType, web
+
+from .admission import RATE_LIMIT_WINDOW_SECONDS, TokenBucket
+from .vad import VoiceActivityDetector
+
+# 24kHz PCM16 mono
+_BYTES_PER_MS = 48
+
+
+@dataclass
+class FakeRealtimeSettings:
+    """
+    Latency and throughput of the fake API.
+
+    Attributes:
+        session_latency_ms: Delay before POST /realtime/sessions answers
+        first_audio_ms: Delay from the end of a user turn (or
+            response.create) to the first audio delta
+        response_audio_ms: Audio in each spoken response
+        audio_chunk_ms: Audio per response.audio.delta
+        realtime_factor: How much faster than real time audio is streamed
+        turn_ms: Appended audio that makes one user turn; the fake server
+            VAD ends a turn after this much audio since speech started,
+            after `silence_ms` of silence, or on a client commit
+        silence_ms: Silence after speech that ends a turn, like server
+            VAD's silence_duration_ms
+        function_call_every: Every Nth response is a conversation_tool call
+            instead of speech (0 disables function calls)
+        token_ttl_seconds: Lifetime of the issued ephemeral tokens
+        sessions_per_minute: Session creation limit; beyond it
+            POST /realtime/sessions answers 429 (0 disables the limit)
+        requests_per_minute: Response limit reported in
+            rate_limits.updated (not enforced)
+    """
+    session_latency_ms: float = 50.0
+    first_audio_ms: float = 300.0
+    response_audio_ms: float = 2000.0
+    audio_chunk_ms: int = 100
+    realtime_factor: float = 4.0
+    turn_ms: float = 1500.0
+    silence_ms: float = 500.0
+    function_call_every: int = 0
+    token_ttl_seconds: float = 60.0
+    sessions_per_minute: float = 0.0
+    requests_per_minute: float = 1000.0
+    transcript: str = (
+        "Thanks, that is helpful. Could you tell me a little more about that?"
+    )
+    user_transcript: str = "This is what the user said."
+
+
+def _id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:16]}"
+
+
+def _tone(milliseconds: int, frequency: float = 220.0) -> bytes:
+    """A quiet sine tone, so response audio isn't digital silence"""
+    samples = milliseconds * 24
+    return struct.pack(
+        f"<{samples}h",
+        *(int(3000 * math.sin(2 * math.pi * frequency * i / 24000)) for i in range(samples)),
+    )
+
+
+@dataclass
+class _Connection:
+    """State of one WebSocket connection to a fake session"""
+    session: Dict
+    ws: web.WebSocketResponse
+    vad: VoiceActivityDetector = field(default_factory=VoiceActivityDetector)
+    turn_bytes: int = 0
+    silence_bytes: int = 0  # Trailing silence in the current turn
+    in_speech: bool = False
+    responses: int = 0
+    response_task: Optional[asyncio.Task] = None
+    items: List[str] = field(default_factory=list)
+
+
+class FakeRealtimeServer:
+    """
+    aiohttp application implementing the fake API.
+
+    Usage:
+        server = FakeRealtimeServer(FakeRealtimeSettings(first_audio_ms=200))
+        api_base = await server.start()
+        session = RealtimeSession(config, api_base=api_base)
+        ...
+        await server.stop()
+    """
+
+    def __init__(self, settings: Optional[FakeRealtimeSettings] = None):
+        self.settings = settings or FakeRealtimeSettings()
+        self.sessions: Dict[str, Dict] = {}  # By ephemeral token
+        self.app = web.Application()
+        self.app.router.add_post("/v1/realtime/sessions", self._create_session)
+        self.app.router.add_get("/v1/realtime", self._realtime)
+        self._runner: Optional[web.AppRunner] = None
+        self._delta_audio = binascii.b2a_base64(
+            _tone(self.settings.audio_chunk_ms), newline=False
+        ).decode("ascii")
+
+        self._session_limit = self._bucket(self.settings.sessions_per_minute)
+        self._request_limit = self._bucket(self.settings.requests_per_minute)
+
+        self.sessions_created = 0
+        self.sessions_throttled = 0
+        self.connections = 0
+        self.active_connections = 0
+        self.events_received = 0
+        self.events_sent = 0
+
+    @staticmethod
+    def _bucket(per_minute: float) -> Optional[TokenBucket]:
+        return TokenBucket(per_minute / RATE_LIMIT_WINDOW_SECONDS) if per_minute else None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Serve on `host`:`port` (0 picks a free port).
+
+        Returns:
+            str: The API base URL to give RealtimeSession
+        """
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/v1"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> Dict:
+        return {
+            "sessions_created": self.sessions_created,
+            "sessions_throttled": self.sessions_throttled,
+            "connections": self.connections,
+            "active_connections": self.active_connections,
+            "events_received": self.events_received,
+            "events_sent": self.events_sent,
+        }
+
+    async def _create_session(self, request: web.Request) -> web.Response:
+        # Any key is accepted, so offline runs don't need OPENAI_API_KEY
+        if not request.headers.get("Authorization", "").startswith("Bearer"):
+            return web.json_response(
+                {"error": {"message": "Missing bearer token"}}, status=401
+            )
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"error": {"message": "Invalid JSON"}}, status=400)
+        limit = self._session_limit
+        if limit is not None and not limit.try_acquire():
+            self.sessions_throttled += 1
+            return web.json_response(
+                {"error": {"type": "rate_limit_exceeded", "message": "Too many sessions"}},
+                status=429,
+                headers={
+                    **self._rate_limit_headers(limit),
+                    "retry-after-ms": str(int((1 - limit.tokens) / limit.rate * 1000) + 1),
+                },
+            )
+        await asyncio.sleep(self.settings.session_latency_ms / 1000)
+
+        token = f"ek_{uuid.uuid4().hex}"
+        session = {
+            "id": _id("sess"),
+            "object": "realtime.session",
+            "model": body.get("model"),
+            "modalities": body.get("modalities", ["audio", "text"]),
+            "voice": body.get("voice", "alloy"),
+            "instructions": body.get("instructions", ""),
+            "tools": body.get("tools", []),
+            "input_audio_format": body.get("input_audio_format", "pcm16"),
+            "output_audio_format": body.get("output_audio_format", "pcm16"),
+            "input_audio_transcription": body.get("input_audio_transcription"),
+            "turn_detection": {"type": "server_vad"},
+        }
+        expires_at = int(time.time() + self.settings.token_ttl_seconds)
+        self.sessions[token] = session
+        self.sessions_created += 1
+        return web.json_response(
+            {**session, "client_secret": {"value": token, "expires_at": expires_at}},
+            headers=self._rate_limit_headers(limit) if limit is not None else None,
+        )
+
+    def _rate_limit_headers(self, limit: TokenBucket) -> Dict[str, str]:
+        per_minute = limit.rate * RATE_LIMIT_WINDOW_SECONDS
+        remaining = int(max(0.0, limit.tokens))
+        return {
+            "x-ratelimit-limit-requests": str(int(per_minute)),
+            "x-ratelimit-remaining-requests": str(remaining),
+            "x-ratelimit-reset-requests": f"{(per_minute - remaining) / limit.rate:.3f}s",
+        }
+
+    async def _realtime(self, request: web.Request) -> web.WebSocketResponse:
+        token = request.headers.get("Authorization", "")[len("Bearer "):]
+        session = self.sessions.pop(token, None)
+        if session is None:
+            raise web.HTTPUnauthorized(text="Unknown or already used ephemeral token")
+
+        ws = web.WebSocketResponse(heartbeat=None)
+        await ws.prepare(request)
+        self.connections += 1
+        self.active_connections += 1
+        connection = _Connection(session=session, ws=ws)
+        try:
+            await self._send(connection, "session.created", session=session)
+            await self._send(
+                connection,
+                "conversation.created",
+                conversation={"id": _id("conv"), "object": "realtime.conversation"},
+            )
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                self.events_received += 1
+                try:
+                    event = json.loads(message.data)
+                except ValueError:
+                    await self._error(connection, "Invalid JSON")
+                    continue
+                await self._handle(connection, event)
+        finally:
+            self.active_connections -= 1
+            if connection.response_task is not None:
+                connection.response_task.cancel()
+        return ws
+
+    async def _send(self, connection: _Connection, event_type: str, **fields):
+        if not connection.ws.closed:
+            event = {"type": event_type, "event_id": _id("event"), **fields}
+            await connection.ws.send_str(json.dumps(event))
+            self.events_sent += 1
+
+    async def _error(self, connection: _Connection, message: str, code: Optional[str] = None):
+        error = {"type": "invalid_request_error", "message": message}
+        if code is not None:
+            error["code"] = code
+        await self._send(connection, "error", error=error)
+
+    async def _handle(self, connection: _Connection, event: Dict):
+        event_type = event.get("type")
+        if event_type == "input_audio_buffer.append":
+            await self._append_audio(connection, event.get("audio", ""))
+        elif event_type == "input_audio_buffer.commit":
+            await self._end_turn(connection)
+        elif event_type == "input_audio_buffer.clear":
+            connection.turn_bytes = 0
+            connection.silence_bytes = 0
+            connection.in_speech = False
+            await self._send(connection, "input_audio_buffer.cleared")
+        elif event_type == "session.update":
+            connection.session.update(event.get("session", {}))
+            await self._send(connection, "session.updated", session=connection.session)
+        elif event_type == "conversation.item.create":
+            item = {"id": _id("item"), "status": "completed", **event.get("item", {})}
+            previous = connection.items[-1] if connection.items else None
+            connection.items.append(item["id"])
+            await self._send(
+                connection, "conversation.item.created", previous_item_id=previous, item=item
+            )
+        elif event_type == "conversation.item.truncate":
+            self._cancel_response(connection)
+            await self._send(
+                connection,
+                "conversation.item.truncated",
+                item_id=event.get("item_id"),
+                content_index=event.get("content_index", 0),
+                audio_end_ms=event.get("audio_end_ms", 0),
+            )
+        elif event_type == "response.create":
+            if self._responding(connection):
+                # As the API does, rather than replacing the active response
+                await self._error(
+                    connection,
+                    "Conversation already has an active response",
+                    code="conversation_already_has_active_response",
+                )
+            else:
+                self._start_response(connection)
+        elif event_type == "response.cancel":
+            self._cancel_response(connection)
+        else:
+            await self._error(connection, f"Unknown event type {event_type!r}")
+
+    async def _append_audio(self, connection: _Connection, audio: str):
+        try:
+            pcm = binascii.a2b_base64(audio)
+        except binascii.Error:
+            await self._error(connection, "Invalid base64 audio")
+            return
+        size = len(pcm)
+        speech = connection.vad.is_speech(np.frombuffer(pcm[: size & ~1], dtype=np.int16))
+        if not connection.in_speech:
+            if not speech:
+                # Silence between turns isn't part of any turn
+                return
+            connection.in_speech = True
+            # A user starting to talk interrupts the assistant, as with server VAD
+            self._cancel_response(connection)
+            await self._send(
+                connection,
+                "input_audio_buffer.speech_started",
+                audio_start_ms=0,
+                item_id=_id("item"),
+            )
+        connection.turn_bytes += size
+        connection.silence_bytes = 0 if speech else connection.silence_bytes + size
+        if (
+            connection.turn_bytes >= self.settings.turn_ms * _BYTES_PER_MS
+            or connection.silence_bytes >= self.settings.silence_ms * _BYTES_PER_MS
+        ):
+            await self._end_turn(connection)
+
+    async def _end_turn(self, connection: _Connection):
+        if not connection.turn_bytes:
+            return
+        item_id = _id("item")
+        audio_end_ms = connection.turn_bytes // _BYTES_PER_MS
+        connection.turn_bytes = 0
+        connection.silence_bytes = 0
+        connection.in_speech = False
+        connection.items.append(item_id)
+        await self._send(
+            connection,
+            "input_audio_buffer.speech_stopped",
+            audio_end_ms=audio_end_ms,
+            item_id=item_id,
+        )
+        await self._send(connection, "input_audio_buffer.committed", item_id=item_id)
+        await self._send(
+            connection,
+            "conversation.item.created",
+            item={"id": item_id, "type": "message", "role": "user", "status": "completed"},
+        )
+        if connection.session.get("input_audio_transcription"):
+            await self._send(
+                connection,
+                "conversation.item.input_audio_transcription.completed",
+                item_id=item_id,
+                content_index=0,
+                transcript=self.settings.user_transcript,
+            )
+        self._start_response(connection)
+
+    def _start_response(self, connection: _Connection):
+        self._cancel_response(connection)
+        connection.response_task = asyncio.create_task(self._respond(connection))
+
+    @staticmethod
+    def _responding(connection: _Connection) -> bool:
+        return connection.response_task is not None and not connection.response_task.done()
+
+    def _cancel_response(self, connection: _Connection):
+        if self._responding(connection):
+            connection.response_task.cancel()
+        connection.response_task = None
+
+    async def _respond(self, connection: _Connection):
+        settings = self.settings
+        connection.responses += 1
+        response = {
+            "id": _id("resp"),
+            "object": "realtime.response",
+            "status": "in_progress",
+            "output": [],
+        }
+        await self._send(connection, "response.created", response=response)
+
+        status = "completed"
+        try:
+            await asyncio.sleep(settings.first_audio_ms / 1000)
+            every = settings.function_call_every
+            if every and connection.responses % every == 0:
+                item = await self._function_call(connection, response["id"])
+            else:
+                item = await self._speak(connection, response["id"])
+            response["output"].append(item)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            # No longer active once response.done is sent
+            if connection.response_task is asyncio.current_task():
+                connection.response_task = None
+            response["status"] = status
+            response["usage"] = {"total_tokens": 0, "input_tokens": 0, "output_tokens": 0}
+            # Shielded so a cancelled response still reports response.done
+            await asyncio.shield(self._finish_response(connection, response))
+
+    async def _finish_response(self, connection: _Connection, response: Dict):
+        await self._send(connection, "response.done", response=response)
+        limit = self._request_limit
+        if limit is None:
+            return
+        # Counted across all connections, as the API counts per organization
+        limit.try_acquire()
+        limit_per_minute = int(limit.rate * RATE_LIMIT_WINDOW_SECONDS)
+        remaining = int(max(0.0, limit.tokens))
+        await self._send(
+            connection,
+            "rate_limits.updated",
+            rate_limits=[{
+                "name": "requests",
+                "limit": limit_per_minute,
+                "remaining": remaining,
+                "reset_seconds": round((limit_per_minute - remaining) / limit.rate, 3),
+            }],
+        )
+
+    async def _speak(self, connection: _Connection, response_id: str) -> Dict:
+        settings = self.settings
+        item = {
+            "id": _id("item"),
+            "object": "realtime.item",
+            "type": "message",
+            "role": "assistant",
+            "content": [],
+        }
+        ids = {"response_id": response_id, "output_index": 0}
+        part_ids = {**ids, "item_id": item["id"], "content_index": 0}
+        await self._send(connection, "response.output_item.added", **ids, item=item)
+        await self._send(
+            connection,
+            "response.content_part.added",
+            **part_ids,
+            part={"type": "audio", "transcript": ""},
+        )
+
+        words = settings.transcript.split()
+        chunks = max(1, int(settings.response_audio_ms // settings.audio_chunk_ms))
+        interval = settings.audio_chunk_ms / 1000 / settings.realtime_factor
+        next_send = time.perf_counter()
+        for index in range(chunks):
+            await self._send(
+                connection, "response.audio.delta", **part_ids, delta=self._delta_audio
+            )
+            # Spread the transcript over the audio
+            first, last = index * len(words) // chunks, (index + 1) * len(words) // chunks
+            for word in words[first:last]:
+                await self._send(
+                    connection, "response.audio_transcript.delta", **part_ids, delta=word + " "
+                )
+            next_send += interval
+            await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+
+        part = {"type": "audio", "transcript": settings.transcript}
+        await self._send(connection, "response.audio.done", **part_ids)
+        await self._send(
+            connection,
+            "response.audio_transcript.done",
+            **part_ids,
+            transcript=settings.transcript,
+        )
+        await self._send(connection, "response.content_part.done", **part_ids, part=part)
+        item.update(status="completed", content=[part])
+        await self._send(connection, "response.output_item.done", **ids, item=item)
+        return item
+
+    async def _function_call(self, connection: _Connection, response_id: str) -> Dict:
+        item = {
+            "id": _id("item"),
+            "object": "realtime.item",
+            "type": "function_call",
+            "status": "in_progress",
+            "name": "conversation_tool",
+            "call_id": _id("call"),
+            "arguments": "",
+        }
+        ids = {"response_id": response_id, "output_index": 0}
+        call_ids = {**ids, "item_id": item["id"], "call_id": item["call_id"]}
+        await self._send(connection, "response.output_item.added", **ids, item=item)
+
+        arguments = json.dumps({
+            "action": "observe",
+            "observations": [f"Observation {connection.responses} from the fake server"],
+        })
+        for start in range(0, len(arguments), 8):
+            await self._send(
+                connection,
+                "response.function_call_arguments.delta",
+                **call_ids,
+                delta=arguments[start:start + 8],
+            )
+            await asyncio.sleep(0)
+        await self._send(
+            connection,
+            "response.function_call_arguments.done",
+            **call_ids,
+            name="conversation_tool",
+            arguments=arguments,
+        )
+        item.update(status="completed", arguments=arguments)
+        await self._send(connection, "response.output_item.done", **ids, item=item)
+        return item
+
+
+async def _serve(args):
+    settings = FakeRealtimeSettings(
+        session_latency_ms=args.session_latency_ms,
+        first_audio_ms=args.first_audio_ms,
+        response_audio_ms=args.response_audio_ms,
+        audio_chunk_ms=args.audio_chunk_ms,
+        realtime_factor=args.realtime_factor,
+        turn_ms=args.turn_ms,
+        silence_ms=args.silence_ms,
+        function_call_every=args.function_call_every,
+        sessions_per_minute=args.sessions_per_minute,
+        requests_per_minute=args.requests_per_minute,
+    )
+    server = FakeRealtimeServer(settings)
+    api_base = await server.start(args.host, args.port)
+    print(f"[info] Fake Realtime API at {api_base}; set REALTIME_API_BASE={api_base}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    defaults = FakeRealtimeSettings()
+    parser = argparse.ArgumentParser(description="Local fake OpenAI Realtime API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--session-latency-ms", type=float, default=defaults.session_latency_ms)
+    parser.add_argument("--first-audio-ms", type=float, default=defaults.first_audio_ms)
+    parser.add_argument("--response-audio-ms", type=float, default=defaults.response_audio_ms)
+    parser.add_argument("--audio-chunk-ms", type=int, default=defaults.audio_chunk_ms)
+    parser.add_argument("--realtime-factor", type=float, default=defaults.realtime_factor)
+    parser.add_argument("--turn-ms", type=float, default=defaults.turn_ms)
+    parser.add_argument("--silence-ms", type=float, default=defaults.silence_ms)
+    parser.add_argument("--function-call-every", type=int, default=defaults.function_call_every)
+    parser.add_argument("--sessions-per-minute", type=float, default=defaults.sessions_per_minute)
+    parser.add_argument("--requests-per-minute", type=float, default=defaults.requests_per_minute)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Dict
+
+from ..utils.errors import AudioError
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """
+    Wire format of client audio, declared once per connection.
+
+    `encoding` names the sample type: "pcm16" (little-endian int16),
+    "float32" (little-endian IEEE float in [-1, 1]), or "g711_ulaw" /
+    "g711_alaw" (one byte per sample, mono, usually 8kHz telephony audio).
+    Multi-channel audio is interleaved.
+    """
+    encoding: str = "pcm16"
+    channels: int = 1
+    sample_rate: int = 24000
+
+    # numpy dtype on the wire, bytes per sample, and the factor that maps a
+    # sample to [-1, 1] (for G.711, it applies to the decoded int16 sample)
+    ENCODINGS = {
+        "pcm16": ("<i2", 2, 1.0 / 32768.0),
+        "float32": ("<f4", 4, 1.0),
+        "g711_ulaw": ("u1", 1, 1.0 / 32768.0),
+        "g711_alaw": ("u1", 1, 1.0 / 32768.0),
+    }
+
+    def __post_init__(self):
+        if self.encoding not in self.ENCODINGS:
+            raise AudioError(
+                f"Unsupported audio encoding: {self.encoding}",
+                {"supported": list(self.ENCODINGS)}
+            )
+        if self.channels < 1 or self.sample_rate < 1:
+            raise AudioError(
+                "Channels and sample rate must be positive",
+                {"channels": self.channels, "sample_rate": self.sample_rate}
+            )
+        if self.is_g711 and self.channels != 1:
+            raise AudioError("G.711 audio must be mono", {"channels": self.channels})
+
+    @classmethod
+    def from_message(cls, data: Dict) -> "AudioFormat":
+        """Build a format from an `audio.format` handshake message"""
+        try:
+            return cls(
+                encoding=data.get("encoding", "pcm16"),
+                channels=int(data.get("channels", 1)),
+                sample_rate=int(data.get("sample_rate", 24000)),
+            )
+        except (TypeError, ValueError) as e:
+            raise AudioError("Invalid audio format message", {"details": str(e)})
+
+    @property
+    def is_g711(self) -> bool:
+        return self.encoding.startswith("g711_")
+
+    @property
+    def dtype(self):
+        """numpy dtype of one sample on the wire"""
+        import numpy as np
+
+        return np.dtype(self.ENCODINGS[self.encoding][0])
+
+    @property
+    def scale(self) -> float:
+        return self.ENCODINGS[self.encoding][2]
+
+    @property
+    def frame_bytes(self) -> int:
+        """Bytes per interleaved frame (one sample for every channel)"""
+        return self.ENCODINGS[self.encoding][1] * self.channels
+
+    def to_dict(self) -> Dict:
+        return {
+            "encoding": self.encoding,
+            "channels": self.channels,
+            "sample_rate": self.sample_rate,
+        }
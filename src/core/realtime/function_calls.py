@@ -0,0 +1,210 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Characters that end a run of plain string content
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class StreamingJsonObject:
+    """
+    Incremental parser for a JSON object that arrives in fragments.
+
+    `feed()` scans each new fragment once, tracking nesting and string
+    state, and returns the top-level fields whose values completed in it.
+    String, object and array values are reported as soon as they close;
+    numbers and literals when the following delimiter arrives. Each value
+    is decoded once, so parsing is O(total length) however the object is
+    split.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self.error: Optional[str] = None
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._in_value = False  # Past the ":" of a top-level member
+        self._member: List[str] = []  # Text of the current top-level member
+
+    def feed(self, fragment: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next fragment.
+
+        Returns:
+            List[Tuple[str, Any]]: (key, value) for each top-level field
+            completed by this fragment, in order
+        """
+        completed: List[Tuple[str, Any]] = []
+        member = self._member
+        i, length = 0, len(fragment)
+        while i < length and not self.complete:
+            if self._in_string:
+                if self._escape:
+                    member.append(fragment[i])
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_SPECIAL.search(fragment, i)
+                end = match.start() if match else length
+                member.append(fragment[i:end])
+                if end == length:
+                    break
+                member.append(fragment[end])
+                if fragment[end] == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    if self._depth == 1 and self._in_value:
+                        self._close_member(completed)
+                i = end + 1
+                continue
+
+            char = fragment[i]
+            i += 1
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+            if char == '"':
+                self._in_string = True
+            elif self._depth == 1 and char == ":":
+                self._in_value = True
+            elif self._depth == 1 and char in ",}":
+                if self._in_value:
+                    self._close_member(completed)
+                member.clear()
+                self._in_value = False
+                if char == "}":
+                    self._depth = 0
+                    self.complete = True
+                continue
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                member.append(char)
+                if self._depth == 1 and self._in_value:
+                    self._close_member(completed)
+                continue
+            member.append(char)
+        return completed
+
+    def _close_member(self, completed: List[Tuple[str, Any]]):
+        """Decode the finished `"key": value` member and record it"""
+        text = "".join(self._member).strip()
+        self._member.clear()
+        self._in_value = False
+        if not text:
+            return
+        try:
+            ((key, value),) = json.loads("{" + text + "}").items()
+        except (ValueError, TypeError) as e:
+            self.error = f"Invalid member {text[:80]!r}: {e}"
+            return
+        self.fields[key] = value
+        completed.append((key, value))
+
+
+@dataclass
+class FunctionCall:
+    """One function call being streamed by the model"""
+    call_id: str
+    name: Optional[str] = None
+    item_id: Optional[str] = None
+    response_id: Optional[str] = None
+    parser: StreamingJsonObject = field(default_factory=StreamingJsonObject)
+    applied: Set[str] = field(default_factory=set)  # Effects already acted on
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None  # Why the final arguments were unusable
+
+    @property
+    def arguments(self) -> Dict[str, Any]:
+        return self.parser.fields
+
+
+class FunctionCallAccumulator:
+    """
+    Tracks in-flight function calls by call_id across
+    response.function_call_arguments.delta events, and how many calls
+    each response finished until that response is done.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, FunctionCall] = {}
+        self._finished: Dict[Optional[str], int] = {}  # By response_id
+
+    def on_item_added(self, item: Dict, response_id: Optional[str] = None):
+        """Learn a call's name from its response.output_item.added item"""
+        if item.get("type") == "function_call" and item.get("call_id"):
+            call = self._call(item["call_id"])
+            call.name = item.get("name")
+            call.item_id = item.get("id")
+            call.response_id = response_id
+
+    def feed(self, event: Dict) -> Tuple[FunctionCall, List[Tuple[str, Any]]]:
+        """Add an arguments delta; returns the call and fields it completed"""
+        call = self._call(event.get("call_id", ""))
+        call.item_id = call.item_id or event.get("item_id")
+        call.response_id = call.response_id or event.get("response_id")
+        return call, call.parser.feed(event.get("delta", ""))
+
+    def finish(self, event: Dict) -> Tuple[FunctionCall, List[Tuple[str, Any]]]:
+        """
+        Close a call on response.function_call_arguments.done. The final
+        arguments string is authoritative: fields the deltas missed are
+        filled in from it and returned. If it is not a JSON object the
+        call's `error` is set.
+        """
+        call = self.calls.pop(event.get("call_id", ""), None) or FunctionCall(
+            call_id=event.get("call_id", "")
+        )
+        call.name = call.name or event.get("name")
+        call.response_id = call.response_id or event.get("response_id")
+        self._finished[call.response_id] = self._finished.get(call.response_id, 0) + 1
+        missing: List[Tuple[str, Any]] = []
+        if not call.parser.complete or call.parser.error:
+            try:
+                final = json.loads(event.get("arguments") or "{}")
+            except ValueError as e:
+                final = {}
+                call.error = f"Invalid arguments: {e}"
+            if not isinstance(final, dict):
+                call.error = f"Arguments must be a JSON object, not {type(final).__name__}"
+                final = {}
+            for key, value in final.items():
+                if call.arguments.get(key) != value:
+                    call.arguments[key] = value
+                    missing.append((key, value))
+        return call, missing
+
+    def end_response(self, response: Dict) -> int:
+        """
+        Forget a response on response.done. Its calls that never finished,
+        because it was cancelled or cut short, are dropped.
+
+        Returns:
+            int: How many of the response's calls finished
+        """
+        response_id = response.get("id")
+        for call_id, call in list(self.calls.items()):
+            if call.response_id in (response_id, None):
+                del self.calls[call_id]
+        finished = self._finished.pop(response_id, 0)
+        if response_id is not None:
+            finished += self._finished.pop(None, 0)
+        return finished
+
+    def clear(self):
+        """Drop every call, e.g. when the upstream session is lost"""
+        self.calls.clear()
+        self._finished.clear()
+
+    def _call(self, call_id: str) -> FunctionCall:
+        call = self.calls.get(call_id)
+        if call is None:
+            call = self.calls[call_id] = FunctionCall(call_id=call_id)
+        return call
@@ -0,0 +1,283 @@
+import asyncio
+import binascii
+import os
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..utils.metrics import LatencyStats
+from .codec import codec
+from .queues import DropPolicy
+
+# Largest input_audio_buffer.append built by coalescing: 1s of 24kHz PCM16
+MAX_COALESCED_AUDIO_BYTES = 48000
+
+# 24kHz PCM16 mono
+_BYTES_PER_MS = 48
+
+# Minimum seconds between "Upstream is behind" warnings; drops in between
+# are summed into the next one and always counted in stats()
+OVERFLOW_WARNING_INTERVAL_S = 5.0
+
+_AUDIO = "audio"
+_EVENT = "event"
+
+
+class _SendFailed(Exception):
+    """A send failed; `ws` is the socket it was sent on"""
+
+    def __init__(self, ws, error: BaseException):
+        super().__init__(repr(error))
+        self.ws = ws
+        self.error = error
+
+
+class OutboundWriter:
+    """
+    The single writer for a session's upstream WebSocket.
+
+    Callers queue client events and audio without waiting on the socket;
+    one task sends them in order. When frames queue up faster than they
+    can be sent, consecutive audio chunks are merged into one
+    input_audio_buffer.append, so a backlog is cleared with fewer, larger
+    frames. Nothing is delayed to wait for more audio.
+
+    Queued audio is bounded by watermarks so a slow or reconnecting link
+    can't grow latency without limit. Once more than `high_watermark_ms`
+    of audio is waiting, stale audio is dropped until no more than
+    `low_watermark_ms` is left: the oldest queued audio with DROP_OLDEST,
+    or incoming audio with DROP_NEWEST. Control events are never dropped.
+
+    Sending pauses while `ready` is clear (not yet started, or
+    reconnecting) and resumes with whatever was queued meanwhile. With an
+    AdmissionScheduler, each response.create also waits for its rate
+    limit slot, holding back what was queued after it. Every frame goes
+    to the session's current socket, so one queued before a reconnect is
+    sent on the resumed connection.
+
+    Watermarks default from the environment:
+        REALTIME_OUTBOUND_HIGH_WATERMARK_MS  (1000)
+        REALTIME_OUTBOUND_LOW_WATERMARK_MS   (200)
+    """
+
+    def __init__(
+        self,
+        session,
+        high_watermark_ms: Optional[int] = None,
+        low_watermark_ms: Optional[int] = None,
+        audio_drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        max_coalesced_bytes: int = MAX_COALESCED_AUDIO_BYTES,
+        admission=None,
+    ):
+        """
+        Args:
+            session: The RealtimeSession whose `ws` is written to
+            high_watermark_ms: Queued audio that starts dropping
+            low_watermark_ms: Queued audio that dropping stops at
+            audio_drop_policy: Which audio to drop above the high watermark
+            max_coalesced_bytes: Largest merged audio append, further
+                limited to the low watermark
+            admission: AdmissionScheduler that response.create waits on
+        """
+        self.session = session
+        self.high_watermark_ms = high_watermark_ms or int(
+            os.getenv("REALTIME_OUTBOUND_HIGH_WATERMARK_MS", "1000")
+        )
+        self.low_watermark_ms = min(self.high_watermark_ms, low_watermark_ms or int(
+            os.getenv("REALTIME_OUTBOUND_LOW_WATERMARK_MS", "200")
+        ))
+        self.audio_drop_policy = DropPolicy(audio_drop_policy)
+        # A frame in flight can't be dropped, so it is kept within the low watermark
+        self.max_coalesced_bytes = min(
+            max_coalesced_bytes, self.low_watermark_ms * _BYTES_PER_MS
+        )
+        self.admission = admission
+        self._head_admitted = False  # The queued response.create at the head
+        self.ready = asyncio.Event()
+        self._pending: Deque[Tuple[str, Any, float]] = deque()
+        self._wakeup = asyncio.Event()
+        self._audio_bytes = 0  # Queued, not in flight
+        self._shedding = False  # DROP_NEWEST: refusing audio until drained
+
+        self.queue_wait = LatencyStats()  # Queued to sent
+        self.send_latency = LatencyStats()  # Time in ws.send()
+        self.frames_sent = 0
+        self.audio_chunks = 0
+        self.audio_frames = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.overflows = 0  # Times the high watermark was crossed
+        self._warned_at: Optional[float] = None
+        self._unreported_drop_bytes = 0
+
+    def put_event(self, event: Dict):
+        self._pending.append((_EVENT, event, time.perf_counter()))
+        self._wakeup.set()
+
+    def put_audio(self, pcm: bytes) -> bool:
+        """
+        Queue audio unless the high watermark policy drops it.
+
+        Returns:
+            bool: False if this chunk was dropped
+        """
+        high = self.high_watermark_ms * _BYTES_PER_MS
+        if self.audio_drop_policy == DropPolicy.DROP_NEWEST:
+            if self._shedding and self._audio_bytes <= self.low_watermark_ms * _BYTES_PER_MS:
+                self._shedding = False
+            if not self._shedding and self._audio_bytes + len(pcm) > high:
+                self._shedding = True
+                self.overflows += 1
+            if self._shedding:
+                self.dropped_chunks += 1
+                self.dropped_bytes += len(pcm)
+                return False
+
+        self._pending.append((_AUDIO, pcm, time.perf_counter()))
+        self._audio_bytes += len(pcm)
+        if self._audio_bytes > high and self.audio_drop_policy == DropPolicy.DROP_OLDEST:
+            self._drop_oldest_audio()
+        self._wakeup.set()
+        return True
+
+    def _drop_oldest_audio(self):
+        """Trim queued audio to the low watermark, oldest first"""
+        self.overflows += 1
+        excess = self._audio_bytes - self.low_watermark_ms * _BYTES_PER_MS
+        dropped = 0
+        kept: Deque[Tuple[str, Any, float]] = deque()
+        for item in self._pending:
+            if item[0] == _AUDIO and dropped < excess:
+                dropped += len(item[1])
+                self.dropped_chunks += 1
+            else:
+                kept.append(item)
+        self._pending = kept
+        self._audio_bytes -= dropped
+        self.dropped_bytes += dropped
+        self._unreported_drop_bytes += dropped
+        now = time.monotonic()
+        if self._warned_at is None or now - self._warned_at >= OVERFLOW_WARNING_INTERVAL_S:
+            print(
+                f"[warn] Upstream is behind: dropped "
+                f"{self._unreported_drop_bytes // _BYTES_PER_MS} ms of queued audio"
+            )
+            self._warned_at = now
+            self._unreported_drop_bytes = 0
+
+    @property
+    def depth(self) -> int:
+        """Frames waiting to be sent"""
+        return len(self._pending)
+
+    @property
+    def queued_audio_ms(self) -> float:
+        return self._audio_bytes / _BYTES_PER_MS
+
+    async def run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self.ready.wait()
+            try:
+                await self._drain()
+            except asyncio.CancelledError:
+                raise
+            except _SendFailed as e:
+                # Connection lost: keep the backlog for the resumed session
+                print(f"[warn] Upstream send failed, holding {self.depth} frames: {e.error!r}")
+                # Unless a reconnect already replaced the socket and set ready
+                if e.ws is self.session.ws:
+                    self.ready.clear()
+                self._wakeup.set()
+            except Exception as e:
+                print(f"[error] Outbound writer failed, holding {self.depth} frames: {e!r}")
+                self.ready.clear()
+                self._wakeup.set()
+
+    def _next_frame(self) -> Tuple[List[Tuple[str, Any, float]], str]:
+        """
+        Take the next frame's items off the queue and encode them; audio
+        items already taken can't be dropped while the frame is in flight.
+        """
+        pending = self._pending
+        kind, payload, _ = pending[0]
+        if kind == _EVENT:
+            return [pending.popleft()], codec.dumps(payload)
+
+        count, size = 1, len(payload)
+        for next_kind, next_payload, _ in islice(pending, 1, None):
+            if next_kind != _AUDIO or size + len(next_payload) > self.max_coalesced_bytes:
+                break
+            count += 1
+            size += len(next_payload)
+        items = [pending.popleft() for _ in range(count)]
+        self._audio_bytes -= size
+        audio = b"".join(item[1] for item in items) if count > 1 else payload
+        return items, codec.dumps({
+            "type": "input_audio_buffer.append",
+            "audio": binascii.b2a_base64(audio, newline=False).decode("ascii"),
+        })
+
+    def _requeue(self, items: List[Tuple[str, Any, float]]):
+        self._pending.extendleft(reversed(items))
+        self._audio_bytes += sum(len(item[1]) for item in items if item[0] == _AUDIO)
+
+    async def _drain(self):
+        while self._pending:
+            kind, payload, _ = self._pending[0]
+            if (
+                kind == _EVENT
+                and self.admission is not None
+                and not self._head_admitted
+                and payload.get("type") == "response.create"
+            ):
+                await self.admission.admit_response()
+                self._head_admitted = True
+                continue
+            try:
+                items, message = self._next_frame()
+            except (TypeError, ValueError) as e:
+                print(f"[error] Dropping unencodable event: {e}")
+                self._head_admitted = False
+                continue
+
+            # Read per frame: admission can wait long enough for a reconnect
+            ws = self.session.ws
+            start = time.perf_counter()
+            try:
+                await ws.send(message)
+            except asyncio.CancelledError:
+                self._requeue(items)
+                raise
+            except Exception as e:
+                self._requeue(items)
+                raise _SendFailed(ws, e) from e
+            self._head_admitted = False
+            now = time.perf_counter()
+            self.send_latency.record((now - start) * 1000)
+            for _, _, queued_at in items:
+                self.queue_wait.record((now - queued_at) * 1000)
+            self.frames_sent += 1
+            if items[0][0] == _AUDIO:
+                self.audio_chunks += len(items)
+                self.audio_frames += 1
+
+    def stats(self) -> Dict:
+        """Queue depth, watermarks, drops and send latency"""
+        return {
+            "depth": self.depth,
+            "queued_audio_ms": self.queued_audio_ms,
+            "high_watermark_ms": self.high_watermark_ms,
+            "low_watermark_ms": self.low_watermark_ms,
+            "audio_drop_policy": self.audio_drop_policy.value,
+            "frames_sent": self.frames_sent,
+            "audio_chunks": self.audio_chunks,
+            "audio_frames": self.audio_frames,
+            "overflows": self.overflows,
+            "dropped_chunks": self.dropped_chunks,
+            "dropped_audio_ms": self.dropped_bytes / _BYTES_PER_MS,
+            "queue_wait": self.queue_wait.snapshot(),
+            "send_latency": self.send_latency.snapshot(),
+        }
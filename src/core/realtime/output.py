@@ -0,0 +1,304 @@
+import asyncio
+import binascii
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..utils.metrics import LatencyStats
+
+AudioSink = Callable[[bytes], Awaitable[None]]
+DoneCallback = Callable[[], None]
+ControlSender = Callable[[Dict], Awaitable[None]]
+# Stops playback of an item and returns how many of its samples were heard,
+# or None if the sink never played it
+InterruptCallback = Callable[["OutputItem"], Optional[int]]
+
+
+@dataclass
+class OutputItem:
+    """Playback position of one assistant audio item"""
+    item_id: str
+    response_id: Optional[str] = None
+    content_index: int = 0
+    samples_received: int = 0
+    first_audio_at: Optional[float] = None  # time.perf_counter()
+    first_audio_latency_ms: Optional[float] = None
+    done: bool = False
+    interrupted: bool = False
+    samples_played: Optional[int] = None  # Set when interrupted
+
+    def received_ms(self, sample_rate: int = 24000) -> float:
+        return self.samples_received * 1000 / sample_rate
+
+    def played_ms(self, sample_rate: int = 24000) -> int:
+        return (self.samples_played or 0) * 1000 // sample_rate
+
+
+class ResponseAudioStream:
+    """
+    Streams assistant audio from `response.audio.delta` events to sinks.
+
+    Each delta is base64-decoded once, in C, and the resulting buffer is
+    handed to every sink as is; sinks copy it where they need it (the
+    player's ring buffer, a client WebSocket frame) without intermediate
+    arrays. When `recorder` is set, the audio is recorded once here, before
+    fan-out, whichever sinks play it.
+
+    First-audio latency is measured per response, from the moment a
+    response was requested (`mark_response_requested`, or the end of user
+    speech reported by server VAD) to its first audio delta. When neither
+    was seen, `response.created` is used as the reference.
+
+    On barge-in, `interrupt()` stops every sink that can report what it
+    played, and drops the rest of the interrupted item's deltas still in
+    flight.
+    """
+
+    MAX_TRACKED_ITEMS = 32
+
+    def __init__(self, sample_rate: int = 24000):
+        self.sample_rate = sample_rate
+        self.items: "OrderedDict[str, OutputItem]" = OrderedDict()
+        self.current_item: Optional[OutputItem] = None
+        self.first_audio_latency = LatencyStats()
+
+        self.deltas = 0
+        self.bytes_received = 0
+        self.decode_errors = 0
+        self.interruptions = 0
+        self.dropped_deltas = 0
+        self.recorder = None  # Optional SessionRecorder
+
+        self._sinks: List[
+            Tuple[AudioSink, Optional[DoneCallback], Optional[InterruptCallback]]
+        ] = []
+        self._requested_at: Optional[float] = None
+        self._responses_with_audio: "OrderedDict[str, None]" = OrderedDict()
+
+    def add_sink(
+        self,
+        write: AudioSink,
+        done: Optional[DoneCallback] = None,
+        interrupt: Optional[InterruptCallback] = None,
+    ):
+        """
+        Register a consumer of assistant audio.
+
+        Args:
+            write: Coroutine called with each decoded PCM16 24kHz chunk
+            done: Called when an audio item finishes
+            interrupt: Called on barge-in to stop playback of an item;
+                returns the number of its samples that were heard
+        """
+        self._sinks.append((write, done, interrupt))
+
+    def add_player(self, player) -> "PlayerSink":
+        """Play this stream on an AudioPlayer, with barge-in support"""
+        sink = PlayerSink(self, player)
+        self.add_sink(sink.write, sink.done, sink.interrupt)
+        return sink
+
+    def remove_sink(self, write: AudioSink):
+        self._sinks = [sink for sink in self._sinks if sink[0] != write]
+
+    def mark_response_requested(self):
+        """Start the first-audio clock, e.g. when sending response.create"""
+        self._requested_at = time.perf_counter()
+
+    def on_response_created(self, event: Dict):
+        if self._requested_at is None:
+            self._requested_at = time.perf_counter()
+
+    def on_response_done(self, event: Dict):
+        self._requested_at = None
+
+    async def on_audio_delta(self, event: Dict):
+        """Decode one response.audio.delta event and pass it to every sink"""
+        try:
+            pcm = binascii.a2b_base64(event.get("delta", ""))
+        except binascii.Error as e:
+            self.decode_errors += 1
+            print(f"[error] Invalid audio delta for item {event.get('item_id')}: {e}")
+            return
+
+        item = self._item(event)
+        if item.interrupted:
+            # The server keeps streaming until it sees the cancellation
+            self.dropped_deltas += 1
+            return
+        if item.first_audio_at is None:
+            item.first_audio_at = time.perf_counter()
+            self._record_first_audio(item)
+
+        item.samples_received += len(pcm) // 2
+        self.deltas += 1
+        self.bytes_received += len(pcm)
+
+        if self.recorder is not None:
+            self.recorder.record_output(pcm)
+        for write, _, _ in self._sinks:
+            await write(pcm)
+
+    def on_audio_done(self, event: Dict):
+        """Handle response.audio.done: the item has no more audio"""
+        item = self.items.get(event.get("item_id"))
+        if item is not None:
+            item.done = True
+        for _, done, _ in self._sinks:
+            if done is not None:
+                done()
+
+    def interrupt(self) -> Optional[OutputItem]:
+        """
+        Stop playback of the current item because the user started talking.
+
+        Returns:
+            OutputItem: The interrupted item with `samples_played` set, or
+            None if no sink was still playing it
+        """
+        item = self.current_item
+        if item is None or item.interrupted:
+            return None
+        played = [
+            interrupt(item)
+            for _, _, interrupt in self._sinks
+            if interrupt is not None
+        ]
+        played = [samples for samples in played if samples is not None]
+        if not played or (item.done and min(played) >= item.samples_received):
+            return None
+        item.interrupted = True
+        item.samples_played = min(max(played), item.samples_received)
+        self.interruptions += 1
+        return item
+
+    def _item(self, event: Dict) -> OutputItem:
+        item_id = event.get("item_id", "")
+        item = self.items.get(item_id)
+        if item is None:
+            item = OutputItem(
+                item_id=item_id,
+                response_id=event.get("response_id"),
+                content_index=event.get("content_index", 0),
+            )
+            self.items[item_id] = item
+            if len(self.items) > self.MAX_TRACKED_ITEMS:
+                self.items.popitem(last=False)
+        self.current_item = item
+        return item
+
+    def _record_first_audio(self, item: OutputItem):
+        """Record first-audio latency once per response"""
+        if self._requested_at is None or item.response_id in self._responses_with_audio:
+            return
+        self._responses_with_audio[item.response_id] = None
+        if len(self._responses_with_audio) > self.MAX_TRACKED_ITEMS:
+            self._responses_with_audio.popitem(last=False)
+        item.first_audio_latency_ms = (item.first_audio_at - self._requested_at) * 1000
+        self.first_audio_latency.record(item.first_audio_latency_ms)
+
+    def stats(self) -> Dict:
+        """Output counters and first-audio latency"""
+        return {
+            "deltas": self.deltas,
+            "bytes_received": self.bytes_received,
+            "decode_errors": self.decode_errors,
+            "interruptions": self.interruptions,
+            "dropped_deltas": self.dropped_deltas,
+            "current_item": self.current_item.item_id if self.current_item else None,
+            "first_audio_latency": self.first_audio_latency.snapshot(),
+        }
+
+
+class PlayerSink:
+    """
+    Feeds a ResponseAudioStream to an AudioPlayer and remembers where each
+    item starts in the player's sample positions, so an interrupted item's
+    heard duration is the playback position minus its start.
+    """
+
+    def __init__(self, stream: ResponseAudioStream, player):
+        self.stream = stream
+        self.player = player
+        self._starts: "OrderedDict[str, int]" = OrderedDict()
+
+    async def write(self, pcm: bytes):
+        item = self.stream.current_item
+        if item is not None and item.item_id not in self._starts:
+            self._starts[item.item_id] = self.player.write_position
+            if len(self._starts) > ResponseAudioStream.MAX_TRACKED_ITEMS:
+                self._starts.popitem(last=False)
+        await self.player.enqueue(pcm)
+
+    def done(self):
+        self.player.mark_end_of_stream()
+
+    def interrupt(self, item: OutputItem) -> Optional[int]:
+        start = self._starts.get(item.item_id)
+        if start is None:
+            return None
+        heard = self.player.playback_position() - start
+        if heard < item.samples_received:
+            self.player.flush()
+        return max(0, heard)
+
+
+class ClientSink:
+    """
+    Feeds a ResponseAudioStream to a remote client, e.g. over the API's
+    WebSocket, and remembers where each item starts in the samples sent.
+
+    The server can't see the client's playback, so the client reports it:
+    `report_played` takes how much assistant audio it has played since
+    connecting. On barge-in the client is sent an "audio.interrupt" control
+    message to stop playback, and the item's heard duration is the reported
+    position minus its start. A client that never reports is assumed to
+    have played everything it was sent.
+    """
+
+    def __init__(
+        self,
+        stream: ResponseAudioStream,
+        send_audio: AudioSink,
+        send_control: ControlSender,
+    ):
+        self.stream = stream
+        self.send_audio = send_audio
+        self.send_control = send_control
+        self.samples_sent = 0
+        self.samples_played: Optional[int] = None  # As last reported by the client
+        self._starts: "OrderedDict[str, int]" = OrderedDict()
+        self._background: Set[asyncio.Task] = set()
+
+    async def write(self, pcm: bytes):
+        item = self.stream.current_item
+        if item is not None and item.item_id not in self._starts:
+            self._starts[item.item_id] = self.samples_sent
+            if len(self._starts) > ResponseAudioStream.MAX_TRACKED_ITEMS:
+                self._starts.popitem(last=False)
+        await self.send_audio(pcm)
+        self.samples_sent += len(pcm) // 2
+
+    def report_played(self, played_ms: float):
+        """The client has played `played_ms` of assistant audio since connecting"""
+        self.samples_played = int(played_ms * self.stream.sample_rate / 1000)
+
+    def interrupt(self, item: OutputItem) -> Optional[int]:
+        start = self._starts.get(item.item_id)
+        if start is None:
+            return None
+        position = self.samples_sent
+        if self.samples_played is not None:
+            position = min(self.samples_played, position)
+        heard = max(0, position - start)
+        if heard < item.samples_received:
+            # Called synchronously from the event handler, so send in the background
+            task = asyncio.create_task(self.send_control({
+                "type": "audio.interrupt",
+                "item_id": item.item_id,
+                "played_ms": heard * 1000 // self.stream.sample_rate,
+            }))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return heard
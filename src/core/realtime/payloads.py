@@ -0,0 +1,107 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict
+
+from ...core.config.models import ConversationConfig
+from .codec import codec
+
+REALTIME_MODEL = "gpt-4o-realtime-preview-2024-12-17"
+
+# Compiled configs kept; conversations typically share a handful of configs
+MAX_COMPILED_CONFIGS = 64
+
+
+def config_key(config: ConversationConfig) -> str:
+    """Content hash of a config: equal configs give interchangeable sessions"""
+    return hashlib.sha256(config.model_dump_json().encode()).hexdigest()[:16]
+
+
+def build_instructions(config: ConversationConfig) -> str:
+    """System instructions sent with the session"""
+    return config.system_instructions or ""
+
+
+def conversation_tool_definition() -> Dict:
+    """
+    The single `conversation_tool` function exposed to the model. In the
+    Realtime Beta, each tool is an object in the session's "tools" array.
+    """
+    return {
+        "type": "function",
+        "name": "conversation_tool",
+        "description": "Handle conversation tool function calls from the AI",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["observe", "transition", "complete"]
+                },
+                "observations": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "transition_to": {"type": "string"},
+                "completion_notes": {"type": "string"}
+            },
+            "required": ["action"]
+        }
+    }
+
+
+@dataclass(frozen=True)
+class SessionPayloads:
+    """
+    Serialized session configuration for one ConversationConfig.
+
+    Attributes:
+        key: Content hash of the config
+        create_body: Body of POST /v1/realtime/sessions. It carries the
+            full configuration, so a session connected with its token
+            needs no session.update.
+        update_message: session.update frame applying the same
+            configuration to an already connected session
+    """
+    key: str
+    create_body: str
+    update_message: str
+
+
+def _session_settings(config: ConversationConfig) -> Dict:
+    return {
+        "modalities": ["audio", "text"],
+        "voice": config.voice,
+        "instructions": build_instructions(config),
+        "tools": [conversation_tool_definition()],
+        "input_audio_format": "pcm16",
+        "output_audio_format": "pcm16",
+        # User turns are transcribed so a resumed session can be given a recap
+        "input_audio_transcription": {"model": "whisper-1"},
+    }
+
+
+_compiled: "OrderedDict[str, SessionPayloads]" = OrderedDict()
+
+
+def compile_payloads(config: ConversationConfig) -> SessionPayloads:
+    """
+    Serialized create and update payloads for `config`, built once per
+    distinct config content and reused by every session that shares it.
+    """
+    key = config_key(config)
+    payloads = _compiled.get(key)
+    if payloads is not None:
+        _compiled.move_to_end(key)
+        return payloads
+
+    settings = _session_settings(config)
+    payloads = SessionPayloads(
+        key=key,
+        create_body=codec.dumps({"model": REALTIME_MODEL, **settings}),
+        update_message=codec.dumps({"type": "session.update", "session": settings}),
+    )
+    _compiled[key] = payloads
+    if len(_compiled) > MAX_COMPILED_CONFIGS:
+        _compiled.popitem(last=False)
+    return payloads
@@ -34,9 +34,11 @@ class PhaseManager:
         if new_phase not in current_phase_config.next_phases:
             return False
             
+        previous_phase = self.current_phase
         self.current_phase = new_phase
         self.session.state.current_phase = new_phase
         self.session.state.phase_start_time = self.session.state.conversation_start_time
+        self.session.bus.publish("phase.changed", {"from": previous_phase, "to": new_phase})
         
         return True
         
@@ -0,0 +1,278 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional, Set
+
+from ...core.config.models import ConversationConfig
+from ..utils.metrics import LatencyStats
+from .payloads import config_key
+from .session import RealtimeSession
+
+
+@dataclass
+class _WarmSession:
+    session: RealtimeSession
+    expires_at: float  # time.time()
+    reader: Optional[asyncio.Task] = None  # Reads the socket while idle
+
+
+@dataclass
+class _ConfigPool:
+    """Warm sessions for one config"""
+    config: ConversationConfig
+    target: int
+    ready: Deque[_WarmSession] = field(default_factory=deque)
+    warming: int = 0
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task] = None
+    failures: int = 0
+
+
+class SessionPool:
+    """
+    Keeps initialized RealtimeSessions (created, connected and configured)
+    ready per conversation config, so starting a conversation doesn't wait
+    for session creation and the WebSocket handshake.
+
+    Each config seen by `acquire()` gets its own pool, refilled by a
+    background task. The pool aims to hold `target` idle sessions: a miss
+    raises the target by one (up to `max_size`) and a session that expires
+    unused lowers it (down to `min_size`), so bursts widen the pool and
+    quiet periods shrink it back. Sessions are handed out once and never
+    returned.
+
+    A warm session is already connected, so its ephemeral token (only
+    needed to connect) doesn't limit how long it stays usable. It is
+    discarded once its WebSocket has closed or it is older than
+    `max_age_seconds`, which leaves each conversation most of the API's
+    session lifetime. While idle, its socket is read by the pool and the
+    events (session.created and the like) go to the session's handler, so
+    nothing piles up before the conversation starts.
+
+    Sizes default from the environment:
+        SESSION_POOL_MIN_SIZE         idle sessions kept per config (1)
+        SESSION_POOL_MAX_SIZE         idle sessions allowed per config (4)
+        SESSION_POOL_MAX_CONFIGS      configs kept warm, least recently
+                                      used first out (8)
+        SESSION_POOL_MAX_AGE_SECONDS  age at which an idle session is
+                                      replaced (300)
+    """
+
+    def __init__(
+        self,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        max_configs: Optional[int] = None,
+        max_age_seconds: Optional[float] = None,
+        session_factory: Callable[[ConversationConfig], RealtimeSession] = RealtimeSession,
+    ):
+        """
+        Args:
+            min_size: Idle sessions kept warm per config
+            max_size: Upper bound on idle sessions per config
+            max_configs: Configs kept warm at once
+            max_age_seconds: Idle time after which a warm session is replaced
+            session_factory: Builds an uninitialized session for a config
+        """
+        self.min_size = min_size if min_size is not None else int(
+            os.getenv("SESSION_POOL_MIN_SIZE", "1")
+        )
+        self.max_size = max(self.min_size, max_size if max_size is not None else int(
+            os.getenv("SESSION_POOL_MAX_SIZE", "4")
+        ))
+        self.max_configs = max_configs or int(os.getenv("SESSION_POOL_MAX_CONFIGS", "8"))
+        self.max_age_seconds = max_age_seconds or float(
+            os.getenv("SESSION_POOL_MAX_AGE_SECONDS", "300")
+        )
+        self.session_factory = session_factory
+
+        self._pools: "OrderedDict[str, _ConfigPool]" = OrderedDict()
+        self._background: Set[asyncio.Task] = set()
+        self.acquire_latency = LatencyStats()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.failures = 0
+
+    async def acquire(self, config: ConversationConfig) -> RealtimeSession:
+        """
+        An initialized session for `config`: a warm one if available,
+        otherwise one created now. Either way the pool for `config` is
+        topped up in the background.
+        """
+        start = time.perf_counter()
+        pool = self._pool(config)
+        warm = self._take(pool)
+        session = None
+        if warm is not None:
+            # The session's own receive loop takes over the socket
+            await self._stop_reading(warm)
+            session = warm.session
+            self.hits += 1
+        else:
+            self.misses += 1
+            pool.target = min(self.max_size, pool.target + 1)
+        pool.wake.set()
+
+        if session is None:
+            session = await self._create(config)
+        # The conversation starts now, not when the session was warmed
+        session.state.conversation_start_time = time.time()
+        self.acquire_latency.record((time.perf_counter() - start) * 1000)
+        return session
+
+    def warm(self, config: ConversationConfig):
+        """Start keeping sessions warm for `config` ahead of the first acquire"""
+        self._pool(config).wake.set()
+
+    def _pool(self, config: ConversationConfig) -> _ConfigPool:
+        key = config_key(config)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _ConfigPool(config=config, target=self.min_size)
+            pool.task = asyncio.create_task(self._refill(pool))
+            while len(self._pools) > self.max_configs:
+                _, evicted = self._pools.popitem(last=False)
+                self._spawn(self._drain(evicted))
+        else:
+            self._pools.move_to_end(key)
+        return pool
+
+    def _take(self, pool: _ConfigPool) -> Optional[_WarmSession]:
+        """Pop the oldest usable session, discarding stale ones"""
+        self._discard_stale(pool)
+        if pool.ready:
+            return pool.ready.popleft()
+        return None
+
+    def _discard_stale(self, pool: _ConfigPool):
+        now = time.time()
+        fresh = deque()
+        for warm in pool.ready:
+            if warm.expires_at > now and warm.session.connected:
+                fresh.append(warm)
+            else:
+                self.expired += 1
+                pool.target = max(self.min_size, pool.target - 1)
+                self._spawn(self._retire(warm))
+        pool.ready = fresh
+
+    async def _read_idle(self, pool: _ConfigPool, session: RealtimeSession):
+        """Consume events sent to a warm session before it is handed out"""
+        try:
+            async for message in session.ws:
+                if not isinstance(message, str):
+                    continue
+                try:
+                    await session.event_handler.handle_message(message)
+                except Exception as e:
+                    print(f"[error] Failed to handle event: {e!r}")
+        except Exception as e:
+            print(f"[warn] Warm session {session.id} lost its connection: {e}")
+        # Closed while idle; the refill task replaces it
+        pool.wake.set()
+
+    async def _stop_reading(self, warm: _WarmSession):
+        if warm.reader is not None:
+            warm.reader.cancel()
+            await asyncio.gather(warm.reader, return_exceptions=True)
+            warm.reader = None
+
+    async def _retire(self, warm: _WarmSession):
+        await self._stop_reading(warm)
+        await warm.session.close()
+
+    def _spawn(self, coro):
+        """Run cleanup in the background, keeping a reference until it ends"""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _create(self, config: ConversationConfig) -> RealtimeSession:
+        session = self.session_factory(config)
+        await session.initialize()
+        if not session.connected:
+            await session.close()
+            raise RuntimeError("Failed to initialize realtime session: WebSocket not connected")
+        return session
+
+    async def _warm_one(self, pool: _ConfigPool):
+        pool.warming += 1
+        try:
+            session = await self._create(pool.config)
+        except Exception as e:
+            self.failures += 1
+            pool.failures += 1
+            print(f"[error] Failed to warm realtime session: {e}")
+            return
+        finally:
+            pool.warming -= 1
+        pool.failures = 0
+        pool.ready.append(_WarmSession(
+            session,
+            expires_at=time.time() + self.max_age_seconds,
+            reader=asyncio.create_task(self._read_idle(pool, session)),
+        ))
+
+    async def _refill(self, pool: _ConfigPool):
+        """Top the pool up to its target and wake again before the next expiry"""
+        while True:
+            pool.wake.clear()
+            self._discard_stale(pool)
+            missing = pool.target - len(pool.ready) - pool.warming
+            if missing > 0:
+                await asyncio.gather(*(self._warm_one(pool) for _ in range(missing)))
+                if pool.failures:
+                    # Back off while the API is failing instead of retrying hot
+                    await asyncio.sleep(min(30.0, 2.0 ** pool.failures))
+                continue
+
+            timeout = None
+            if pool.ready:
+                earliest = min(warm.expires_at for warm in pool.ready)
+                timeout = max(0.0, earliest - time.time())
+            try:
+                await asyncio.wait_for(pool.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _drain(self, pool: _ConfigPool):
+        if pool.task is not None:
+            pool.task.cancel()
+        warm_sessions = list(pool.ready)
+        pool.ready.clear()
+        await asyncio.gather(
+            *(self._retire(warm) for warm in warm_sessions), return_exceptions=True
+        )
+
+    async def close(self):
+        """Stop refilling and close every idle session"""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        await asyncio.gather(*(self._drain(pool) for pool in pools))
+
+    def stats(self) -> Dict:
+        """Hit rate, acquisition latency and per-config pool sizes"""
+        acquired = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / acquired if acquired else 0.0,
+            "expired": self.expired,
+            "failures": self.failures,
+            "acquire_latency": self.acquire_latency.snapshot(),
+            "configs": {
+                key: {
+                    "ready": len(pool.ready),
+                    "warming": pool.warming,
+                    "target": pool.target,
+                }
+                for key, pool in self._pools.items()
+            },
+        }
+
+
+# Default pool used by the API
+session_pool = SessionPool()
@@ -0,0 +1,29 @@
+import asyncio
+from enum import Enum
+from typing import Any
+
+
+class DropPolicy(str, Enum):
+    """What a bounded queue gives up when it is full"""
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+
+def offer(queue: asyncio.Queue, item: Any, policy: DropPolicy) -> bool:
+    """
+    Put `item` on a bounded queue without waiting.
+
+    With DROP_OLDEST the head of a full queue is discarded to make room;
+    with DROP_NEWEST `item` itself is discarded.
+
+    Returns:
+        bool: True if an item had to be dropped
+    """
+    if not queue.full():
+        queue.put_nowait(item)
+        return False
+    if policy == DropPolicy.DROP_NEWEST:
+        return True
+    queue.get_nowait()
+    queue.put_nowait(item)
+    return True
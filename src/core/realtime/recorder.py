@@ -0,0 +1,205 @@
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+WAV_HEADER_SIZE = 44
+
+# Bytes per read when a recording is served in pieces
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def wav_header(data_size: int, sample_rate: int, channels: int = 1) -> bytes:
+    """Canonical 44-byte PCM16 WAV header for `data_size` bytes of audio"""
+    block_align = channels * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        16,
+        b"data",
+        data_size,
+    )
+
+
+class MappedWavWriter:
+    """
+    Append-only PCM16 WAV file backed by a memory map.
+
+    The file is allocated up front for `max_seconds` of audio and mapped
+    once. Appends copy straight from the caller's buffer into the mapping,
+    with no intermediate Python objects. On close the header gets the real
+    data size and the file is truncated to it.
+
+    While the call is running, `read()` serves byte ranges of the WAV as it
+    stands, with a header that reflects the audio written so far.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        sample_rate: int = 24000,
+        max_seconds: float = 1800,
+        channels: int = 1,
+    ):
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        max_samples = int(max_seconds * sample_rate) * channels
+        self.capacity = WAV_HEADER_SIZE + max_samples * 2
+        self.data_size = 0
+        self.truncated_bytes = 0
+        self.closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w+b")
+        # Reserve real disk blocks where possible: a write through the map
+        # into a sparse file on a full disk raises SIGBUS instead of OSError.
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(self._file.fileno(), 0, self.capacity)
+        else:
+            self._file.truncate(self.capacity)
+        self._map = mmap.mmap(self._file.fileno(), self.capacity)
+        self._map[:WAV_HEADER_SIZE] = wav_header(0, sample_rate, channels)
+
+    @property
+    def size(self) -> int:
+        """Current size of the WAV file in bytes, header included"""
+        return WAV_HEADER_SIZE + self.data_size
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.data_size / (self.sample_rate * self.channels * 2)
+
+    def append(self, pcm: bytes) -> int:
+        """
+        Append PCM16 audio. Audio beyond the preallocated capacity is
+        counted in `truncated_bytes` and dropped.
+
+        Returns:
+            int: Number of bytes written
+        """
+        if self.closed:
+            return 0
+        position = WAV_HEADER_SIZE + self.data_size
+        count = min(len(pcm), self.capacity - position) & ~1
+        if count:
+            self._map[position : position + count] = memoryview(pcm)[:count]
+            self.data_size += count
+        self.truncated_bytes += len(pcm) - count
+        return count
+
+    def read(self, start: int = 0, end: Optional[int] = None) -> bytes:
+        """
+        Read bytes [start, end) of the WAV file, like an HTTP range request.
+        `end` defaults to the current end of file.
+        """
+        size = self.size
+        end = size if end is None else min(end, size)
+        start = max(0, start)
+        if start >= end:
+            return b""
+        if self.closed:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                return f.read(end - start)
+
+        header = wav_header(self.data_size, self.sample_rate, self.channels)
+        if start >= WAV_HEADER_SIZE:
+            return self._map[start:end]
+        return header[start:WAV_HEADER_SIZE][: end - start] + self._map[
+            WAV_HEADER_SIZE:end
+        ]
+
+    def iter_range(
+        self, start: int = 0, end: Optional[int] = None, chunk_size: int = READ_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Bytes [start, end) of the WAV file as pieces of at most `chunk_size`,
+        so a long recording can be sent without holding it all in memory.
+        `end` defaults to the end of file when iteration starts; audio
+        appended afterwards is not included.
+        """
+        end = self.size if end is None else min(end, self.size)
+        position = max(0, start)
+        while position < end:
+            piece = self.read(position, min(position + chunk_size, end))
+            if not piece:
+                return
+            position += len(piece)
+            yield piece
+
+    def close(self):
+        """Write the final header, release the map and trim the file"""
+        if self.closed:
+            return
+        self._map[:WAV_HEADER_SIZE] = wav_header(
+            self.data_size, self.sample_rate, self.channels
+        )
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self.size)
+        self._file.close()
+        self.closed = True
+
+
+class SessionRecorder:
+    """
+    Records both directions of a session into two WAV files:
+    `<session_id>_input.wav` (user audio as sent upstream, before any
+    silence gating) and `<session_id>_output.wav` (assistant audio).
+    """
+
+    DIRECTIONS = ("input", "output")
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        session_id: str,
+        sample_rate: int = 24000,
+        max_duration_seconds: float = 1800,
+    ):
+        self.directory = Path(directory)
+        self.session_id = session_id
+        self.tracks: Dict[str, MappedWavWriter] = {
+            direction: MappedWavWriter(
+                self.directory / f"{session_id}_{direction}.wav",
+                sample_rate=sample_rate,
+                max_seconds=max_duration_seconds,
+            )
+            for direction in self.DIRECTIONS
+        }
+
+    def record_input(self, pcm: bytes):
+        self.tracks["input"].append(pcm)
+
+    def record_output(self, pcm: bytes):
+        self.tracks["output"].append(pcm)
+
+    def track(self, direction: str) -> MappedWavWriter:
+        if direction not in self.tracks:
+            raise KeyError(f"Unknown recording direction: {direction}")
+        return self.tracks[direction]
+
+    def close(self):
+        for track in self.tracks.values():
+            track.close()
+
+    def stats(self) -> Dict:
+        return {
+            direction: {
+                "path": str(track.path),
+                "duration_seconds": track.duration_seconds,
+                "truncated_bytes": track.truncated_bytes,
+            }
+            for direction, track in self.tracks.items()
+        }
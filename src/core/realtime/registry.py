@@ -0,0 +1,234 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from .session import RealtimeSession
+
+CloseHook = Callable[[str, RealtimeSession], Awaitable[None]]
+
+
+@dataclass
+class _Entry:
+    session: RealtimeSession
+    last_used: float  # time.monotonic()
+    attached: int = 0  # Client connections currently using the session
+
+
+async def close_session(session_id: str, session: RealtimeSession):
+    """Default close hook: stop the session's tasks and upstream WebSocket"""
+    await session.close()
+
+
+class SessionRegistry:
+    """
+    The API's conversations by session id, with their resources reclaimed
+    once they are no longer used.
+
+    A session is removed, and its close hooks run, when:
+        - nothing has used it for `idle_ttl_seconds` (checked by a
+          background sweep every `sweep_interval_seconds`)
+        - registering another would exceed `max_sessions`; the least
+          recently used goes first
+        - it is removed explicitly
+    Sessions with an attached client connection are never evicted; their
+    idle time starts when the last connection detaches.
+
+    Close hooks are awaited with (session_id, session) and by default
+    close the session, which shuts its upstream WebSocket and finalizes
+    any recording. Add more with `add_close_hook`.
+
+    Limits default from the environment:
+        SESSION_REGISTRY_MAX_SESSIONS      sessions kept (1000)
+        SESSION_IDLE_TTL_SECONDS           idle time before eviction (600)
+        SESSION_SWEEP_INTERVAL_SECONDS     time between sweeps (30)
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        sweep_interval_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            max_sessions: Sessions kept before the least recently used is evicted
+            idle_ttl_seconds: Unused time after which a session is evicted
+            sweep_interval_seconds: How often idle sessions are looked for
+        """
+        self.max_sessions = max_sessions or int(
+            os.getenv("SESSION_REGISTRY_MAX_SESSIONS", "1000")
+        )
+        self.idle_ttl_seconds = idle_ttl_seconds or float(
+            os.getenv("SESSION_IDLE_TTL_SECONDS", "600")
+        )
+        self.sweep_interval_seconds = sweep_interval_seconds or float(
+            os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "30")
+        )
+        self.close_hooks: List[CloseHook] = [close_session]
+
+        # Least recently used first
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+        self.removed = 0
+        self.close_failures = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def add_close_hook(self, hook: CloseHook):
+        """Run `hook(session_id, session)` whenever a session leaves the registry"""
+        self.close_hooks.append(hook)
+
+    def register(self, session_id: str, session: RealtimeSession):
+        """Add a session, evicting the least recently used ones over capacity"""
+        self._entries[session_id] = _Entry(session, time.monotonic())
+        self._entries.move_to_end(session_id)
+        if len(self._entries) > self.max_sessions:
+            for evicted_id in self._least_recently_used(len(self._entries) - self.max_sessions):
+                self.evicted_capacity += 1
+                self._spawn(self._close(evicted_id, self._entries.pop(evicted_id).session))
+
+    def _least_recently_used(self, count: int) -> List[str]:
+        """Up to `count` unattached session ids, least recently used first"""
+        ids = []
+        for session_id, entry in self._entries.items():
+            if len(ids) == count:
+                break
+            if not entry.attached:
+                ids.append(session_id)
+        if len(ids) < count:
+            print(
+                f"[warn] Session registry over capacity: {len(self._entries)} "
+                f"sessions, {self.max_sessions} allowed, all others in use"
+            )
+        return ids
+
+    def get(self, session_id: str) -> Optional[RealtimeSession]:
+        """The session, marked as just used, or None"""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        entry.last_used = time.monotonic()
+        self._entries.move_to_end(session_id)
+        return entry.session
+
+    def attach(self, session_id: str):
+        """A client connection started using the session; it won't be evicted"""
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            entry.attached += 1
+
+    def detach(self, session_id: str):
+        """A client connection ended; the session's idle time starts now"""
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            entry.attached = max(0, entry.attached - 1)
+            self.get(session_id)
+
+    async def remove(self, session_id: str) -> bool:
+        """
+        Remove a session and run its close hooks.
+
+        Returns:
+            bool: False if the session wasn't registered
+        """
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+        self.removed += 1
+        await self._close(session_id, entry.session)
+        return True
+
+    async def sweep(self) -> int:
+        """
+        Evict sessions idle for longer than the TTL.
+
+        Returns:
+            int: Sessions evicted
+        """
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        expired = []
+        for session_id, entry in self._entries.items():
+            # Ordered by last use, so everything after this is fresher
+            if entry.last_used > cutoff:
+                break
+            if not entry.attached:
+                expired.append(session_id)
+        closing = [(session_id, self._entries.pop(session_id).session) for session_id in expired]
+        self.evicted_idle += len(closing)
+        await asyncio.gather(*(self._close(*item) for item in closing))
+        return len(closing)
+
+    async def _close(self, session_id: str, session: RealtimeSession):
+        for hook in self.close_hooks:
+            try:
+                await hook(session_id, session)
+            except Exception as e:
+                self.close_failures += 1
+                print(f"[warn] Close hook failed for session {session_id}: {e!r}")
+
+    def _spawn(self, coro):
+        """Run cleanup in the background, keeping a reference until it ends"""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def start(self):
+        """Start the background sweep"""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            try:
+                evicted = await self.sweep()
+            except Exception as e:
+                print(f"[error] Session sweep failed: {e!r}")
+                continue
+            if evicted:
+                print(f"[info] Evicted {evicted} idle session(s)")
+
+    async def close(self):
+        """Stop sweeping and close every registered session"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        entries = list(self._entries.items())
+        self._entries.clear()
+        await asyncio.gather(
+            *(self._close(session_id, entry.session) for session_id, entry in entries),
+            *self._background,
+            return_exceptions=True,
+        )
+
+    def stats(self) -> Dict:
+        """Occupancy, evictions and close failures"""
+        now = time.monotonic()
+        oldest = next((entry for entry in self._entries.values() if not entry.attached), None)
+        return {
+            "sessions": len(self._entries),
+            "attached": sum(1 for entry in self._entries.values() if entry.attached),
+            "max_sessions": self.max_sessions,
+            "occupancy": len(self._entries) / self.max_sessions,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "longest_idle_seconds": now - oldest.last_used if oldest else 0.0,
+            "evicted_idle": self.evicted_idle,
+            "evicted_capacity": self.evicted_capacity,
+            "removed": self.removed,
+            "close_failures": self.close_failures,
+        }
+
+
+# Conversations served by the API
+session_registry = SessionRegistry()
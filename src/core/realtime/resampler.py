@@ -0,0 +1,177 @@
+from math import gcd
+from typing import Optional
+
+import numpy as np
+
+
+class StreamingResampler:
+    """
+    Stateful polyphase resampler for a continuous mono PCM16 stream.
+
+    The resampler is configured once with the real source and target rates.
+    It keeps the tail of the previous chunk as filter history, so chunks can
+    be of any length and the output has no discontinuities at chunk
+    boundaries. All work happens in buffers that are allocated up front and
+    only grow when a larger chunk than any seen before arrives.
+
+    Attributes:
+        source_rate (int): Sample rate of the incoming audio
+        target_rate (int): Sample rate of the produced audio
+        up (int): Interpolation factor of the rational ratio
+        down (int): Decimation factor of the rational ratio
+        taps_per_phase (int): Filter length per polyphase branch, in input samples
+    """
+
+    def __init__(
+        self,
+        source_rate: int,
+        target_rate: int,
+        taps_per_phase: int = 32,
+        max_chunk_samples: Optional[int] = None,
+        rolloff: float = 0.94,
+        kaiser_beta: float = 8.0,
+    ):
+        if source_rate <= 0 or target_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+
+        self.source_rate = int(source_rate)
+        self.target_rate = int(target_rate)
+        divisor = gcd(self.source_rate, self.target_rate)
+        self.up = self.target_rate // divisor
+        self.down = self.source_rate // divisor
+        self.taps_per_phase = taps_per_phase
+
+        self._filters = self._design_filters(rolloff, kaiser_beta)
+        # Position of the next output sample relative to the start of the
+        # next input chunk, in units of 1/up input samples.
+        self._position = 0
+        self._capacity = 0
+        if max_chunk_samples is None:
+            max_chunk_samples = self.source_rate // 10  # 100ms
+        self._allocate(max_chunk_samples)
+
+    @property
+    def passthrough(self) -> bool:
+        """True when source and target rates match and no filtering is done"""
+        return self.up == self.down
+
+    def _design_filters(self, rolloff: float, kaiser_beta: float) -> np.ndarray:
+        """
+        Design the Kaiser-windowed sinc low-pass filter and split it into
+        `up` polyphase branches, each reversed so it can be applied directly
+        to a forward-ordered window of input samples.
+        """
+        length = self.up * self.taps_per_phase
+        cutoff = rolloff * 0.5 / max(self.up, self.down)
+        n = np.arange(length, dtype=np.float64) - (length - 1) / 2.0
+        prototype = 2.0 * cutoff * np.sinc(2.0 * cutoff * n)
+        prototype *= np.kaiser(length, kaiser_beta)
+        prototype *= self.up / prototype.sum()
+
+        # Branch p holds prototype[p + k * up] for k = 0..taps_per_phase-1
+        branches = prototype.reshape(self.taps_per_phase, self.up).T
+        return np.ascontiguousarray(branches[:, ::-1], dtype=np.float32)
+
+    def _allocate(self, chunk_samples: int):
+        """Allocate (or grow) the working buffers for chunks of this size"""
+        history = self.taps_per_phase - 1
+        max_out = -(-chunk_samples * self.up // self.down) + 1
+
+        buffer = np.zeros(history + chunk_samples, dtype=np.float32)
+        if self._capacity:
+            buffer[:history] = self._buffer[:history]
+        self._buffer = buffer
+        self._output = np.empty(max_out, dtype=np.float32)
+        self._scratch = np.empty(max_out // self.up + 1, dtype=np.float32)
+        self._output_pcm = np.empty(max_out, dtype=np.int16)
+        self._capacity = chunk_samples
+
+    @staticmethod
+    def _to_pcm(samples: np.ndarray, out: np.ndarray):
+        """Scale [-1, 1] floats (in place) and round them into int16 `out`"""
+        samples *= 32768.0
+        np.rint(samples, out=samples)
+        np.clip(samples, -32768.0, 32767.0, out=samples)
+        np.copyto(out, samples, casting="unsafe")
+
+    def reset(self):
+        """Clear filter history, e.g. when the input stream restarts"""
+        self._buffer[: self.taps_per_phase - 1] = 0.0
+        self._position = 0
+
+    def process(
+        self, samples: np.ndarray, scale: float = 1.0 / 32768.0
+    ) -> np.ndarray:
+        """
+        Resample the next chunk of the stream.
+
+        Downmixing and dtype conversion are folded into the copy that stages
+        the chunk into the filter buffer, so a raw `np.frombuffer` view can
+        be passed straight in.
+
+        Args:
+            samples: Input samples at `source_rate`, either 1-D or shaped
+                (frames, channels) to be downmixed to mono
+            scale: Factor that maps a sample to the [-1, 1] range, e.g.
+                1/32768 for int16 and 1.0 for float32
+
+        Returns:
+            np.ndarray: int16 samples at `target_rate`. Unless `samples` is
+            already mono int16 at the target rate (in which case it is
+            returned as is), this is a view into an internal buffer that is
+            overwritten by the next call, so copy it (e.g. with `tobytes()`)
+            before calling again.
+        """
+        if self.passthrough and samples.ndim == 1 and samples.dtype == np.int16:
+            return samples
+
+        count_in = len(samples)
+        if count_in > self._capacity:
+            self._allocate(count_in)
+
+        history = self.taps_per_phase - 1
+        staged = self._buffer[history : history + count_in]
+        if samples.ndim == 2 and samples.shape[1] > 1:
+            np.add.reduce(samples, axis=1, dtype=np.float32, out=staged)
+            staged *= np.float32(scale / samples.shape[1])
+        else:
+            np.multiply(
+                samples.reshape(-1), np.float32(scale), out=staged, dtype=np.float32
+            )
+
+        if self.passthrough:
+            pcm = self._output_pcm[:count_in]
+            self._to_pcm(staged, pcm)
+            return pcm
+
+        span = count_in * self.up
+        if self._position >= span:
+            count_out = 0
+        else:
+            count_out = -(-(span - self._position) // self.down)
+
+        pcm = self._output_pcm[:count_out]
+        if count_out:
+            windows = np.lib.stride_tricks.sliding_window_view(
+                self._buffer[: history + count_in], self.taps_per_phase
+            )
+            output = self._output[:count_out]
+            # Outputs n, n+up, n+2up, ... share a polyphase branch and read
+            # windows `down` rows apart, so each branch is one strided
+            # matrix-vector product over a view of the input buffer. np.dot
+            # needs a contiguous `out`, hence the scratch buffer.
+            for first in range(min(self.up, count_out)):
+                offset = self._position + first * self.down
+                row, phase = divmod(offset, self.up)
+                n = (count_out - first - 1) // self.up + 1
+                rows = windows[row : row + (n - 1) * self.down + 1 : self.down]
+                branch = self._scratch[:n]
+                np.dot(rows, self._filters[phase], out=branch)
+                output[first :: self.up] = branch
+
+            self._to_pcm(output, pcm)
+
+        self._position += count_out * self.down - span
+        # Keep the last taps_per_phase-1 input samples as history
+        self._buffer[:history] = self._buffer[count_in : count_in + history]
+        return pcm
@@ -0,0 +1,80 @@
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+# Upper bound on the recap sent to a resumed session; recent turns win
+MAX_RECAP_CHARS = 4000
+
+
+class ConversationTranscript:
+    """Final user and assistant utterances, most recent `max_turns` kept"""
+
+    def __init__(self, max_turns: int = 50):
+        self.turns: Deque[Tuple[str, str]] = deque(maxlen=max_turns)
+
+    def add(self, role: str, text: str):
+        text = (text or "").strip()
+        if text:
+            self.turns.append((role, text))
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+
+def resume_instructions(session) -> str:
+    """The session instructions plus the current phase's instructions"""
+    instructions = session._build_instructions()
+    phase = session.config.phases.get(session.phase_manager.current_phase)
+    if phase is None:
+        return instructions
+    return f"{instructions}\n\nCurrent phase: {phase.name}\n{phase.instructions}".strip()
+
+
+def conversation_recap(session, max_chars: int = MAX_RECAP_CHARS) -> str:
+    """
+    Compact summary of the conversation so far: phase, observations and as
+    many of the most recent turns as fit in `max_chars`.
+    """
+    lines = [
+        "The connection was interrupted and this conversation is being resumed. "
+        "Continue from where it left off without starting over or greeting again.",
+        f"Current phase: {session.phase_manager.current_phase}",
+    ]
+    for phase, observations in session.observation_tracker.observations.items():
+        if observations:
+            lines.append(f"Observations in {phase}: " + "; ".join(map(str, observations)))
+    header = "\n".join(lines)
+
+    turns: List[str] = []
+    budget = max_chars - len(header) - len("\nRecent turns:")
+    for role, text in reversed(session.transcript.turns):
+        line = f"{role.capitalize()}: {text}"
+        if len(line) + 1 > budget:
+            break
+        turns.append(line)
+        budget -= len(line) + 1
+    if turns:
+        header += "\nRecent turns:\n" + "\n".join(reversed(turns))
+    return header[:max_chars]
+
+
+def resume_events(session) -> List[Dict]:
+    """
+    Client events that bring a freshly created session up to the state of
+    the one that was lost. Tools and audio settings come with the create
+    request, so only the phase-specific instructions and a recap of the
+    conversation are sent.
+    """
+    return [
+        {
+            "type": "session.update",
+            "session": {"instructions": resume_instructions(session)},
+        },
+        {
+            "type": "conversation.item.create",
+            "item": {
+                "type": "message",
+                "role": "system",
+                "content": [{"type": "input_text", "text": conversation_recap(session)}],
+            },
+        },
+    ]
@@ -0,0 +1,89 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Single-producer/single-consumer ring buffer of audio samples.
+
+    The producer only advances the write index and the consumer only
+    advances the read index, each after its copy is finished, so no lock is
+    needed between an asyncio producer and an audio-callback consumer.
+    Indices grow monotonically; positions are taken modulo the capacity.
+
+    Attributes:
+        capacity (int): Maximum number of buffered samples
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._write_index = 0
+        self._read_index = 0
+
+    @property
+    def available(self) -> int:
+        """Number of samples ready to be read"""
+        return self._write_index - self._read_index
+
+    @property
+    def free(self) -> int:
+        """Number of samples that can be written without overrunning"""
+        return self.capacity - self.available
+
+    @property
+    def total_written(self) -> int:
+        """Samples written since creation"""
+        return self._write_index
+
+    @property
+    def total_read(self) -> int:
+        """Samples consumed (read or skipped) since creation"""
+        return self._read_index
+
+    def write(self, samples: np.ndarray) -> int:
+        """
+        Append samples (producer side).
+
+        Returns:
+            int: Number of samples written. Less than `len(samples)` when the
+            buffer is full; the remainder is not written.
+        """
+        count = min(len(samples), self.free)
+        if count == 0:
+            return 0
+        start = self._write_index % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start : start + first] = samples[:first]
+        if first < count:
+            self._data[: count - first] = samples[first:count]
+        self._write_index += count
+        return count
+
+    def read_into(self, out: np.ndarray) -> int:
+        """
+        Copy up to `len(out)` samples into `out` (consumer side).
+
+        Returns:
+            int: Number of samples copied
+        """
+        count = min(len(out), self.available)
+        if count == 0:
+            return 0
+        start = self._read_index % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self._data[start : start + first]
+        if first < count:
+            out[first:count] = self._data[: count - first]
+        self._read_index += count
+        return count
+
+    def discard(self) -> int:
+        """
+        Drop everything currently buffered (consumer side).
+
+        Returns:
+            int: Number of samples dropped
+        """
+        dropped = self.available
+        self._read_index += dropped
+        return dropped
@@ -1,14 +1,22 @@
 import os
-import json
 import time
+import random
 import asyncio
-import aiohttp  # For async HTTP requests
 import websockets
-from typing import Optional, Dict
+from typing import Dict, Iterable, List, Optional
 
 from ...core.config.models import ConversationConfig
+from ..utils.http import SharedHttpClient, http_client
+from ..utils.metrics import LatencyStats
+from .admission import AdmissionScheduler, admission as default_admission
 from .events import RealtimeEventHandler
-from .audio import RealtimeAudioProcessor
+from .bus import EventBus, Subscription
+from .codec import codec
+from .output import ResponseAudioStream
+from .outbound import OutboundWriter
+from .payloads import build_instructions, compile_payloads, conversation_tool_definition
+from .recorder import SessionRecorder
+from .resume import ConversationTranscript, resume_events
 from .phase_manager import PhaseManager
 from .observation_tracker import ObservationTracker
 
@@ -41,27 +49,228 @@ class RealtimeSession:
     
     Attributes:
         config (ConversationConfig): Configuration for the conversation
+        payloads (SessionPayloads): Serialized session configuration, shared
+            by sessions with the same config
         state (SessionState): Current state of the session
         event_handler (RealtimeEventHandler): Handles incoming events
         audio_processor (RealtimeAudioProcessor): Processes audio chunks
+        audio_output (ResponseAudioStream): Streams assistant audio to sinks
+        frames (FrameProfile): Audio frame size for capture, processing and sends
+        bus (EventBus): Publishes API and conversation events to subscribers
+        transcript (ConversationTranscript): Recent turns, for resuming
+        recovery (LatencyStats): Time from a dropped connection to resumed
         phase_manager (PhaseManager): Manages conversation phases
         observation_tracker (ObservationTracker): Tracks observations and criteria
+        outbound (OutboundWriter): Queues and sends client events and audio
+        admission (AdmissionScheduler): Rate limit shaping shared by the
+            process's sessions
         ws (websockets.WebSocketClientProtocol): WebSocket connection to OpenAI
+
+    After `initialize()`, `start()` runs the session's receive task, which
+    dispatches every upstream event and reconnects if the connection drops,
+    and its writer task. Send with `send_event()` and `send_audio()`;
+    consume events with `async for event in session.events(...)`.
     """
-    def __init__(self, config: ConversationConfig):
+    # Base of the REST and WebSocket endpoints; point it at a local
+    # stand-in (see fake_server.py) for offline testing
+    API_BASE = os.getenv("REALTIME_API_BASE", "https://api.openai.com/v1")
+
+    # Reconnect backoff: doubles from the base delay up to the max, and
+    # gives up once the deadline has passed since the drop
+    RECONNECT_BASE_DELAY = 0.25
+    RECONNECT_MAX_DELAY = 4.0
+    RECONNECT_DEADLINE = float(os.getenv("REALTIME_RECONNECT_DEADLINE_SECONDS", "15"))
+
+    # Session creations answered with 429 are queued and retried this often
+    MAX_THROTTLED_RETRIES = 5
+
+    def __init__(
+        self,
+        config: ConversationConfig,
+        http: Optional[SharedHttpClient] = None,
+        api_base: Optional[str] = None,
+        admission: Optional[AdmissionScheduler] = None
+    ):
+        """
+        Args:
+            config: Configuration for the conversation
+            http: HTTP client for session creation; defaults to the
+                process-wide pooled client
+            api_base: Overrides API_BASE, e.g. "http://127.0.0.1:8765/v1"
+            admission: Rate limit scheduler; defaults to the process-wide one
+        """
         self.config = config
+        self.api_base = (api_base or self.API_BASE).rstrip("/")
+        self.payloads = compile_payloads(config)
+        self.http = http or http_client
+        self.admission = admission or default_admission
+        self.frames = config.frame_settings()
         self.state = SessionState()
+        self.bus = EventBus()
         self.event_handler = RealtimeEventHandler(self)
-        self.audio_processor = RealtimeAudioProcessor()
+        self._audio_processor = None
+        self.audio_output = ResponseAudioStream()
         self.phase_manager = PhaseManager(self)
         self.observation_tracker = ObservationTracker()
+        self.transcript = ConversationTranscript()
         # We'll assume openai.api_key is set externally for your environment:
         self.api_key = os.environ.get("OPENAI_API_KEY", "")
         self.ws = None
+        self.outbound = OutboundWriter(self, admission=self.admission)
+        self.recorder: Optional[SessionRecorder] = None
+        self.recovery = LatencyStats()
+        self.reconnects = 0
+        self.reconnect_failures = 0
+        self._closing = False
+        self._lost = False  # Reconnecting gave up
+        self._tasks: List[asyncio.Task] = []
         
         # Session identifiers populated after create() call
         self.id: Optional[str] = None
         self.token: Optional[str] = None
+        self.token_expires_at: Optional[float] = None  # Unix time
+
+    @property
+    def audio_processor(self):
+        """
+        RealtimeAudioProcessor for this session, created on first use so
+        that NumPy is only imported once audio actually flows.
+        """
+        if self._audio_processor is None:
+            from .audio import RealtimeAudioProcessor
+
+            self._audio_processor = RealtimeAudioProcessor(
+                frame_ms=self.frames.frame_ms
+            )
+            self._audio_processor.recorder = self.recorder
+        return self._audio_processor
+
+    def enable_recording(
+        self,
+        directory: str,
+        name: Optional[str] = None,
+        max_duration_seconds: Optional[float] = None,
+    ) -> SessionRecorder:
+        """
+        Start recording both audio directions to WAV files in `directory`.
+        Space for the configured maximum conversation length (30 minutes if
+        unset) is allocated up front.
+
+        Args:
+            directory: Where to write the WAV files
+            name: File name prefix, defaults to the Realtime session id
+            max_duration_seconds: Overrides config.max_duration_seconds
+        """
+        if self.recorder is None:
+            self.recorder = SessionRecorder(
+                directory,
+                name or self.id or str(id(self)),
+                max_duration_seconds=(
+                    max_duration_seconds or self.config.max_duration_seconds or 1800
+                ),
+            )
+            self.audio_output.recorder = self.recorder
+            if self._audio_processor is not None:
+                self._audio_processor.recorder = self.recorder
+        return self.recorder
+
+    def stats(self) -> Dict:
+        """Audio, event bus and recording stats for this session"""
+        stats = {
+            "audio_output": self.audio_output.stats(),
+            "bus": self.bus.stats(),
+            "outbound": self.outbound.stats(),
+            "connection": {
+                "reconnects": self.reconnects,
+                "reconnect_failures": self.reconnect_failures,
+                "recovery": self.recovery.snapshot(),
+            },
+        }
+        if self._audio_processor is not None:
+            stats["audio_input"] = self._audio_processor.stats()
+        if self.recorder is not None:
+            stats["recording"] = self.recorder.stats()
+        return stats
+
+    @property
+    def closed(self) -> bool:
+        """Whether the session was closed or lost for good; it can't be used again"""
+        return self._closing or self._lost
+
+    @property
+    def connected(self) -> bool:
+        """Whether the upstream WebSocket is open"""
+        return self.ws is not None and self.ws.close_code is None
+
+    async def start(self):
+        """Start the receive and writer tasks for an initialized session"""
+        if self._tasks:
+            return
+        if self.connected:
+            self.outbound.ready.set()
+        self._tasks = [
+            asyncio.create_task(self._receive_loop()),
+            asyncio.create_task(self.outbound.run()),
+        ]
+
+    async def send_event(self, event: Dict):
+        """Queue a client event for the Realtime API"""
+        self.outbound.put_event(event)
+
+    async def send_audio(self, pcm: bytes) -> bool:
+        """
+        Queue 24kHz PCM16 mono audio for the input audio buffer.
+
+        Returns:
+            bool: False if the chunk was dropped because the upstream
+            link is too far behind (see OutboundWriter)
+        """
+        return self.outbound.put_audio(pcm)
+
+    def events(self, types: Iterable[str] = ("*",), maxsize: int = 256) -> Subscription:
+        """
+        Subscribe to this session's events, e.g.
+            async for event in session.events(["response.audio_transcript.done"]):
+                print(event.data["transcript"])
+        The loop ends once the session is closed.
+        """
+        return self.bus.subscribe(types, maxsize=maxsize)
+
+    async def _receive_loop(self):
+        """Dispatch upstream events, reconnecting whenever the socket drops"""
+        while not self._closing:
+            ws = self.ws
+            if ws is not None:
+                try:
+                    async for message in ws:
+                        if not isinstance(message, str):
+                            continue
+                        try:
+                            await self.event_handler.handle_message(message)
+                        except Exception as e:
+                            print(f"[error] Failed to handle event: {e!r}")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"[error] Upstream connection lost: {e}")
+            if self._closing or not await self.reconnect():
+                break
+
+    async def close(self):
+        """
+        Stop the session's tasks, close the WebSocket, end every event
+        subscription and finalize any recording
+        """
+        self._closing = True
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.bus.close()
+        if self.ws:
+            await self.ws.close()
+        if self.recorder is not None:
+            self.recorder.close()
 
     async def initialize(self):
         """
@@ -74,15 +283,96 @@ class RealtimeSession:
             # 2. Store session details
             self.id = session_data["id"]
             self.token = session_data["client_secret"]["value"]
+            self.token_expires_at = session_data["client_secret"].get("expires_at")
 
             # 3. Connect to WebSocket using the ephemeral token
             await self._setup_websocket(token=self.token)
         except Exception as e:
             raise RuntimeError(f"Failed to initialize realtime session: {e}")
 
+    async def reconnect(self) -> bool:
+        """
+        Recover from a dropped upstream connection.
+
+        A Realtime session ends with its WebSocket, so a new one is created
+        (with the same tools and audio settings) and brought up to date
+        from local state: the current phase's instructions and a recap of
+        observations and recent turns. Attempts back off exponentially with
+        jitter until RECONNECT_DEADLINE has passed.
+
+        Returns:
+            bool: True once the conversation has resumed
+        """
+        if self._closing:
+            return False
+        self.outbound.ready.clear()
+        start = time.perf_counter()
+        deadline = start + self.RECONNECT_DEADLINE
+        lost_session = self.id
+        if self.ws is not None:
+            try:
+                await self.ws.close()
+            except Exception:
+                pass
+            self.ws = None
+        # Whatever was streaming belonged to the lost session
+        self.audio_output.interrupt()
+        self.event_handler.function_calls.clear()
+
+        delay = self.RECONNECT_BASE_DELAY
+        attempt = 0
+        while not self._closing:
+            attempt += 1
+            try:
+                await asyncio.wait_for(
+                    self._resume(), timeout=max(0.0, deadline - time.perf_counter())
+                )
+            except Exception as e:
+                print(f"[warn] Reconnect attempt {attempt} failed: {e!r}")
+                if self.ws is not None:
+                    await self.ws.close()
+                    self.ws = None
+            else:
+                recovery_ms = (time.perf_counter() - start) * 1000
+                self.recovery.record(recovery_ms)
+                self.outbound.ready.set()
+                self.reconnects += 1
+                print(
+                    f"[info] Resumed session {lost_session} as {self.id} "
+                    f"in {recovery_ms:.0f} ms after {attempt} attempt(s)"
+                )
+                self.bus.publish("session.resumed", {
+                    "previous_session_id": lost_session,
+                    "session_id": self.id,
+                    "attempts": attempt,
+                    "recovery_ms": recovery_ms
+                })
+                return True
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay * random.uniform(0.5, 1.0), remaining))
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+        self.reconnect_failures += 1
+        self._lost = True
+        print(f"[error] Could not resume session {lost_session} after {attempt} attempt(s)")
+        self.bus.publish("session.lost", {"session_id": lost_session, "attempts": attempt})
+        return False
+
+    async def _resume(self):
+        """Create and connect a replacement session, then restore context"""
+        await self.initialize()
+        if not self.connected:
+            raise RuntimeError("WebSocket not connected")
+        # Sent ahead of anything queued while disconnected
+        for event in resume_events(self):
+            await self.ws.send(codec.dumps(event))
+
     async def _create_realtime_session(self) -> Dict:
         """
-        Calls POST https://api.openai.com/v1/realtime/sessions to create a session.
+        Calls POST {api_base}/realtime/sessions to create a session.
         Returns the JSON of the created session, e.g.:
         {
           "id": "sess_001",
@@ -91,32 +381,28 @@ class RealtimeSession:
           "client_secret": {"value": "...", ...}
         }
         """
-        url = "https://api.openai.com/v1/realtime/sessions"
-        
-        # Build the request JSON according to the Beta docs
-        # (You can adapt or add fields if needed, e.g. modalities, tools, etc.)
-        body = {
-            "model": "gpt-4o-realtime-preview-2024-12-17",
-            "modalities": ["audio", "text"],
-            "voice": self.config.voice,
-            "instructions": self._build_instructions(),
-            "tools": [self.conversation_tool_definition()]
-        }
-        
+        url = f"{self.api_base}/realtime/sessions"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "OpenAI-Beta": "realtime=v1",
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=body) as resp:
+        # Pooled client: reuses kept-alive TLS connections across sessions
+        http = await self.http.get()
+        for attempt in range(self.MAX_THROTTLED_RETRIES + 1):
+            # Queues behind other sessions while the API's limit is used up
+            await self.admission.admit_session()
+            async with http.post(url, headers=headers, data=self.payloads.create_body) as resp:
+                self.admission.on_session_response(resp.status, resp.headers)
+                if resp.status == 429 and attempt < self.MAX_THROTTLED_RETRIES:
+                    continue
                 if resp.status != 200:
                     text_error = await resp.text()
                     raise RuntimeError(
                         f"Failed to create Realtime session: {resp.status} {text_error}"
                     )
-                return await resp.json()
+                return await resp.json(loads=codec.loads)
 
     def _build_instructions(self) -> str:
         """
@@ -124,48 +410,23 @@ class RealtimeSession:
         if necessary. For now, it simply returns the raw instructions
         defined in the config.
         """
-        return self.config.system_instructions or ""
+        return build_instructions(self.config)
 
     def conversation_tool_definition(self) -> Dict:
         """
         Build a single tool (function) definition for the Realtime session creation.
         In the new Realtime Beta, each tool is an object in a 'tools' array.
-        For example:
-          {
-            "type": "function",
-            "name": "conversation_tool",
-            "description": "Handles conversation tool calls from the AI",
-            "parameters_schema": {...}
-          }
-        """
-        return {
-            "type": "function",
-            "name": "conversation_tool",
-            "description": "Handle conversation tool function calls from the AI",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "action": {
-                        "type": "string",
-                        "enum": ["observe", "transition", "complete"]
-                    },
-                    "observations": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "transition_to": {"type": "string"},
-                    "completion_notes": {"type": "string"}
-                },
-                "required": ["action"]
-            }
-        }
+        """
+        return conversation_tool_definition()
 
-    async def _setup_websocket(self, token: str):
+    async def _setup_websocket(self, token: str, configure: bool = False):
         """
-        Connect to wss://api.openai.com/v1/realtime
-        using the API key.
+        Connect to the Realtime WebSocket ({api_base}/realtime over ws or
+        wss) using the ephemeral token. The session was configured by the
+        create request, so the configuration is only sent again when
+        `configure` is set.
         """
-        ws_url = "wss://api.openai.com/v1/realtime"
+        ws_url = "ws" + self.api_base[len("http"):] + "/realtime"
         
         headers = {
             "Authorization": f"Bearer {token}",
@@ -180,33 +441,8 @@ class RealtimeSession:
                 ping_timeout=20
             )
             print(f"[info] WebSocket connected for session {self.id}")
-            
-            # Send initial session update matching the API's structure
-            update_message = {
-                "type": "session.update",
-                "session": {
-                    "model": "gpt-4o-realtime-preview-2024-12-17",
-                    "modalities": ["audio", "text"],
-                    "voice": self.config.voice,
-                    "instructions": self._build_instructions(),
-                    "tools": [self.conversation_tool_definition()],
-                    "input_audio_format": "pcm16",
-                    "output_audio_format": "pcm16"
-                }
-            }
-            await self.ws.send(json.dumps(update_message))
-            print("[debug] Sent session update message")
-            
-            # Then send audio format confirmation
-            audio_config = {
-                "type": "input_audio_buffer.append",
-                "format": "pcm16",
-                "sample_rate": 24000,
-                "channels": 1
-            }
-            await self.ws.send(json.dumps(audio_config))
-            print("[debug] Sent audio format config")
-            
+            if configure:
+                await self.ws.send(self.payloads.update_message)
         except Exception as e:
             print(f"[error] Failed to connect to WebSocket: {e}")
             self.ws = None
@@ -231,6 +467,10 @@ class RealtimeSession:
                     self.phase_manager.current_phase,
                     obs
                 )
+                self.bus.publish("observation.added", {
+                    "phase": self.phase_manager.current_phase,
+                    "observation": obs
+                })
             response["observations_added"] = len(observations)
             
         elif action == "transition":
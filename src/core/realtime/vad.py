@@ -0,0 +1,163 @@
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """
+    Energy and zero-crossing voice activity gate for PCM16 chunks.
+
+    Each chunk is split into short frames and classified in one vectorized
+    pass. A frame is voiced when its energy clears the threshold and its
+    zero-crossing rate is below `zcr_max` (broadband hiss crosses zero far
+    more often than voiced speech), or when it is loud enough to be speech
+    regardless of ZCR (so fricatives still open the gate). The threshold
+    tracks an adaptive noise floor.
+
+    Suppressed chunks are kept in a pre-roll buffer and released in front of
+    the chunk that opens the gate, so speech onsets are not clipped. After
+    speech ends the gate stays open for `hangover_ms`. Keep the hangover
+    longer than the server's turn_detection silence_duration_ms (500ms by
+    default), otherwise server VAD never hears the silence that ends a turn.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 24000,
+        frame_ms: float = 10.0,
+        energy_threshold_db: float = -50.0,
+        snr_margin_db: float = 12.0,
+        loud_margin_db: float = 12.0,
+        zcr_max: float = 0.25,
+        min_voiced_ratio: float = 0.2,
+        hangover_ms: float = 700.0,
+        preroll_ms: float = 300.0,
+        noise_floor_rise: float = 0.005,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_samples = int(sample_rate * frame_ms / 1000)
+        self.energy_threshold_db = energy_threshold_db
+        self.snr_margin_db = snr_margin_db
+        self.loud_margin_db = loud_margin_db
+        self.zcr_max = zcr_max
+        self.min_voiced_ratio = min_voiced_ratio
+        self.hangover_samples = int(sample_rate * hangover_ms / 1000)
+        self.preroll_samples = int(sample_rate * preroll_ms / 1000)
+        self.noise_floor_rise = noise_floor_rise
+
+        self.noise_floor_db = energy_threshold_db - snr_margin_db
+        self.active = False
+        self._hangover_left = 0
+        self._preroll: Deque[bytes] = deque()
+        self._preroll_buffered = 0
+        self._work = np.empty(0, dtype=np.float32)
+
+        self.chunks_total = 0
+        self.chunks_suppressed = 0
+        self.samples_total = 0
+        self.samples_suppressed = 0
+
+    def is_speech(self, samples: np.ndarray) -> bool:
+        """Classify one chunk of int16 samples"""
+        frames = len(samples) // self.frame_samples
+        if frames == 0:
+            return False
+        used = frames * self.frame_samples
+        if len(self._work) < used:
+            self._work = np.empty(used, dtype=np.float32)
+        work = self._work[:used]
+        np.multiply(
+            samples[:used], np.float32(1.0 / 32768.0), out=work, dtype=np.float32
+        )
+        framed = work.reshape(frames, self.frame_samples)
+
+        power = np.einsum("ij,ij->i", framed, framed) / self.frame_samples
+        energy_db = 10.0 * np.log10(power + 1e-10)
+        crossings = np.count_nonzero(np.diff(np.signbit(framed), axis=1), axis=1)
+        zcr = crossings / self.frame_samples
+
+        threshold = max(
+            self.energy_threshold_db, self.noise_floor_db + self.snr_margin_db
+        )
+        voiced = ((energy_db > threshold) & (zcr < self.zcr_max)) | (
+            energy_db > threshold + self.loud_margin_db
+        )
+
+        # Noise floor falls immediately and rises slowly (about 2s time
+        # constant with 10ms frames), so it follows the quietest recent frames
+        quietest = float(energy_db.min())
+        if quietest < self.noise_floor_db:
+            self.noise_floor_db = quietest
+        else:
+            rise = 1.0 - (1.0 - self.noise_floor_rise) ** frames
+            self.noise_floor_db += rise * (quietest - self.noise_floor_db)
+
+        return np.count_nonzero(voiced) >= max(1, int(frames * self.min_voiced_ratio))
+
+    def gate(
+        self, samples: np.ndarray, chunk: Optional[bytes] = None
+    ) -> Optional[bytes]:
+        """
+        Decide whether a chunk goes upstream.
+
+        Args:
+            samples: int16 samples of the chunk
+            chunk: The same audio as bytes, if the caller already has it
+
+        Returns:
+            Optional[bytes]: Audio to send (including any released pre-roll),
+            or None if the chunk is suppressed
+        """
+        if chunk is None:
+            chunk = samples.tobytes()
+        count = len(samples)
+        self.chunks_total += 1
+        self.samples_total += count
+
+        if self.is_speech(samples):
+            self._hangover_left = self.hangover_samples
+            if not self.active:
+                self.active = True
+                if self._preroll:
+                    self.chunks_suppressed -= len(self._preroll)
+                    self.samples_suppressed -= self._preroll_buffered
+                    chunk = b"".join(self._preroll) + chunk
+                    self._preroll.clear()
+                    self._preroll_buffered = 0
+            return chunk
+
+        if self.active and self._hangover_left > 0:
+            self._hangover_left -= count
+            return chunk
+
+        self.active = False
+        self.chunks_suppressed += 1
+        self.samples_suppressed += count
+        self._preroll.append(chunk)
+        self._preroll_buffered += count
+        # Keep just enough whole chunks to cover preroll_samples
+        while self._preroll:
+            oldest = len(self._preroll[0]) // 2
+            if self._preroll_buffered - oldest < self.preroll_samples:
+                break
+            self._preroll.popleft()
+            self._preroll_buffered -= oldest
+        return None
+
+    @property
+    def suppression_ratio(self) -> float:
+        """Fraction of input audio that was not sent upstream"""
+        if not self.samples_total:
+            return 0.0
+        return self.samples_suppressed / self.samples_total
+
+    def stats(self) -> Dict:
+        """Gate counters and the current suppression ratio"""
+        return {
+            "active": self.active,
+            "chunks_total": self.chunks_total,
+            "chunks_suppressed": self.chunks_suppressed,
+            "suppression_ratio": self.suppression_ratio,
+            "noise_floor_db": self.noise_floor_db,
+        }
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import ssl
+from typing import Optional, Union
+
+import aiohttp
+
+
+class SharedHttpClient:
+    """
+    Process-wide aiohttp client with keep-alive connection pooling and a
+    DNS cache, so creating a session reuses warm TCP/TLS connections to the
+    API instead of handshaking every time.
+
+    The underlying ClientSession is created on first use inside the running
+    event loop (and again if it was closed or the loop changed, after
+    releasing the old one), and must be closed on shutdown with `close()`.
+
+    Limits default from the environment:
+        HTTP_POOL_LIMIT           total connections (100)
+        HTTP_POOL_LIMIT_PER_HOST  connections per host (50)
+        HTTP_DNS_CACHE_SECONDS    DNS cache TTL (300)
+        HTTP_KEEPALIVE_SECONDS    idle connection lifetime (30)
+        HTTP_TIMEOUT_SECONDS      total request timeout (30)
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        dns_cache_seconds: Optional[int] = None,
+        keepalive_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+        ssl_context: Union[ssl.SSLContext, bool, None] = None,
+    ):
+        self.limit = limit or int(os.getenv("HTTP_POOL_LIMIT", "100"))
+        self.limit_per_host = limit_per_host or int(
+            os.getenv("HTTP_POOL_LIMIT_PER_HOST", "50")
+        )
+        self.dns_cache_seconds = dns_cache_seconds or int(
+            os.getenv("HTTP_DNS_CACHE_SECONDS", "300")
+        )
+        self.keepalive_seconds = keepalive_seconds or float(
+            os.getenv("HTTP_KEEPALIVE_SECONDS", "30")
+        )
+        self.timeout_seconds = timeout_seconds or float(
+            os.getenv("HTTP_TIMEOUT_SECONDS", "30")
+        )
+        self.ssl_context = ssl_context
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get(self) -> aiohttp.ClientSession:
+        """The pooled ClientSession for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None:
+                await self._release(self._session, self._loop)
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_seconds,
+                keepalive_timeout=self.keepalive_seconds,
+                ssl=self.ssl_context if self.ssl_context is not None else True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+            )
+            self._loop = loop
+        return self._session
+
+    @staticmethod
+    async def _release(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a session created on another event loop"""
+        if session.closed:
+            return
+        if loop is not None and not loop.is_closed():
+            # Its connections belong to that loop, so close them there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # The loop's transports are already gone; just mark both closed
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            await connector.close()
+
+    async def close(self):
+        """Close pooled connections; the next `get()` starts a new pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+# Default client shared by every RealtimeSession in the process
+http_client = SharedHttpClient()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyStats:
+    """
+    Rolling latency statistics in milliseconds.
+
+    Percentiles are computed over the most recent `window` samples; count,
+    mean and max cover everything recorded since creation.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        """Record one latency sample"""
+        self._samples.append(latency_ms)
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile (0-100) over the recent window"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, float]:
+        """Summary suitable for logging or a metrics endpoint"""
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+
+class LoopLagMonitor:
+    """
+    Event loop lag: how late a periodic timer fires. Anything that blocks
+    the loop (CPU-heavy callbacks, synchronous I/O, too many sessions per
+    worker) shows up here before it shows up as audio latency.
+    """
+
+    def __init__(self, interval: float = 0.05, window: int = 1024):
+        self.interval = interval
+        self.lag = LatencyStats(window)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag.record(max(0.0, loop.time() - start - self.interval) * 1000)
+
+    def snapshot(self) -> Dict[str, float]:
+        return self.lag.snapshot()
+
+
+# The API process's monitor; started by the app's lifespan
+loop_lag = LoopLagMonitor()
+
+
+def process_stats() -> Dict[str, float]:
+    """CPU time and resident memory of this process"""
+    rss_bytes = 0
+    try:
+        with open("/proc/self/statm") as statm:
+            rss_bytes = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+
+            # Peak rather than current RSS where /proc isn't available
+            rss_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except ImportError:
+            pass
+    return {
+        "cpu_seconds": time.process_time(),
+        "rss_mb": rss_bytes / (1024 * 1024),
+    }
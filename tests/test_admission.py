@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.realtime.admission import (
+    DEFAULT_RETRY_AFTER_SECONDS,
+    AdmissionScheduler,
+    TokenBucket,
+    parse_duration,
+    retry_after,
+)
+
+
+@pytest.mark.parametrize("value,seconds", [
+    ("1s", 1.0),
+    ("6m0s", 360.0),
+    ("20ms", 0.02),
+    ("1h2m3.5s", 3723.5),
+    ("2.5", 2.5),
+    ("", None),
+    (None, None),
+    ("soon", None),
+])
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == (pytest.approx(seconds) if seconds is not None else None)
+
+
+def test_retry_after_prefers_milliseconds():
+    assert retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    assert retry_after({"retry-after": "3"}) == 3.0
+    assert retry_after({"retry-after-ms": "x"}) == DEFAULT_RETRY_AFTER_SECONDS
+    assert retry_after({}) == DEFAULT_RETRY_AFTER_SECONDS
+
+
+def test_unshaped_bucket_admits_everything():
+    bucket = TokenBucket()
+    assert all(bucket.try_acquire() for _ in range(1000))
+
+
+def test_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=100.0, capacity=2)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    time.sleep(0.02)
+    assert bucket.try_acquire()
+
+
+def test_acquire_waits_for_tokens_in_order():
+    async def run():
+        bucket = TokenBucket(rate=100.0, capacity=1)
+        order = []
+
+        async def take(n):
+            await bucket.acquire()
+            order.append(n)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(take(n) for n in range(4)))
+        return order, time.perf_counter() - start, bucket
+
+    order, elapsed, bucket = asyncio.run(run())
+    assert order == [0, 1, 2, 3]
+    assert elapsed >= 0.025
+    assert bucket.admitted == 4 and bucket.waiting == 0
+    assert bucket.wait.count == 4
+
+
+def test_pause_blocks_even_an_unshaped_bucket():
+    bucket = TokenBucket()
+    bucket.pause(0.05)
+    assert not bucket.try_acquire()
+    assert bucket.stats()["paused_seconds"] > 0
+    time.sleep(0.06)
+    assert bucket.try_acquire()
+
+
+def test_observe_learns_limit_and_lower_remaining_wins():
+    bucket = TokenBucket()
+    bucket.observe(limit=120, remaining=3)
+    assert bucket.rate == 2.0 and bucket.capacity == 120
+    assert bucket.tokens == pytest.approx(3, abs=0.1)
+    bucket.observe(limit=120, remaining=100)  # Ours is lower, keep it
+    assert bucket.tokens < 4
+    bucket.observe(limit=120, remaining=0)
+    assert bucket.tokens == 0
+    bucket.observe(limit=0, remaining=0)  # Ignored
+    assert bucket.rate == 2.0
+
+
+def test_scheduler_feeds():
+    scheduler = AdmissionScheduler()
+    scheduler.on_rate_limits([
+        {"name": "requests", "limit": 600, "remaining": 10},
+        {"name": "tokens", "limit": 1000, "remaining": 0, "reset_seconds": 0.5},
+        {"name": "requests"},  # Incomplete entries are skipped
+    ])
+    assert scheduler.responses.rate == 10.0
+    assert scheduler.responses.throttled == 1
+    assert not scheduler.responses.try_acquire()
+
+    scheduler.on_session_response(
+        429, {"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "0",
+              "retry-after-ms": "100"}
+    )
+    sessions = scheduler.sessions.stats()
+    assert sessions["rate_per_minute"] == 60
+    assert sessions["throttled"] == 1
+    assert 0 < sessions["paused_seconds"] <= 0.1
+
+    scheduler.on_error({"code": "rate_limit_exceeded"})
+    assert scheduler.responses.throttled == 2
+
+
+@pytest.mark.parametrize("rate_limits", [
+    None,
+    "requests",
+    {"name": "requests", "limit": 600, "remaining": 10},
+    ["requests", 5, None],
+    [{"name": "requests", "limit": "600", "remaining": "10"}],
+    [{"name": "requests", "limit": True, "remaining": 10}],
+])
+def test_malformed_rate_limits_are_ignored(rate_limits):
+    scheduler = AdmissionScheduler()
+    scheduler.on_rate_limits(rate_limits)
+    assert scheduler.responses.rate is None
+    assert scheduler.responses.try_acquire()
+
+
+def test_malformed_errors_are_ignored():
+    scheduler = AdmissionScheduler()
+    scheduler.on_error("rate_limit_exceeded")
+    scheduler.on_error(None)
+    assert scheduler.responses.throttled == 0
+
+
+def test_limits_from_environment(monkeypatch):
+    monkeypatch.setenv("REALTIME_SESSIONS_PER_MINUTE", "30")
+    scheduler = AdmissionScheduler(responses_per_minute=120)
+    assert scheduler.sessions.rate == 0.5
+    assert scheduler.responses.rate == 2.0
@@ -0,0 +1,103 @@
+import asyncio
+
+import numpy as np
+
+from src.core.realtime.audio import RealtimeAudioProcessor
+from src.core.realtime.formats import AudioFormat
+from src.core.realtime.vad import VoiceActivityDetector
+
+
+def tone(rate: int, milliseconds: int, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(rate * milliseconds // 1000) / rate
+    return amplitude * np.sin(2 * np.pi * 440 * t)
+
+
+def pcm16(samples: np.ndarray) -> bytes:
+    return (samples * 32767).astype("<i2").tobytes()
+
+
+def process_all(processor: RealtimeAudioProcessor, chunks) -> bytes:
+    async def run():
+        out = []
+        for chunk in chunks:
+            processed = await processor.process_chunk(chunk)
+            if processed:
+                out.append(processed)
+        return b"".join(out)
+    return asyncio.run(run())
+
+
+def split(data: bytes, sizes) -> list:
+    chunks, start = [], 0
+    for size in sizes:
+        chunks.append(data[start:start + size])
+        start += size
+    chunks.append(data[start:])
+    return chunks
+
+
+class Recorder:
+    def __init__(self):
+        self.input = b""
+
+    def record_input(self, pcm: bytes):
+        self.input += pcm
+
+
+def test_passthrough_sends_whole_samples_only():
+    data = pcm16(tone(24000, 100))
+    processor = RealtimeAudioProcessor()
+    processor.recorder = recorder = Recorder()
+    chunks = split(data, [101, 1, 333, 2, 999])
+    out = process_all(processor, chunks)
+    assert out == data
+    assert recorder.input == data
+
+
+def test_odd_chunk_is_held_until_completed():
+    processor = RealtimeAudioProcessor()
+
+    async def run():
+        first = await processor.process_chunk(b"\x01\x02\x03")
+        second = await processor.process_chunk(b"\x04")
+        return first, second
+    assert asyncio.run(run()) == (b"\x01\x02", b"\x03\x04")
+
+
+def test_byte_at_a_time_produces_nothing_until_a_frame_completes():
+    processor = RealtimeAudioProcessor()
+    assert process_all(processor, [b"\x01"]) == b""
+    assert process_all(processor, [b"\x02"]) == b"\x01\x02"
+
+
+def test_split_frames_resample_like_whole_chunks():
+    fmt = AudioFormat("float32", channels=2, sample_rate=48000)
+    mono = tone(48000, 100)
+    data = np.stack([mono, mono], axis=1).astype("<f4").tobytes()
+
+    whole = RealtimeAudioProcessor(input_format=fmt)
+    chunked = RealtimeAudioProcessor(input_format=fmt)
+    expected = process_all(whole, [data[:3840], data[3840:]])
+    # Splits inside a sample and inside a frame
+    out = process_all(chunked, split(data, [3, 3838, 5, 1001]))
+    assert out == expected
+
+
+def test_configure_input_drops_the_held_back_bytes():
+    processor = RealtimeAudioProcessor()
+    process_all(processor, [b"\x01"])
+    processor.configure_input(AudioFormat())
+    assert process_all(processor, [b"\x02\x03"]) == b"\x02\x03"
+
+
+def test_g711_input_is_decoded_to_pcm16():
+    processor = RealtimeAudioProcessor(input_format=AudioFormat("g711_ulaw", sample_rate=24000))
+    # 0xFF is mu-law zero
+    assert process_all(processor, [b"\xff" * 10]) == b"\x00\x00" * 10
+
+
+def test_vad_gate_drops_silence():
+    processor = RealtimeAudioProcessor(vad=VoiceActivityDetector(preroll_ms=0))
+    assert process_all(processor, [b"\x00" * 960]) == b""
+    speech = pcm16(tone(24000, 20))
+    assert process_all(processor, [speech]) == speech
@@ -0,0 +1,105 @@
+import asyncio
+
+from src.core.realtime import bus as bus_module
+from src.core.realtime.bus import EventBus
+from src.core.realtime.queues import DropPolicy
+
+
+def drain(subscription):
+    async def collect():
+        return [event.type async for event in subscription]
+
+    return asyncio.run(collect())
+
+
+def test_routes_exact_family_and_wildcard():
+    bus = EventBus()
+    exact = bus.subscribe(["response.done"])
+    family = bus.subscribe(["response."])
+    everything = bus.subscribe()
+    for event_type in ("response.done", "response.created", "session.updated"):
+        bus.publish(event_type, {})
+    bus.close()
+    assert drain(exact) == ["response.done"]
+    assert drain(family) == ["response.done", "response.created"]
+    assert drain(everything) == ["response.done", "response.created", "session.updated"]
+
+
+def test_publish_without_subscribers():
+    bus = EventBus()
+    assert not bus.has_subscribers("response.done")
+    assert bus.publish("response.done", {}) == 0
+    assert bus.published == 0
+
+
+def test_route_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(bus_module, "MAX_CACHED_ROUTES", 8)
+    bus = EventBus()
+    bus.subscribe(["response."])
+    for index in range(100):
+        bus.publish(f"unwatched.{index}", {})
+    assert bus._routes == {}
+    for index in range(100):
+        assert bus.publish(f"response.{index}", {}) == 1
+    assert 0 < len(bus._routes) <= 8
+
+
+def test_drop_oldest_counts_delivered_and_dropped():
+    bus = EventBus()
+    subscription = bus.subscribe(maxsize=2, drop_policy=DropPolicy.DROP_OLDEST)
+    for event_type in ("a", "b", "c"):
+        bus.publish(event_type, {})
+    assert subscription.delivered == 3
+    assert subscription.dropped == 1
+    bus.close()
+    # Room is made for the end of the stream
+    assert drain(subscription) == ["c"]
+
+
+def test_drop_newest_counts_only_enqueued():
+    bus = EventBus()
+    subscription = bus.subscribe(maxsize=2, drop_policy=DropPolicy.DROP_NEWEST)
+    for event_type in ("a", "b", "c"):
+        bus.publish(event_type, {})
+    assert subscription.delivered == 2
+    assert subscription.dropped == 1
+    assert subscription.stats()["queue_depth"] == 2
+
+
+def test_close_ends_waiting_iteration():
+    async def run():
+        bus = EventBus()
+        subscription = bus.subscribe()
+        received = []
+
+        async def consume():
+            async for event in subscription:
+                received.append(event.type)
+
+        consumer = asyncio.create_task(consume())
+        bus.publish("a", {})
+        await asyncio.sleep(0)
+        bus.close()
+        await asyncio.wait_for(consumer, 1)
+        return received, bus
+
+    received, bus = asyncio.run(run())
+    assert received == ["a"]
+    assert bus.publish("b", {}) == 0
+
+
+def test_subscription_close_unsubscribes_and_ends():
+    bus = EventBus()
+    subscription = bus.subscribe()
+    bus.publish("a", {})
+    subscription.close()
+    assert bus.publish("b", {}) == 0
+    assert drain(subscription) == ["a"]
+    # Stays ended for later reads
+    assert drain(subscription) == []
+
+
+def test_subscribe_after_close_ends_immediately():
+    bus = EventBus()
+    bus.close()
+    assert drain(bus.subscribe()) == []
@@ -0,0 +1,63 @@
+import pytest
+
+from src.core.realtime.codec import JsonCodec, get_codec
+
+
+def available_codecs():
+    codecs = [JsonCodec()]
+    for name in ("orjson", "msgspec"):
+        try:
+            codecs.append(get_codec(name))
+        except ValueError:
+            pass
+    return codecs
+
+
+@pytest.fixture(params=available_codecs(), ids=lambda codec: codec.name)
+def codec(request):
+    return request.param
+
+
+def test_round_trip_is_compact_text(codec):
+    event = {"type": "response.create", "response": {"modalities": ["audio", "text"]}}
+    frame = codec.dumps(event)
+    assert isinstance(frame, str)
+    assert " " not in frame
+    assert codec.loads(frame) == event
+    assert codec.loads(frame.encode()) == event
+
+
+def test_invalid_frame_raises_value_error(codec):
+    with pytest.raises(ValueError):
+        codec.loads("{not json")
+
+
+@pytest.mark.parametrize("frame", [
+    '{"type":"response.audio.delta","delta":"AAAA"}',
+    '{ "type" : "response.audio.delta", "delta": "AAAA"}',
+    '\n{\n  "type": "response.audio.delta"\n}',
+])
+def test_peek_type_first_key(codec, frame):
+    assert codec.peek_type(frame) == "response.audio.delta"
+    assert codec.peek_type(frame.encode()) == "response.audio.delta"
+
+
+def test_peek_type_ignores_nested_type():
+    # The first "type" in the frame is the item's, not the event's
+    frame = '{"event_id":"e1","item":{"type":"message"},"type":"conversation.item.created"}'
+    assert JsonCodec().peek_type(frame) is None
+
+
+def test_peek_type_nested_type_never_misreported(codec):
+    frame = '{"item":{"type":"function_call"},"type":"conversation.item.created"}'
+    assert codec.peek_type(frame) in (None, "conversation.item.created")
+
+
+def test_peek_type_escaped_value_falls_back():
+    assert JsonCodec().peek_type('{"type":"a\\"b"}') is None
+
+
+def test_get_codec_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+    assert get_codec("json").name == "json"
@@ -0,0 +1,75 @@
+import pytest
+from pydantic import ValidationError
+
+from src.core.config.models import FRAME_PROFILES, ConversationConfig, ConversationPhase
+
+
+def make_config(**overrides):
+    fields = dict(
+        name="Test",
+        goal="Test the config",
+        initial_phase="start",
+        system_instructions="",
+        phases={
+            "start": ConversationPhase(
+                name="Start",
+                instructions="Say hello.",
+                success_criteria=[],
+                required_observations=[],
+                next_phases=[],
+                max_duration_seconds=None,
+                completion_rules={},
+            )
+        },
+        max_duration_seconds=None,
+        completion_criteria={},
+    )
+    fields.update(overrides)
+    return ConversationConfig(**fields)
+
+
+def test_defaults_to_balanced_profile():
+    config = make_config()
+    assert config.frame_profile == "balanced"
+    assert config.frame_settings() == FRAME_PROFILES["balanced"]
+
+
+@pytest.mark.parametrize("profile", sorted(FRAME_PROFILES))
+def test_known_profiles(profile):
+    settings = make_config(frame_profile=profile).frame_settings()
+    assert settings is FRAME_PROFILES[profile]
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValidationError, match="Unknown frame_profile"):
+        make_config(frame_profile="ultra")
+
+
+@pytest.mark.parametrize("frame_ms", [10, 20, 40, 1000])
+def test_valid_frame_ms(frame_ms):
+    assert make_config(frame_ms=frame_ms).frame_settings().frame_ms == frame_ms
+
+
+@pytest.mark.parametrize("frame_ms", [0, 5, 15, 25, 1010, -20])
+def test_invalid_frame_ms_rejected(frame_ms):
+    with pytest.raises(ValidationError, match="multiple of 10"):
+        make_config(frame_ms=frame_ms)
+
+
+def test_frame_ms_overrides_only_the_frame_size():
+    settings = make_config(frame_profile="low_latency", frame_ms=40).frame_settings()
+    assert settings.frame_ms == 40
+    assert settings.name == "low_latency"
+    assert settings.capture_queue_frames == FRAME_PROFILES["low_latency"].capture_queue_frames
+    # The shared profile is left untouched
+    assert FRAME_PROFILES["low_latency"].frame_ms == 20
+
+
+@pytest.mark.parametrize("frame_ms,rate,samples", [(20, 24000, 480), (20, 8000, 160), (100, 48000, 4800)])
+def test_samples_per_frame(frame_ms, rate, samples):
+    assert make_config(frame_ms=frame_ms).frame_settings().samples(rate) == samples
+
+
+def test_extra_fields_forbidden():
+    with pytest.raises(ValidationError):
+        make_config(frame_size=20)
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from src.core.realtime import events as events_module
+from src.core.realtime.events import RealtimeEventHandler, handles
+
+
+class Bus:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, event_type, payload):
+        self.published.append((event_type, payload))
+
+    def has_subscribers(self, event_type):
+        return False
+
+
+class AudioOutput:
+    def __init__(self):
+        self.requested = 0
+
+    def on_response_created(self, event):
+        pass
+
+    def on_response_done(self, event):
+        pass
+
+    def mark_response_requested(self):
+        self.requested += 1
+
+
+class Session:
+    """The parts of RealtimeSession the handler uses for function calls"""
+
+    def __init__(self):
+        self.sent = []
+        self.bus = Bus()
+        self.audio_output = AudioOutput()
+        self.tool_calls = []
+
+    async def send_event(self, event):
+        self.sent.append(event)
+
+    async def conversation_tool(self, arguments):
+        self.tool_calls.append(arguments)
+        return {"status": "success"}
+
+
+def function_call(call_id, arguments, response_id="resp_1"):
+    ids = {"call_id": call_id, "response_id": response_id}
+    return [
+        {
+            "type": "response.output_item.added",
+            "response_id": response_id,
+            "item": {"type": "function_call", "call_id": call_id, "name": "conversation_tool"},
+        },
+        {"type": "response.function_call_arguments.delta", "delta": arguments, **ids},
+        {"type": "response.function_call_arguments.done", "arguments": arguments, **ids},
+    ]
+
+
+def run(*events):
+    session = Session()
+    handler = RealtimeEventHandler(session)
+
+    async def dispatch():
+        for event in events:
+            await handler.handle_event(event)
+
+    asyncio.run(dispatch())
+    return session, handler
+
+
+def sent_types(session):
+    return [event["type"] for event in session.sent]
+
+
+def test_one_response_create_after_several_calls():
+    observe = json.dumps({"action": "observe", "observations": ["a"]})
+    session, _ = run(
+        {"type": "response.created", "response": {"id": "resp_1"}},
+        *function_call("c1", observe),
+        *function_call("c2", observe),
+        {"type": "response.done", "response": {"id": "resp_1", "status": "completed"}},
+    )
+    # Outputs go as each call finishes; the follow-up waits for response.done
+    assert sent_types(session) == [
+        "conversation.item.create",
+        "conversation.item.create",
+        "response.create",
+    ]
+    assert [event["item"]["call_id"] for event in session.sent[:2]] == ["c1", "c2"]
+    assert session.audio_output.requested == 1
+    assert [name for name, _ in session.bus.published].count("tool.called") == 2
+
+
+def test_no_response_create_without_calls():
+    session, _ = run({"type": "response.done", "response": {"id": "resp_1", "status": "completed"}})
+    assert session.sent == []
+
+
+def test_cancelled_response_drops_unfinished_calls():
+    added, delta, _ = function_call("c1", '{"action": "observe"')
+    session, handler = run(
+        added,
+        delta,
+        {"type": "response.done", "response": {"id": "resp_1", "status": "cancelled"}},
+    )
+    assert session.sent == []
+    assert handler.function_calls.calls == {}
+
+
+def test_unknown_function_reports_error():
+    events = function_call("c1", "{}")
+    events[0]["item"]["name"] = "launch"
+    session, _ = run(*events, {"type": "response.done", "response": {"id": "resp_1"}})
+    output = json.loads(session.sent[0]["item"]["output"])
+    assert output["status"] == "error"
+    assert sent_types(session)[-1] == "response.create"
+
+
+def test_arguments_that_are_not_an_object_report_error():
+    session, _ = run(*function_call("c1", "[1, 2]"), {"type": "response.done", "response": {"id": "resp_1"}})
+    output = json.loads(session.sent[0]["item"]["output"])
+    assert output["status"] == "error"
+    assert session.tool_calls == []
+
+
+# Routing
+
+
+class Routed(RealtimeEventHandler):
+    @handles("custom.")
+    async def _custom(self, event):
+        pass
+
+    @handles("custom.special.")
+    async def _special(self, event):
+        pass
+
+    @handles("custom.exact")
+    async def _exact(self, event):
+        pass
+
+    @handles("response.done")
+    async def _handle_response_done(self, event):
+        pass
+
+    @handles("*")
+    async def _anything(self, event):
+        pass
+
+
+def test_exact_routes():
+    assert RealtimeEventHandler.resolve("response.done") is RealtimeEventHandler._handle_response_done
+    assert Routed.resolve("custom.exact") is Routed._exact
+
+
+def test_longest_prefix_wins():
+    assert Routed.resolve("custom.thing") is Routed._custom
+    assert Routed.resolve("custom.special.thing") is Routed._special
+
+
+def test_fallback_route():
+    assert Routed.resolve("made.up") is Routed._anything
+    assert RealtimeEventHandler.resolve("made.up") is RealtimeEventHandler._handle_unrouted
+
+
+def test_subclass_overrides_without_touching_base():
+    assert Routed.resolve("response.done") is Routed._handle_response_done
+    assert RealtimeEventHandler.resolve("response.done") is RealtimeEventHandler._handle_response_done
+    # Inherited routes still apply
+    assert Routed.resolve("response.created") is RealtimeEventHandler._handle_response_created
+
+
+@pytest.mark.parametrize("event_type", [
+    "input_audio_buffer.committed",
+    "conversation.item.truncated",
+    "response.output_item.done",
+])
+def test_ignored_events_route_to_nothing(event_type):
+    assert RealtimeEventHandler.resolve(event_type) is None
+
+
+def test_unknown_types_are_not_cached():
+    before = len(Routed._resolved)
+    for index in range(1000):
+        assert Routed.resolve(f"made.up.{index}") is Routed._anything
+    assert len(Routed._resolved) == before
+
+
+def test_prefix_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(events_module, "MAX_CACHED_PREFIX_TYPES", 5)
+
+    class Bounded(RealtimeEventHandler):
+        @handles("custom.")
+        async def _custom(self, event):
+            pass
+
+    for index in range(50):
+        assert Bounded.resolve(f"custom.{index}") is Bounded._custom
+    assert len(Bounded._resolved) == len(Bounded._routes) + 5
+
+
+@pytest.mark.parametrize("event_type", [5, None, ["response.done"], {"a": 1}])
+def test_non_string_types_route_to_nothing(event_type):
+    assert RealtimeEventHandler.resolve(event_type) is None
+    session, _ = run({"type": event_type})
+    assert session.sent == [] and session.bus.published == []
+
+
+def test_ignored_frames_are_not_decoded(monkeypatch):
+    def fail(message):
+        raise AssertionError("decoded")
+
+    monkeypatch.setattr(events_module.codec, "loads", fail)
+    handler = RealtimeEventHandler(Session())
+    asyncio.run(handler.handle_message('{"type":"input_audio_buffer.committed"}'))
+
+
+def test_debug_logging_is_lazy(monkeypatch, caplog):
+    summarized = []
+
+    def summarize(event):
+        summarized.append(event)
+        return event
+
+    monkeypatch.setattr(events_module, "_summarize", summarize)
+    event = {"type": "response.created", "response": {"id": "resp_1"}}
+    run(event)
+    assert summarized == []
+
+    with caplog.at_level(logging.DEBUG, logger=events_module.logger.name):
+        run(event)
+    assert summarized == [event]
+    assert "Received event response.created" in caplog.text
+
+
+def test_summarize_hides_audio():
+    summary = events_module._summarize({"type": "response.audio.delta", "delta": "A" * 1000})
+    assert summary["delta"] == "<1000 chars>"
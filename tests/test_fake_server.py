@@ -0,0 +1,132 @@
+import asyncio
+import base64
+import json
+
+import aiohttp
+import numpy as np
+
+from src.core.realtime.fake_server import FakeRealtimeServer, FakeRealtimeSettings
+
+SETTINGS = FakeRealtimeSettings(
+    session_latency_ms=0,
+    first_audio_ms=50,
+    response_audio_ms=200,
+    realtime_factor=1.0,
+    turn_ms=1000,
+    silence_ms=100,
+)
+
+
+def append(pcm: bytes) -> dict:
+    return {"type": "input_audio_buffer.append", "audio": base64.b64encode(pcm).decode()}
+
+
+def silence(ms: int) -> bytes:
+    return b"\x00\x00" * (24 * ms)
+
+
+def tone(ms: int) -> bytes:
+    t = np.arange(24 * ms) / 24000
+    return (8000 * np.sin(2 * np.pi * 300 * t)).astype(np.int16).tobytes()
+
+
+async def connect(server, http):
+    api_base = await server.start()
+    headers = {"Authorization": "Bearer test"}
+    async with http.post(f"{api_base}/realtime/sessions", json={}, headers=headers) as response:
+        token = (await response.json())["client_secret"]["value"]
+    ws = await http.ws_connect(
+        api_base.replace("http", "ws") + "/realtime",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return ws
+
+
+async def receive(ws, seconds: float) -> list:
+    events = []
+    try:
+        while True:
+            message = await asyncio.wait_for(ws.receive(), seconds)
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            events.append(json.loads(message.data))
+    except asyncio.TimeoutError:
+        pass
+    return events
+
+
+def run(scenario):
+    async def main():
+        server = FakeRealtimeServer(SETTINGS)
+        async with aiohttp.ClientSession() as http:
+            ws = await connect(server, http)
+            try:
+                return await scenario(ws)
+            finally:
+                await ws.close()
+                await server.stop()
+
+    return asyncio.run(main())
+
+
+def types(events):
+    return [event["type"] for event in events]
+
+
+def test_silence_is_not_speech():
+    async def scenario(ws):
+        await receive(ws, 0.05)  # session.created, conversation.created
+        for _ in range(20):
+            await ws.send_json(append(silence(20)))
+        return await receive(ws, 0.1)
+
+    assert run(scenario) == []
+
+
+def test_speech_then_silence_ends_the_turn():
+    async def scenario(ws):
+        await receive(ws, 0.05)
+        for _ in range(10):
+            await ws.send_json(append(tone(20)))
+        for _ in range(10):
+            await ws.send_json(append(silence(20)))
+        return await receive(ws, 0.2)
+
+    events = run(scenario)
+    assert types(events)[:2] == ["input_audio_buffer.speech_started", "input_audio_buffer.speech_stopped"]
+    # 200 ms of speech plus the 100 ms of silence that ended it
+    assert events[1]["audio_end_ms"] == 300
+    assert "response.created" in types(events)
+
+
+def test_continuous_silence_does_not_interrupt_a_response():
+    async def scenario(ws):
+        await receive(ws, 0.05)
+        await ws.send_json({"type": "response.create"})
+        for _ in range(10):
+            await ws.send_json(append(silence(20)))
+            await asyncio.sleep(0.02)
+        return await receive(ws, 0.3)
+
+    events = run(scenario)
+    done = [event for event in events if event["type"] == "response.done"]
+    assert done and done[0]["response"]["status"] == "completed"
+    assert "input_audio_buffer.speech_started" not in types(events)
+
+
+def test_response_create_while_active_is_an_error():
+    async def scenario(ws):
+        await receive(ws, 0.05)
+        await ws.send_json({"type": "response.create"})
+        await ws.send_json({"type": "response.create"})
+        events = await receive(ws, 0.3)
+        # Allowed again once the first response is done
+        await ws.send_json({"type": "response.create"})
+        return events, await receive(ws, 0.3)
+
+    events, after = run(scenario)
+    errors = [event for event in events if event["type"] == "error"]
+    assert [error["error"]["code"] for error in errors] == ["conversation_already_has_active_response"]
+    assert types(events).count("response.created") == 1
+    assert [event["response"]["status"] for event in events if event["type"] == "response.done"] == ["completed"]
+    assert "response.created" in types(after)
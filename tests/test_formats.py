@@ -0,0 +1,37 @@
+import pytest
+
+from src.core.realtime.formats import AudioFormat
+from src.core.utils.errors import AudioError
+
+
+def test_default_is_pcm16_mono_24khz():
+    fmt = AudioFormat()
+    assert (fmt.encoding, fmt.channels, fmt.sample_rate) == ("pcm16", 1, 24000)
+    assert fmt.frame_bytes == 2
+    assert not fmt.is_g711
+
+
+def test_frame_bytes_covers_every_channel():
+    assert AudioFormat("float32", channels=2, sample_rate=48000).frame_bytes == 8
+    assert AudioFormat("g711_ulaw", sample_rate=8000).frame_bytes == 1
+
+
+def test_from_message_round_trips_to_dict():
+    message = {"encoding": "float32", "channels": 2, "sample_rate": 48000}
+    assert AudioFormat.from_message(message).to_dict() == message
+
+
+def test_from_message_defaults_missing_fields():
+    assert AudioFormat.from_message({}) == AudioFormat()
+
+
+@pytest.mark.parametrize("message", [
+    {"encoding": "mp3"},
+    {"channels": 0},
+    {"sample_rate": -8000},
+    {"channels": "two"},
+    {"encoding": "g711_alaw", "channels": 2},
+])
+def test_invalid_formats_raise_audio_error(message):
+    with pytest.raises(AudioError):
+        AudioFormat.from_message(message)
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from src.core.realtime.function_calls import FunctionCallAccumulator, StreamingJsonObject
+
+ARGUMENTS = {
+    "action": "observe",
+    "observations": ["likes \"jazz\"", "lives in {Paris}"],
+    "nested": {"a": [1, 2, {"b": None}]},
+    "count": 12,
+    "ratio": -0.5,
+    "flag": True,
+}
+
+
+def feed_all(fragments):
+    parser = StreamingJsonObject()
+    completed = []
+    for fragment in fragments:
+        completed.extend(parser.feed(fragment))
+    return parser, completed
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_any_split_parses_the_same(size):
+    text = json.dumps(ARGUMENTS)
+    parser, completed = feed_all(text[i:i + size] for i in range(0, len(text), size))
+    assert parser.complete and parser.error is None
+    assert parser.fields == ARGUMENTS
+    assert [key for key, _ in completed] == list(ARGUMENTS)
+
+
+def test_fields_complete_as_soon_as_they_close():
+    parser = StreamingJsonObject()
+    assert parser.feed('{"action": "obs') == []
+    assert parser.feed('erve", "observations": ["a"') == [("action", "observe")]
+    assert parser.feed("]") == [("observations", ["a"])]
+    # A number is only known to be complete at the next delimiter
+    assert parser.feed(', "count": 1') == []
+    assert parser.feed("2}") == [("count", 12)]
+    assert parser.complete
+
+
+def test_escaped_quote_split_across_fragments():
+    parser, _ = feed_all(['{"text": "say \\', '"hi\\', '""}'])
+    assert parser.fields == {"text": 'say "hi"'}
+
+
+def test_text_after_the_object_is_ignored():
+    parser, _ = feed_all(['{"a": 1}', ', "b": 2}'])
+    assert parser.fields == {"a": 1}
+
+
+def test_invalid_member_sets_error():
+    parser, completed = feed_all(['{"a": tru, "b": 2}'])
+    assert parser.error is not None
+    assert completed == [("b", 2)]
+
+
+def delta(call_id, fragment, response_id="resp_1"):
+    return {"call_id": call_id, "delta": fragment, "response_id": response_id}
+
+
+def test_accumulator_tracks_calls_by_id():
+    calls = FunctionCallAccumulator()
+    calls.on_item_added(
+        {"type": "function_call", "call_id": "c1", "name": "conversation_tool", "id": "item_1"},
+        "resp_1",
+    )
+    calls.feed(delta("c2", '{"x": 1,'))
+    call, completed = calls.feed(delta("c1", '{"action": "complete"'))
+    assert call.name == "conversation_tool" and call.item_id == "item_1"
+    assert completed == [("action", "complete")]
+
+    call, missing = calls.finish(
+        {"call_id": "c1", "arguments": '{"action": "complete", "summary": "ok"}'}
+    )
+    assert call.arguments == {"action": "complete", "summary": "ok"}
+    assert missing == [("summary", "ok")]
+    assert set(calls.calls) == {"c2"}
+
+
+def test_finish_does_not_repeat_streamed_fields():
+    calls = FunctionCallAccumulator()
+    calls.feed(delta("c1", '{"a": 1}'))
+    _, missing = calls.finish({"call_id": "c1", "arguments": '{"a": 1}'})
+    assert missing == []
+
+
+def test_end_response_drops_unfinished_calls():
+    calls = FunctionCallAccumulator()
+    calls.feed(delta("c1", '{"a": 1}'))
+    calls.finish({"call_id": "c1", "arguments": '{"a": 1}', "response_id": "resp_1"})
+    calls.feed(delta("c2", '{"a": '))  # Cut off by a cancellation
+    calls.feed(delta("c3", '{"a": ', response_id="resp_2"))
+
+    assert calls.end_response({"id": "resp_1", "status": "cancelled"}) == 1
+    assert set(calls.calls) == {"c3"}
+    assert calls.end_response({"id": "resp_1"}) == 0
+    assert calls.end_response({"id": "resp_2"}) == 0
+    assert calls.calls == {}
+
+
+@pytest.mark.parametrize("arguments", ["[1, 2]", '"text"', "3", "null", "{bad"])
+def test_finish_rejects_arguments_that_are_not_an_object(arguments):
+    calls = FunctionCallAccumulator()
+    call, missing = calls.finish({"call_id": "c1", "arguments": arguments})
+    assert call.error is not None
+    assert call.arguments == {} and missing == []
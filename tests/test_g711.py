@@ -0,0 +1,56 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from src.core.realtime import g711
+
+ALL_SAMPLES = np.arange(65536, dtype=np.uint16).view(np.int16)
+
+
+def test_known_ulaw_codes():
+    assert g711.ulaw_encode(np.array([0, 32767, -32768], dtype=np.int16)) == b"\xff\x80\x00"
+    assert g711.ulaw_decode(b"\xff\x80\x00").tolist() == [0, 32124, -32124]
+
+
+def test_known_alaw_codes():
+    assert g711.alaw_encode(np.array([0, -1], dtype=np.int16)) == b"\xd5\x55"
+    assert g711.alaw_decode(b"\xd5\x55\xaa").tolist() == [8, -8, 32256]
+
+
+@pytest.mark.parametrize("encoding", g711.ENCODINGS)
+def test_decoded_codes_encode_back(encoding):
+    codes = np.arange(256, dtype=np.uint8)
+    if encoding == "g711_ulaw":
+        # 0x7F is "negative zero" and encodes back to 0xFF
+        codes = codes[codes != 0x7F]
+    decoded = g711.decode(codes, encoding)
+    np.testing.assert_array_equal(g711.encode(decoded, encoding), codes)
+
+
+@pytest.mark.parametrize("encoding", g711.ENCODINGS)
+def test_encoding_is_monotonic(encoding):
+    # Decoding every encoded sample gives a non-decreasing curve
+    decoded = g711.decode(g711.encode(np.sort(ALL_SAMPLES), encoding), encoding)
+    assert np.all(np.diff(decoded.astype(np.int32)) >= 0)
+
+
+@pytest.mark.parametrize("encoding", g711.ENCODINGS)
+def test_preallocated_out(encoding):
+    samples = np.array([100, -100, 5000], dtype=np.int16)
+    codes = np.empty(3, dtype=np.uint8)
+    assert g711.encode(samples, encoding, out=codes) is codes
+    decoded = np.empty(3, dtype=np.int16)
+    assert g711.decode(codes, encoding, out=decoded) is decoded
+
+
+def test_matches_audioop():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        audioop = pytest.importorskip("audioop")
+    data = ALL_SAMPLES.tobytes()
+    assert g711.ulaw_encode(ALL_SAMPLES) == audioop.lin2ulaw(data, 2)
+    assert g711.alaw_encode(ALL_SAMPLES) == audioop.lin2alaw(data, 2)
+    codes = bytes(range(256))
+    assert g711.ulaw_decode(codes).tobytes() == audioop.ulaw2lin(codes, 2)
+    assert g711.alaw_decode(codes).tobytes() == audioop.alaw2lin(codes, 2)
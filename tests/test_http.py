@@ -0,0 +1,79 @@
+import asyncio
+import gc
+import warnings
+
+from aiohttp import web
+
+from src.core.utils.http import SharedHttpClient
+
+
+def test_limits_default_from_environment(monkeypatch):
+    monkeypatch.setenv("HTTP_POOL_LIMIT", "7")
+    monkeypatch.setenv("HTTP_TIMEOUT_SECONDS", "2.5")
+    client = SharedHttpClient(limit_per_host=3)
+    assert client.limit == 7
+    assert client.limit_per_host == 3
+    assert client.timeout_seconds == 2.5
+
+
+def test_session_reused_until_closed():
+    async def run():
+        client = SharedHttpClient()
+        first = await client.get()
+        assert await client.get() is first
+        await client.close()
+        second = await client.get()
+        assert second is not first and not second.closed
+        await client.close()
+        return first
+
+    assert asyncio.run(run()).closed
+
+
+def test_new_session_per_event_loop():
+    client = SharedHttpClient()
+    first = asyncio.run(client.get())
+    second = asyncio.run(client.get())
+    assert second is not first
+    assert first.closed
+    asyncio.run(client.close())
+
+
+def test_replaced_session_is_not_leaked():
+    client = SharedHttpClient()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        asyncio.run(client.get())
+        asyncio.run(client.get())
+        gc.collect()
+        asyncio.run(client.close())
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+
+def test_requests_share_one_connection():
+    peers = set()
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.json_response({"ok": True})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = SharedHttpClient()
+        try:
+            for _ in range(5):
+                session = await client.get()
+                async with session.get(f"http://127.0.0.1:{port}/") as response:
+                    assert (await response.json()) == {"ok": True}
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+    assert len(peers) == 1
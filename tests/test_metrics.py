@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.utils.metrics import LatencyStats, LoopLagMonitor, process_stats
+
+
+def test_empty_stats_are_zero():
+    snapshot = LatencyStats().snapshot()
+    assert snapshot == {
+        "count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0
+    }
+
+
+def test_nearest_rank_percentiles():
+    stats = LatencyStats()
+    for value in range(1, 101):
+        stats.record(float(value))
+    assert stats.percentile(50) == 50.0
+    assert stats.percentile(95) == 95.0
+    assert stats.percentile(100) == 100.0
+    assert stats.percentile(0) == 1.0
+
+
+def test_percentiles_use_the_recent_window_only():
+    stats = LatencyStats(window=3)
+    for value in (100.0, 1.0, 2.0, 3.0):
+        stats.record(value)
+    snapshot = stats.snapshot()
+    # count, mean and max cover everything recorded
+    assert snapshot["count"] == 4
+    assert snapshot["mean_ms"] == pytest.approx(26.5)
+    assert snapshot["max_ms"] == 100.0
+    assert snapshot["p99_ms"] == 3.0
+
+
+def test_loop_lag_measures_blocking():
+    async def run():
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        monitor.start()  # Already running
+        await asyncio.sleep(0.05)
+        time.sleep(0.1)  # Blocks the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+        await monitor.stop()
+        return monitor.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["count"] >= 3
+    assert snapshot["max_ms"] >= 80
+    assert snapshot["p50_ms"] < 50
+
+
+def test_process_stats():
+    stats = process_stats()
+    assert stats["cpu_seconds"] > 0
+    assert stats["rss_mb"] > 0
+
@@ -0,0 +1,280 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from src.core.realtime import outbound
+from src.core.realtime.outbound import OutboundWriter
+
+
+class Socket:
+    """Records sent frames; the first `failures` sends raise"""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.sent = []
+        self.failures = failures
+        self.delay = delay
+
+    async def send(self, message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("socket closed")
+        self.sent.append(json.loads(message))
+
+
+class Session:
+    def __init__(self, ws):
+        self.ws = ws
+
+
+def make_writer(ws, **kwargs):
+    kwargs.setdefault("high_watermark_ms", 1000)
+    kwargs.setdefault("low_watermark_ms", 200)
+    return OutboundWriter(Session(ws), **kwargs)
+
+
+def audio_of(frame):
+    return base64.b64decode(frame["audio"])
+
+
+async def flush(writer):
+    """Run the writer until its queue is empty"""
+    task = asyncio.create_task(writer.run())
+    writer.ready.set()
+    for _ in range(200):
+        await asyncio.sleep(0)
+        if not writer.depth:
+            break
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def test_backlog_is_coalesced_in_order():
+    ws = Socket()
+    writer = make_writer(ws)
+    writer.put_audio(b"\x01\x00" * 10)
+    writer.put_audio(b"\x02\x00" * 10)
+    writer.put_event({"type": "input_audio_buffer.commit"})
+    writer.put_audio(b"\x03\x00" * 10)
+    writer.put_event({"type": "response.create"})
+    asyncio.run(flush(writer))
+
+    assert [frame["type"] for frame in ws.sent] == [
+        "input_audio_buffer.append",
+        "input_audio_buffer.commit",
+        "input_audio_buffer.append",
+        "response.create",
+    ]
+    assert audio_of(ws.sent[0]) == b"\x01\x00" * 10 + b"\x02\x00" * 10
+    assert audio_of(ws.sent[2]) == b"\x03\x00" * 10
+    assert writer.audio_chunks == 3 and writer.audio_frames == 2
+    assert writer.queued_audio_ms == 0
+
+
+def test_coalescing_respects_frame_limit():
+    ws = Socket()
+    writer = make_writer(ws, max_coalesced_bytes=96)  # 2 ms
+    for _ in range(5):
+        writer.put_audio(b"\x00" * 48)
+    asyncio.run(flush(writer))
+    assert [len(audio_of(frame)) for frame in ws.sent] == [96, 96, 48]
+
+
+def test_nothing_sent_until_ready():
+    async def scenario():
+        ws = Socket()
+        writer = make_writer(ws)
+        task = asyncio.create_task(writer.run())
+        writer.put_event({"type": "response.create"})
+        await asyncio.sleep(0.01)
+        held = list(ws.sent)
+        writer.ready.set()
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return held, ws.sent
+
+    held, sent = asyncio.run(scenario())
+    assert held == []
+    assert [frame["type"] for frame in sent] == ["response.create"]
+
+
+def test_failed_send_is_requeued_until_resumed():
+    async def scenario():
+        ws = Socket(failures=1)
+        writer = make_writer(ws)
+        task = asyncio.create_task(writer.run())
+        writer.put_audio(b"\x01\x00" * 10)
+        writer.put_event({"type": "input_audio_buffer.commit"})
+        writer.ready.set()
+        await asyncio.sleep(0.01)
+        # The failure paused the writer with nothing lost
+        paused = (writer.ready.is_set(), writer.depth, writer.queued_audio_ms)
+        writer.ready.set()
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return paused, ws.sent
+
+    paused, sent = asyncio.run(scenario())
+    assert paused[0] is False and paused[1] == 2
+    assert paused[2] == pytest.approx(20 / 48)
+    assert [frame["type"] for frame in sent] == [
+        "input_audio_buffer.append",
+        "input_audio_buffer.commit",
+    ]
+
+
+def test_unencodable_event_is_skipped():
+    ws = Socket()
+    writer = make_writer(ws)
+    writer.put_event({"type": "bad", "value": object()})
+    writer.put_event({"type": "response.create"})
+    asyncio.run(flush(writer))
+    assert [frame["type"] for frame in ws.sent] == ["response.create"]
+
+
+# 10 ms of 24kHz PCM16
+CHUNK = b"\x00" * 480
+
+
+def test_drop_oldest_trims_to_low_watermark():
+    writer = make_writer(Socket(), high_watermark_ms=100, low_watermark_ms=40)
+    writer.put_event({"type": "input_audio_buffer.clear"})
+    for i in range(10):
+        assert writer.put_audio(bytes([i]) * 480)
+    assert writer.overflows == 0
+    assert writer.put_audio(b"\x0a" * 480)
+
+    assert writer.overflows == 1
+    assert writer.queued_audio_ms == 40
+    assert writer.dropped_chunks == 7
+    # The newest audio and every event survive
+    kinds = [item[0] for item in writer._pending]
+    assert kinds == ["event", "audio", "audio", "audio", "audio"]
+    assert [item[1][0] for item in list(writer._pending)[1:]] == [7, 8, 9, 10]
+
+
+def test_overflow_warning_is_rate_limited(capsys, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(outbound.time, "monotonic", lambda: clock[0])
+    writer = make_writer(Socket(), high_watermark_ms=100, low_watermark_ms=40)
+    for _ in range(30):
+        writer.put_audio(CHUNK)
+    assert writer.overflows > 1
+    warnings = capsys.readouterr().out.splitlines()
+    assert warnings == ["[warn] Upstream is behind: dropped 70 ms of queued audio"]
+
+    clock[0] += outbound.OVERFLOW_WARNING_INTERVAL_S
+    overflows = writer.overflows
+    while writer.overflows == overflows:
+        writer.put_audio(CHUNK)
+    # Drops since the last warning are summed into the next one
+    dropped_ms = writer.dropped_bytes // 48 - 70
+    assert capsys.readouterr().out == (
+        f"[warn] Upstream is behind: dropped {dropped_ms} ms of queued audio\n"
+    )
+
+
+def test_drop_newest_sheds_until_drained_to_low_watermark():
+    async def scenario():
+        ws = Socket()
+        writer = make_writer(
+            ws, high_watermark_ms=50, low_watermark_ms=20, audio_drop_policy="drop_newest"
+        )
+        accepted = [writer.put_audio(CHUNK) for _ in range(7)]
+        writer.put_event({"type": "input_audio_buffer.commit"})
+        # Still shedding: draining hasn't reached the low watermark
+        accepted.append(writer.put_audio(CHUNK))
+        await flush(writer)
+        accepted.append(writer.put_audio(CHUNK))
+        return writer, ws, accepted
+
+    writer, ws, accepted = asyncio.run(scenario())
+    assert accepted == [True] * 5 + [False, False, False, True]
+    assert writer.overflows == 1
+    assert writer.dropped_chunks == 3
+    assert ws.sent[-1]["type"] == "input_audio_buffer.commit"
+
+
+def test_events_are_never_dropped():
+    writer = make_writer(Socket(), high_watermark_ms=20, low_watermark_ms=10)
+    for i in range(50):
+        writer.put_event({"type": "conversation.item.create", "n": i})
+        writer.put_audio(CHUNK)
+    events = [item for item in writer._pending if item[0] == "event"]
+    assert len(events) == 50
+    assert writer.queued_audio_ms <= 20
+
+
+def test_coalesced_frames_stay_within_low_watermark():
+    writer = make_writer(Socket(), low_watermark_ms=30, max_coalesced_bytes=48000)
+    assert writer.max_coalesced_bytes == 30 * 48
+
+
+def test_watermarks_default_from_environment(monkeypatch):
+    monkeypatch.setenv("REALTIME_OUTBOUND_HIGH_WATERMARK_MS", "500")
+    monkeypatch.setenv("REALTIME_OUTBOUND_LOW_WATERMARK_MS", "900")
+    writer = OutboundWriter(Session(Socket()))
+    assert writer.high_watermark_ms == 500
+    # The low watermark can't exceed the high one
+    assert writer.low_watermark_ms == 500
+
+
+class Admission:
+    """Holds each response.create until released"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.waiting = asyncio.Event()
+
+    async def admit_response(self):
+        self.waiting.set()
+        await self.release.wait()
+        return 0.0
+
+
+def test_frame_held_by_admission_goes_to_the_resumed_socket():
+    async def scenario():
+        old, new = Socket(), Socket()
+        admission = Admission()
+        writer = make_writer(old, admission=admission)
+        task = asyncio.create_task(writer.run())
+        writer.put_event({"type": "response.create"})
+        writer.ready.set()
+        await admission.waiting.wait()
+        # A reconnect finishes while the response waits for its slot
+        writer.session.ws = new
+        admission.release.set()
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return old, new, writer
+
+    old, new, writer = asyncio.run(scenario())
+    assert old.sent == []
+    assert [frame["type"] for frame in new.sent] == ["response.create"]
+    assert writer.ready.is_set()
+
+
+def test_failure_on_a_replaced_socket_keeps_writing():
+    async def scenario():
+        old, new = Socket(failures=1, delay=0.01), Socket()
+        writer = make_writer(old)
+        task = asyncio.create_task(writer.run())
+        writer.put_event({"type": "input_audio_buffer.commit"})
+        writer.ready.set()
+        await asyncio.sleep(0)
+        # The resume completes while the send on the lost socket is failing
+        writer.session.ws = new
+        await asyncio.sleep(0.03)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return new, writer
+
+    new, writer = asyncio.run(scenario())
+    assert writer.ready.is_set()
+    assert [frame["type"] for frame in new.sent] == ["input_audio_buffer.commit"]
@@ -0,0 +1,202 @@
+import asyncio
+import base64
+
+from src.core.realtime.output import ClientSink, PlayerSink, ResponseAudioStream
+
+
+def delta(pcm: bytes, item_id="item_1", response_id="resp_1"):
+    return {
+        "type": "response.audio.delta",
+        "item_id": item_id,
+        "response_id": response_id,
+        "delta": base64.b64encode(pcm).decode(),
+    }
+
+
+class Recorder:
+    def __init__(self):
+        self.output = []
+
+    def record_output(self, pcm):
+        self.output.append(bytes(pcm))
+
+
+class Player:
+    """AudioPlayer stand-in that 'plays' `played` samples of what it was given"""
+
+    def __init__(self):
+        self.write_position = 0
+        self.played = 0
+        self.flushed = False
+        self.ended = False
+
+    async def enqueue(self, pcm):
+        self.write_position += len(pcm) // 2
+
+    def playback_position(self):
+        return self.played
+
+    def flush(self):
+        self.flushed = True
+
+    def mark_end_of_stream(self):
+        self.ended = True
+
+
+def feed(stream, *events):
+    async def run():
+        for event in events:
+            await stream.on_audio_delta(event)
+
+    asyncio.run(run())
+
+
+def test_deltas_reach_every_sink():
+    stream = ResponseAudioStream()
+    first, second = [], []
+
+    async def write_first(pcm):
+        first.append(pcm)
+
+    async def write_second(pcm):
+        second.append(pcm)
+
+    stream.add_sink(write_first)
+    stream.add_sink(write_second)
+    feed(stream, delta(b"\x01\x00\x02\x00"), delta(b"\x03\x00"))
+    assert first == second == [b"\x01\x00\x02\x00", b"\x03\x00"]
+    assert stream.items["item_1"].samples_received == 3
+    stream.remove_sink(write_second)
+    feed(stream, delta(b"\x04\x00"))
+    assert len(first) == 3 and len(second) == 2
+
+
+def test_invalid_base64_is_counted():
+    stream = ResponseAudioStream()
+    feed(stream, {"item_id": "item_1", "delta": "not base64!"})
+    assert stream.decode_errors == 1
+    assert stream.deltas == 0
+
+
+def test_records_without_any_sink():
+    # Assistant audio is recorded even when only a player (or nothing) plays it
+    stream = ResponseAudioStream()
+    stream.recorder = Recorder()
+    stream.add_player(Player())
+    feed(stream, delta(b"\x01\x00"), delta(b"\x02\x00"))
+    assert stream.recorder.output == [b"\x01\x00", b"\x02\x00"]
+
+
+def test_first_audio_latency_once_per_response():
+    stream = ResponseAudioStream()
+    stream.mark_response_requested()
+    feed(stream, delta(b"\x00\x00", "item_1"), delta(b"\x00\x00", "item_2"))
+    assert stream.first_audio_latency.count == 1
+    stream.on_response_done({})
+    feed(stream, delta(b"\x00\x00", "item_3", "resp_2"))
+    assert stream.first_audio_latency.count == 1
+
+
+def test_interrupt_flushes_player_and_drops_late_deltas():
+    stream = ResponseAudioStream()
+    stream.recorder = Recorder()
+    player = Player()
+    stream.add_player(player)
+    feed(stream, delta(b"\x00\x00" * 2400))
+    player.played = 1000
+
+    item = stream.interrupt()
+    assert item.interrupted and item.samples_played == 1000
+    assert player.flushed
+    assert stream.interrupt() is None
+
+    feed(stream, delta(b"\x00\x00" * 100))
+    assert stream.dropped_deltas == 1
+    assert len(stream.recorder.output) == 1
+
+
+def test_interrupt_after_playback_finished_is_ignored():
+    stream = ResponseAudioStream()
+    player = Player()
+    stream.add_player(player)
+    feed(stream, delta(b"\x00\x00" * 100))
+    stream.on_audio_done({"item_id": "item_1"})
+    player.played = 100
+    assert player.ended
+    assert stream.interrupt() is None
+    assert stream.interruptions == 0
+
+
+def test_interrupt_without_reporting_sinks():
+    stream = ResponseAudioStream()
+
+    async def write(pcm):
+        pass
+
+    stream.add_sink(write)
+    feed(stream, delta(b"\x00\x00"))
+    assert stream.interrupt() is None
+
+
+def test_player_sink_positions_per_item():
+    stream = ResponseAudioStream()
+    player = Player()
+    sink = PlayerSink(stream, player)
+    stream.add_sink(sink.write, sink.done, sink.interrupt)
+    feed(stream, delta(b"\x00\x00" * 500, "item_1"), delta(b"\x00\x00" * 300, "item_2"))
+    player.played = 600
+    item = stream.interrupt()
+    assert item.item_id == "item_2"
+    assert item.samples_played == 100
+
+
+def test_client_sink_reports_heard_position():
+    stream = ResponseAudioStream()
+    sent, controls = [], []
+
+    async def send_audio(pcm):
+        sent.append(pcm)
+
+    async def send_control(message):
+        controls.append(message)
+
+    sink = ClientSink(stream, send_audio, send_control)
+    stream.add_sink(sink.write, interrupt=sink.interrupt)
+
+    async def run():
+        await stream.on_audio_delta(delta(b"\x00\x00" * 2400, "item_1"))
+        await stream.on_audio_delta(delta(b"\x00\x00" * 4800, "item_2"))
+        sink.report_played(150)  # all of item_1 and 50 ms of item_2
+        item = stream.interrupt()
+        await asyncio.sleep(0)
+        return item
+
+    item = asyncio.run(run())
+    assert len(sent) == 2
+    assert item.item_id == "item_2"
+    assert item.samples_played == 1200
+    assert controls == [{"type": "audio.interrupt", "item_id": "item_2", "played_ms": 50}]
+
+
+def test_client_sink_without_reports_assumes_all_heard():
+    stream = ResponseAudioStream()
+    controls = []
+
+    async def send_audio(pcm):
+        pass
+
+    async def send_control(message):
+        controls.append(message)
+
+    sink = ClientSink(stream, send_audio, send_control)
+    stream.add_sink(sink.write, interrupt=sink.interrupt)
+
+    async def run():
+        await stream.on_audio_delta(delta(b"\x00\x00" * 480))
+        item = stream.interrupt()
+        await asyncio.sleep(0)
+        return item
+
+    item = asyncio.run(run())
+    assert item.samples_played == 480
+    assert controls == []
@@ -0,0 +1,65 @@
+import json
+
+from src.core.config.models import ConversationConfig, ConversationPhase
+from src.core.realtime import payloads
+from src.core.realtime.payloads import REALTIME_MODEL, compile_payloads, config_key
+
+
+def make_config(**overrides):
+    fields = dict(
+        name="Test",
+        goal="Test the payloads",
+        initial_phase="start",
+        system_instructions="Be brief.",
+        phases={
+            "start": ConversationPhase(
+                name="Start",
+                instructions="Say hello.",
+                success_criteria=[],
+                required_observations=[],
+                next_phases=[],
+                max_duration_seconds=None,
+                completion_rules={},
+            )
+        },
+        max_duration_seconds=None,
+        completion_criteria={},
+    )
+    fields.update(overrides)
+    return ConversationConfig(**fields)
+
+
+def test_key_follows_content():
+    assert config_key(make_config()) == config_key(make_config())
+    assert config_key(make_config()) != config_key(make_config(voice="verse"))
+
+
+def test_create_and_update_carry_the_same_settings():
+    compiled = compile_payloads(make_config(voice="verse"))
+    body = json.loads(compiled.create_body)
+    update = json.loads(compiled.update_message)
+    assert body.pop("model") == REALTIME_MODEL
+    assert update["type"] == "session.update"
+    assert update["session"] == body
+    assert body["voice"] == "verse"
+    assert body["instructions"] == "Be brief."
+    assert [tool["name"] for tool in body["tools"]] == ["conversation_tool"]
+
+
+def test_compiled_once_per_config_content():
+    first = compile_payloads(make_config(name="cached"))
+    assert compile_payloads(make_config(name="cached")) is first
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(payloads, "MAX_COMPILED_CONFIGS", 2)
+    monkeypatch.setattr(payloads, "_compiled", payloads._compiled.__class__())
+    first = compile_payloads(make_config(name="one"))
+    compile_payloads(make_config(name="two"))
+    compile_payloads(make_config(name="one"))  # Now most recently used
+    compile_payloads(make_config(name="three"))
+    assert list(payloads._compiled) == [
+        config_key(make_config(name="one")),
+        config_key(make_config(name="three")),
+    ]
+    assert compile_payloads(make_config(name="one")) is first
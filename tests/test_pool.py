@@ -0,0 +1,192 @@
+import asyncio
+import time
+
+from src.core.realtime.pool import SessionPool
+
+CLOSED = object()
+
+
+class Socket:
+    """WebSocket stand-in: yields queued frames until closed"""
+
+    def __init__(self):
+        self.close_code = None
+        self.frames: asyncio.Queue = asyncio.Queue()
+
+    async def __aiter__(self):
+        while True:
+            frame = await self.frames.get()
+            if frame is CLOSED:
+                return
+            yield frame
+
+    async def close(self):
+        self.drop()
+
+    def drop(self):
+        self.close_code = 1000
+        self.frames.put_nowait(CLOSED)
+
+
+class Handler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_message(self, message):
+        self.messages.append(message)
+
+
+class State:
+    conversation_start_time = None
+
+
+class Session:
+    created = 0
+
+    def __init__(self, config):
+        Session.created += 1
+        self.id = f"sess_{Session.created}"
+        self.ws = None
+        self.state = State()
+        self.event_handler = Handler()
+        self.closed = False
+        # Tokens expire long before a warm session is too old to use
+        self.token_expires_at = time.time() + 0.01
+
+    @property
+    def connected(self):
+        return self.ws is not None and self.ws.close_code is None
+
+    async def initialize(self):
+        self.ws = Socket()
+
+    async def close(self):
+        self.closed = True
+        await self.ws.close()
+
+
+def make_pool(**kwargs):
+    return SessionPool(min_size=1, max_size=2, max_configs=2, session_factory=Session, **kwargs)
+
+
+def config(name="a"):
+    # The pool only uses the config as its key
+    class Config:
+        pass
+
+    config = Config()
+    config.name = name
+    return config
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def run(coro, monkeypatch):
+    monkeypatch.setattr("src.core.realtime.pool.config_key", lambda config: config.name)
+    return asyncio.run(coro)
+
+
+def test_miss_then_hit(monkeypatch):
+    async def scenario():
+        pool = make_pool()
+        first = await pool.acquire(config())
+        await settle()
+        second = await pool.acquire(config())
+        stats = pool.stats()
+        await pool.close()
+        return first, second, stats
+
+    first, second, stats = run(scenario(), monkeypatch)
+    assert first is not second
+    assert second.state.conversation_start_time is not None
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_connected_session_outlives_its_token(monkeypatch):
+    async def scenario():
+        pool = make_pool()
+        pool.warm(config())
+        await settle()
+        await asyncio.sleep(0.05)
+        session = await pool.acquire(config())
+        stats = pool.stats()
+        await pool.close()
+        return session, stats
+
+    session, stats = run(scenario(), monkeypatch)
+    assert stats["hits"] == 1
+    assert stats["expired"] == 0
+    assert not session.closed
+
+
+def test_session_replaced_after_max_age(monkeypatch):
+    async def scenario():
+        pool = make_pool(max_age_seconds=0.02)
+        pool.warm(config())
+        await settle()
+        (first,) = pool._pools["a"].ready
+        await asyncio.sleep(0.05)
+        await settle()
+        (second,) = pool._pools["a"].ready
+        expired = pool.expired
+        await pool.close()
+        return first.session, second.session, expired
+
+    first, second, expired = run(scenario(), monkeypatch)
+    assert first is not second
+    assert first.closed
+    assert expired >= 1
+
+
+def test_idle_events_are_read_until_acquired(monkeypatch):
+    async def scenario():
+        pool = make_pool()
+        pool.warm(config())
+        await settle()
+        (warm,) = pool._pools["a"].ready
+        warm.session.ws.frames.put_nowait('{"type":"session.created"}')
+        await settle()
+        session = await pool.acquire(config())
+        session.ws.frames.put_nowait('{"type":"session.updated"}')
+        await settle()
+        left = session.ws.frames.qsize()
+        await pool.close()
+        return session, left
+
+    session, left = run(scenario(), monkeypatch)
+    assert session.event_handler.messages == ['{"type":"session.created"}']
+    # Left for the session's own receive loop
+    assert left == 1
+
+
+def test_disconnected_session_is_replaced(monkeypatch):
+    async def scenario():
+        pool = make_pool()
+        pool.warm(config())
+        await settle()
+        (warm,) = pool._pools["a"].ready
+        warm.session.ws.drop()
+        await settle()
+        ready = list(pool._pools["a"].ready)
+        await pool.close()
+        return warm.session, ready
+
+    dropped, ready = run(scenario(), monkeypatch)
+    assert dropped.closed
+    assert len(ready) == 1 and ready[0].session is not dropped
+
+
+def test_least_recently_used_config_is_drained(monkeypatch):
+    async def scenario():
+        pool = make_pool()
+        for name in ("a", "b", "c"):
+            pool.warm(config(name))
+            await settle()
+        keys = list(pool._pools)
+        await pool.close()
+        return keys
+
+    assert run(scenario(), monkeypatch) == ["b", "c"]
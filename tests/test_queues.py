@@ -0,0 +1,34 @@
+import asyncio
+
+from src.core.realtime.queues import DropPolicy, offer
+
+
+def drain(queue: asyncio.Queue):
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+def test_offer_puts_while_there_is_room():
+    queue = asyncio.Queue(maxsize=2)
+    assert offer(queue, 1, DropPolicy.DROP_OLDEST) is False
+    assert offer(queue, 2, DropPolicy.DROP_NEWEST) is False
+    assert drain(queue) == [1, 2]
+
+
+def test_drop_oldest_makes_room_for_the_new_item():
+    queue = asyncio.Queue(maxsize=2)
+    for item in (1, 2):
+        offer(queue, item, DropPolicy.DROP_OLDEST)
+    assert offer(queue, 3, DropPolicy.DROP_OLDEST) is True
+    assert drain(queue) == [2, 3]
+
+
+def test_drop_newest_discards_the_new_item():
+    queue = asyncio.Queue(maxsize=2)
+    for item in (1, 2):
+        offer(queue, item, DropPolicy.DROP_NEWEST)
+    assert offer(queue, 3, DropPolicy.DROP_NEWEST) is True
+    assert drain(queue) == [1, 2]
+
+
+def test_policy_accepts_its_string_value():
+    assert DropPolicy("drop_oldest") is DropPolicy.DROP_OLDEST
@@ -0,0 +1,103 @@
+import struct
+
+import pytest
+
+from src.core.realtime.recorder import (
+    WAV_HEADER_SIZE,
+    MappedWavWriter,
+    SessionRecorder,
+    wav_header,
+)
+
+
+@pytest.fixture
+def writer(tmp_path):
+    writer = MappedWavWriter(tmp_path / "track.wav", sample_rate=8000, max_seconds=1)
+    yield writer
+    writer.close()
+
+
+def data_size(header: bytes) -> int:
+    return struct.unpack_from("<I", header, 40)[0]
+
+
+def test_header_fields():
+    header = wav_header(1000, 24000, channels=2)
+    assert len(header) == WAV_HEADER_SIZE
+    assert header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+    assert struct.unpack_from("<I", header, 4)[0] == 1036
+    assert struct.unpack_from("<HI", header, 22) == (2, 24000)
+    assert data_size(header) == 1000
+
+
+def test_read_reflects_audio_so_far(writer):
+    assert writer.append(b"\x01\x02" * 10) == 20
+    wav = writer.read()
+    assert len(wav) == WAV_HEADER_SIZE + 20
+    assert data_size(wav) == 20
+    assert wav[WAV_HEADER_SIZE:] == b"\x01\x02" * 10
+
+
+def test_read_ranges(writer):
+    writer.append(bytes(range(100)))
+    whole = writer.read()
+    assert writer.read(10, 50) == whole[10:50]
+    assert writer.read(WAV_HEADER_SIZE + 5, WAV_HEADER_SIZE + 9) == bytes(range(5, 9))
+    assert writer.read(0, 10_000) == whole
+    assert writer.read(50, 50) == b""
+    assert writer.read(len(whole) + 1) == b""
+
+
+def test_append_truncates_at_capacity(writer):
+    capacity = writer.capacity - WAV_HEADER_SIZE
+    assert writer.append(b"\x00" * (capacity - 2)) == capacity - 2
+    assert writer.append(b"\x00" * 5) == 2
+    assert writer.truncated_bytes == 3
+    assert writer.duration_seconds == pytest.approx(1.0)
+
+
+def test_close_writes_final_header_and_trims(writer):
+    writer.append(b"\x05\x00" * 50)
+    writer.close()
+    data = writer.path.read_bytes()
+    assert len(data) == WAV_HEADER_SIZE + 100
+    assert data_size(data) == 100
+    assert writer.read(0) == data
+    assert writer.append(b"\x00\x00") == 0
+
+
+@pytest.mark.parametrize("start,end", [(0, None), (3, 77), (WAV_HEADER_SIZE, 100), (60, 10_000)])
+def test_iter_range_matches_read(writer, start, end):
+    writer.append(bytes(range(200)) * 5)
+    pieces = list(writer.iter_range(start, end, chunk_size=16))
+    assert all(len(piece) <= 16 for piece in pieces)
+    assert b"".join(pieces) == writer.read(start, end)
+
+
+def test_iter_range_stops_at_size_when_started(writer):
+    writer.append(b"\x01\x00" * 8)
+    pieces = writer.iter_range(chunk_size=WAV_HEADER_SIZE)
+    first = next(pieces)
+    writer.append(b"\x02\x00" * 8)
+    rest = b"".join(pieces)
+    assert data_size(first) == 16
+    assert rest == b"\x01\x00" * 8
+
+
+def test_iter_range_across_close(writer):
+    writer.append(b"\x03\x00" * 40)
+    pieces = writer.iter_range(chunk_size=32)
+    first = next(pieces)
+    writer.close()
+    assert first + b"".join(pieces) == writer.path.read_bytes()
+
+
+def test_session_recorder_tracks(tmp_path):
+    recorder = SessionRecorder(tmp_path, "abc", sample_rate=8000, max_duration_seconds=1)
+    recorder.record_input(b"\x01\x00")
+    recorder.record_output(b"\x02\x00\x03\x00")
+    recorder.close()
+    assert (tmp_path / "abc_input.wav").stat().st_size == WAV_HEADER_SIZE + 2
+    assert (tmp_path / "abc_output.wav").stat().st_size == WAV_HEADER_SIZE + 4
+    with pytest.raises(KeyError):
+        recorder.track("both")
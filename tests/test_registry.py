@@ -0,0 +1,161 @@
+import asyncio
+import time
+
+from src.core.config.models import ConversationConfig, ConversationPhase
+from src.core.realtime.registry import SessionRegistry
+from src.core.realtime.session import RealtimeSession
+
+
+class Session:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def make_registry(**kwargs):
+    kwargs.setdefault("max_sessions", 3)
+    kwargs.setdefault("idle_ttl_seconds", 60)
+    kwargs.setdefault("sweep_interval_seconds", 60)
+    return SessionRegistry(**kwargs)
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_capacity_evicts_least_recently_used():
+    async def run():
+        registry = make_registry()
+        sessions = {name: Session() for name in "abcd"}
+        for name in "abc":
+            registry.register(name, sessions[name])
+        registry.get("a")  # b is now least recently used
+        registry.register("d", sessions["d"])
+        await settle()
+        return registry, sessions
+
+    registry, sessions = asyncio.run(run())
+    assert "b" not in registry and len(registry) == 3
+    assert sessions["b"].closed
+    assert registry.evicted_capacity == 1
+
+
+def test_attached_sessions_are_not_evicted():
+    async def run():
+        registry = make_registry(max_sessions=1)
+        first, second = Session(), Session()
+        registry.register("a", first)
+        registry.attach("a")
+        registry.register("b", second)
+        await settle()
+        return registry, first
+
+    registry, first = asyncio.run(run())
+    assert "a" in registry and not first.closed
+    assert registry.stats()["attached"] == 1
+
+
+def test_sweep_evicts_idle_unattached():
+    async def run():
+        registry = make_registry(idle_ttl_seconds=0.01)
+        idle, attached = Session(), Session()
+        registry.register("idle", idle)
+        registry.register("attached", attached)
+        registry.attach("attached")
+        await asyncio.sleep(0.02)
+        evicted = await registry.sweep()
+        # Idle time starts again when the last client detaches
+        registry.detach("attached")
+        kept = await registry.sweep()
+        return registry, evicted, kept, idle, attached
+
+    registry, evicted, kept, idle, attached = asyncio.run(run())
+    assert (evicted, kept) == (1, 0)
+    assert idle.closed and not attached.closed
+    assert list(registry._entries) == ["attached"]
+
+
+def test_remove_runs_close_hooks():
+    async def run():
+        registry = make_registry()
+        calls = []
+
+        async def hook(session_id, session):
+            calls.append(session_id)
+
+        async def failing(session_id, session):
+            raise RuntimeError("boom")
+
+        registry.add_close_hook(failing)
+        registry.add_close_hook(hook)
+        session = Session()
+        registry.register("a", session)
+        removed = await registry.remove("a")
+        again = await registry.remove("a")
+        return registry, session, calls, removed, again
+
+    registry, session, calls, removed, again = asyncio.run(run())
+    assert (removed, again) == (True, False)
+    assert session.closed and calls == ["a"]
+    assert registry.close_failures == 1 and registry.removed == 1
+
+
+def test_close_closes_everything():
+    async def run():
+        registry = make_registry()
+        registry.start()
+        sessions = [Session() for _ in range(3)]
+        for index, session in enumerate(sessions):
+            registry.register(str(index), session)
+        await registry.close()
+        return registry, sessions
+
+    registry, sessions = asyncio.run(run())
+    assert len(registry) == 0
+    assert all(session.closed for session in sessions)
+
+
+def make_session():
+    phase = ConversationPhase(
+        name="Start",
+        instructions="Say hello.",
+        success_criteria=[],
+        required_observations=[],
+        next_phases=[],
+        max_duration_seconds=None,
+        completion_rules={},
+    )
+    config = ConversationConfig(
+        name="Test",
+        goal="Test",
+        initial_phase="start",
+        system_instructions="",
+        phases={"start": phase},
+        max_duration_seconds=None,
+        completion_criteria={},
+    )
+    return RealtimeSession(config, api_base="http://127.0.0.1:9/v1")
+
+
+def test_session_closed_after_close():
+    session = make_session()
+    assert not session.closed
+    asyncio.run(session.close())
+    assert session.closed
+
+
+def test_session_closed_once_reconnecting_gives_up(monkeypatch):
+    session = make_session()
+    session.RECONNECT_DEADLINE = 0.05
+
+    async def fail():
+        raise ConnectionError("API unreachable")
+
+    monkeypatch.setattr(session, "_resume", fail)
+    start = time.perf_counter()
+    assert asyncio.run(session.reconnect()) is False
+    assert time.perf_counter() - start < 1
+    assert session.closed
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from src.core.realtime.resampler import StreamingResampler
+
+
+def tone(rate: int, seconds: float, frequency: float = 440.0, amplitude: float = 0.5) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * 32767 * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+
+def stream(resampler: StreamingResampler, samples: np.ndarray, chunk: int) -> np.ndarray:
+    parts = [
+        resampler.process(samples[i:i + chunk]).copy() for i in range(0, len(samples), chunk)
+    ]
+    return np.concatenate(parts)
+
+
+def test_rejects_non_positive_rates():
+    with pytest.raises(ValueError):
+        StreamingResampler(0, 24000)
+
+
+def test_reduces_ratio():
+    resampler = StreamingResampler(44100, 24000)
+    assert (resampler.up, resampler.down) == (80, 147)
+
+
+def test_passthrough_returns_mono_int16_input_as_is():
+    resampler = StreamingResampler(24000, 24000)
+    samples = tone(24000, 0.01)
+    assert resampler.passthrough
+    assert resampler.process(samples) is samples
+
+
+def test_passthrough_converts_float32():
+    resampler = StreamingResampler(24000, 24000)
+    out = resampler.process(np.array([0.5, -0.5], dtype=np.float32), scale=1.0)
+    assert out.tolist() == [16384, -16384]
+
+
+@pytest.mark.parametrize("source_rate", [8000, 16000, 44100, 48000])
+def test_output_length_tracks_rate_ratio(source_rate):
+    resampler = StreamingResampler(source_rate, 24000)
+    out = stream(resampler, tone(source_rate, 1.0), source_rate // 50)
+    assert abs(len(out) - 24000) <= 1
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 160, 480, 4800])
+def test_chunking_does_not_change_output(chunk):
+    samples = tone(48000, 0.2)
+    whole = StreamingResampler(48000, 24000).process(samples).copy()
+    chunked = stream(StreamingResampler(48000, 24000), samples, chunk)
+    np.testing.assert_array_equal(chunked, whole)
+
+
+def test_chunk_larger_than_preallocated_buffers():
+    resampler = StreamingResampler(16000, 24000, max_chunk_samples=160)
+    out = resampler.process(tone(16000, 0.5))
+    assert abs(len(out) - 12000) <= 1
+
+
+def test_tone_keeps_its_level():
+    out = stream(StreamingResampler(48000, 24000), tone(48000, 0.5), 960)
+    # Skip the filter's warm-up
+    rms = np.sqrt(np.mean(out[1000:].astype(np.float64) ** 2))
+    assert rms == pytest.approx(0.5 * 32767 / np.sqrt(2), rel=0.02)
+
+
+def test_removes_content_above_the_target_nyquist():
+    out = stream(StreamingResampler(48000, 24000), tone(48000, 0.5, frequency=18000), 960)
+    assert np.abs(out[1000:]).max() < 0.01 * 32767
+
+
+def test_downmixes_stereo():
+    left = tone(48000, 0.1)
+    stereo = np.stack([left, left], axis=1)
+    mono = StreamingResampler(48000, 24000).process(left).copy()
+    mixed = StreamingResampler(48000, 24000).process(stereo)
+    np.testing.assert_allclose(mixed, mono, atol=1)
+
+
+def test_reset_clears_history():
+    samples = tone(48000, 0.05)
+    resampler = StreamingResampler(48000, 24000)
+    first = resampler.process(samples).copy()
+    resampler.reset()
+    np.testing.assert_array_equal(resampler.process(samples), first)
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from src.core.realtime.observation_tracker import ObservationTracker
+from src.core.realtime.resume import (
+    ConversationTranscript,
+    conversation_recap,
+    resume_events,
+    resume_instructions,
+)
+
+
+def make_session(turns=(), observations=()):
+    tracker = ObservationTracker()
+    for phase, observation in observations:
+        tracker.add_observation(phase, observation)
+    transcript = ConversationTranscript()
+    for role, text in turns:
+        transcript.add(role, text)
+    phase = SimpleNamespace(name="Drinks", instructions="Offer drinks.")
+    return SimpleNamespace(
+        phase_manager=SimpleNamespace(current_phase="drinks"),
+        observation_tracker=tracker,
+        transcript=transcript,
+        config=SimpleNamespace(phases={"drinks": phase}),
+        _build_instructions=lambda: "You are a waiter.",
+    )
+
+
+def test_transcript_skips_blank_turns_and_keeps_recent():
+    transcript = ConversationTranscript(max_turns=2)
+    for text in ("one", "  ", None, "two", "three"):
+        transcript.add("user", text)
+    assert list(transcript.turns) == [("user", "two"), ("user", "three")]
+
+
+def test_recap_lists_phase_observations_and_turns():
+    session = make_session(
+        turns=[("user", "A table for two"), ("assistant", "Right this way")],
+        observations=[("greeting", "party of 2"), ("greeting", "window seat")],
+    )
+    recap = conversation_recap(session)
+    assert "Current phase: drinks" in recap
+    assert "Observations in greeting: party of 2; window seat" in recap
+    assert recap.endswith("User: A table for two\nAssistant: Right this way")
+
+
+def test_recap_accepts_non_string_observations():
+    # The model decides what goes in an observation
+    session = make_session(observations=[("greeting", 2), ("greeting", {"seat": "window"})])
+    assert "Observations in greeting: 2; {'seat': 'window'}" in conversation_recap(session)
+
+
+def test_recap_keeps_most_recent_turns_within_budget():
+    session = make_session(turns=[("user", f"turn {i} " + "x" * 50) for i in range(100)])
+    recap = conversation_recap(session, max_chars=600)
+    assert len(recap) <= 600
+    assert "turn 99" in recap
+    assert "turn 0 " not in recap
+
+
+def test_resume_events():
+    session = make_session(turns=[("user", "hi")])
+    update, recap = resume_events(session)
+    assert update["session"]["instructions"] == resume_instructions(session)
+    assert resume_instructions(session).endswith("Current phase: Drinks\nOffer drinks.")
+    assert recap["item"]["role"] == "system"
+    assert recap["item"]["content"][0]["text"] == conversation_recap(session)
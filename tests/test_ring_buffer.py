@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.core.realtime.ring_buffer import AudioRingBuffer
+
+
+def samples(start: int, count: int) -> np.ndarray:
+    return np.arange(start, start + count, dtype=np.int16)
+
+
+def test_write_then_read_in_order():
+    ring = AudioRingBuffer(8)
+    assert ring.write(samples(0, 5)) == 5
+    out = np.zeros(5, dtype=np.int16)
+    assert ring.read_into(out) == 5
+    assert out.tolist() == list(range(5))
+    assert ring.available == 0
+
+
+def test_write_stops_when_full():
+    ring = AudioRingBuffer(4)
+    assert ring.write(samples(0, 6)) == 4
+    assert ring.free == 0
+    assert ring.write(samples(6, 1)) == 0
+
+
+def test_read_of_empty_buffer_copies_nothing():
+    ring = AudioRingBuffer(4)
+    out = np.full(3, 7, dtype=np.int16)
+    assert ring.read_into(out) == 0
+    assert out.tolist() == [7, 7, 7]
+
+
+def test_short_read_fills_only_what_is_available():
+    ring = AudioRingBuffer(8)
+    ring.write(samples(0, 2))
+    out = np.zeros(4, dtype=np.int16)
+    assert ring.read_into(out) == 2
+    assert out.tolist() == [0, 1, 0, 0]
+
+
+def test_wraps_around_the_end():
+    ring = AudioRingBuffer(5)
+    out = np.zeros(3, dtype=np.int16)
+    ring.write(samples(0, 3))
+    ring.read_into(out)
+    # Spans the end of the storage
+    assert ring.write(samples(3, 4)) == 4
+    out = np.zeros(4, dtype=np.int16)
+    assert ring.read_into(out) == 4
+    assert out.tolist() == [3, 4, 5, 6]
+    assert (ring.total_written, ring.total_read) == (7, 7)
+
+
+def test_discard_drops_everything_buffered():
+    ring = AudioRingBuffer(8)
+    ring.write(samples(0, 6))
+    assert ring.discard() == 6
+    assert ring.available == 0
+    assert ring.free == 8
+    assert ring.total_read == 6
+    ring.write(samples(10, 2))
+    out = np.zeros(2, dtype=np.int16)
+    ring.read_into(out)
+    assert out.tolist() == [10, 11]
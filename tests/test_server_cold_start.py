@@ -0,0 +1,51 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Guard for headless server deployments: importing the FastAPI app must not
+# load audio device or DSP libraries, and must stay under a time budget.
+#   pytest tests/test_server_cold_start.py
+#   COLD_START_BUDGET_MS=800 pytest tests/test_server_cold_start.py
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_MS = float(os.getenv("COLD_START_BUDGET_MS", "1500"))
+RUNS = int(os.getenv("COLD_START_RUNS", "5"))
+FORBIDDEN = ["numpy", "librosa", "sounddevice", "pyaudio"]
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import src.api.main
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {FORBIDDEN!r} if m in sys.modules]}}))
+"""
+
+
+def cold_import():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True
+    )
+    assert result.returncode == 0, f"src.api.main failed to import:\n{result.stderr}"
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def samples():
+    return [cold_import() for _ in range(RUNS)]
+
+
+def test_server_import_skips_audio_libraries(samples):
+    loaded = sorted({m for s in samples for m in s["loaded"]})
+    assert not loaded, f"Server import loaded: {', '.join(loaded)}"
+
+
+def test_server_cold_start_within_budget(samples):
+    median_ms = statistics.median(s["ms"] for s in samples)
+    assert median_ms <= BUDGET_MS, (
+        f"Cold import took {median_ms:.1f} ms median of {RUNS} (budget {BUDGET_MS:.0f} ms)"
+    )
@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.core.realtime.vad import VoiceActivityDetector
+
+RATE = 24000
+
+
+def chunk(milliseconds: int = 20, amplitude: float = 0.0, frequency: float = 220.0) -> np.ndarray:
+    t = np.arange(RATE * milliseconds // 1000) / RATE
+    return (amplitude * 32767 * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+
+def silence(milliseconds: int = 20) -> np.ndarray:
+    return chunk(milliseconds)
+
+
+def speech(milliseconds: int = 20) -> np.ndarray:
+    return chunk(milliseconds, amplitude=0.3)
+
+
+def test_silence_is_not_speech():
+    assert not VoiceActivityDetector().is_speech(silence())
+
+
+def test_tone_is_speech():
+    assert VoiceActivityDetector().is_speech(speech())
+
+
+def test_chunk_shorter_than_a_frame_is_not_speech():
+    assert not VoiceActivityDetector().is_speech(speech()[:100])
+
+
+def test_broadband_hiss_at_moderate_level_is_not_speech():
+    noise = (np.random.default_rng(0).uniform(-1, 1, 480) * 0.01 * 32767).astype(np.int16)
+    assert not VoiceActivityDetector().is_speech(noise)
+
+
+def test_gate_suppresses_silence_and_counts_it():
+    vad = VoiceActivityDetector()
+    for _ in range(5):
+        assert vad.gate(silence()) is None
+    assert vad.stats()["chunks_suppressed"] == 5
+    assert vad.suppression_ratio == 1.0
+
+
+def test_gate_releases_preroll_in_front_of_speech():
+    vad = VoiceActivityDetector(preroll_ms=40)
+    quiet = [silence() for _ in range(5)]
+    for samples in quiet:
+        vad.gate(samples)
+    onset = speech()
+    released = vad.gate(onset)
+    # Whole chunks covering the 40 ms pre-roll, then the onset
+    assert released == quiet[-2].tobytes() + quiet[-1].tobytes() + onset.tobytes()
+    assert vad.active
+    assert vad.chunks_suppressed == 3
+
+
+def test_gate_stays_open_for_the_hangover():
+    vad = VoiceActivityDetector(hangover_ms=60)
+    vad.gate(speech())
+    passed = [vad.gate(silence()) is not None for _ in range(5)]
+    assert passed == [True, True, True, False, False]
+    assert not vad.active